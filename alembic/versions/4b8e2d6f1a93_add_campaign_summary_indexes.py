@@ -0,0 +1,29 @@
+"""add campaign summary indexes
+
+Revision ID: 4b8e2d6f1a93
+Revises: 9c1e5a0f3b72
+Create Date: 2026-10-16 15:04:27.561930+00:00
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b8e2d6f1a93"
+down_revision: str | None = "9c1e5a0f3b72"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # A campaign summary counts the nodes of a campaign by status, and only
+    # if the campaign has any edges.
+    op.create_index("ix_nodes_v2_namespace_status", "nodes_v2", ["namespace", "status"], if_not_exists=True)
+    op.create_index("ix_edges_v2_namespace", "edges_v2", ["namespace"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_edges_v2_namespace", table_name="edges_v2", if_exists=True)
+    op.drop_index("ix_nodes_v2_namespace_status", table_name="nodes_v2", if_exists=True)
@@ -0,0 +1,43 @@
+"""add machine state record
+
+Revision ID: 5f2b9e7d4c31
+Revises: e3a4c1d27b90
+Create Date: 2026-10-16 11:48:05.602117+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2b9e7d4c31"
+down_revision: str | None = "e3a4c1d27b90"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing pickled machines are kept and converted to a state record the
+    # next time the application writes the machine after a transition.
+    op.add_column("machines_v2", sa.Column("record", postgresql.JSONB(), nullable=True))
+    op.alter_column("machines_v2", "state", existing_type=sa.PickleType, nullable=True)
+
+
+def downgrade() -> None:
+    # Machines with only a state record cannot be represented as a pickle, so
+    # their nodes are detached from them before they are removed.
+    op.execute("""
+        UPDATE nodes_v2 SET machine = NULL
+        WHERE machine IN (SELECT id FROM machines_v2 WHERE state IS NULL)
+    """)
+    op.execute("""
+        UPDATE campaigns_v2 SET machine = NULL
+        WHERE machine IN (SELECT id FROM machines_v2 WHERE state IS NULL)
+    """)
+    op.execute("DELETE FROM machines_v2 WHERE state IS NULL")
+    op.alter_column("machines_v2", "state", existing_type=sa.PickleType, nullable=False)
+    op.drop_column("machines_v2", "record")
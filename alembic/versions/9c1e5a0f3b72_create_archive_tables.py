@@ -0,0 +1,124 @@
+"""create archive tables
+
+Revision ID: 9c1e5a0f3b72
+Revises: 5f2b9e7d4c31
+Create Date: 2026-10-16 14:03:27.845391+00:00
+
+"""
+
+from collections.abc import Sequence
+from enum import Enum
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1e5a0f3b72"
+down_revision: str | None = "5f2b9e7d4c31"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# DB model uses mapped columns with Python Enum types, but we do not care
+# to use native enums in the database, so when we have such a column, this
+# definition will produce a VARCHAR instead.
+ENUM_COLUMN_AS_VARCHAR = sa.Enum(Enum, length=20, native_enum=False, check_constraint=False)
+
+
+def upgrade() -> None:
+    # Archive tables mirror their working tables without foreign keys
+    # A Task's ID is deterministic, so the same Task may be archived more than
+    # once; archived rows are keyed by an identity column instead.
+    _ = op.create_table(
+        "tasks_archive_v2",
+        sa.Column("archive_id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("id", postgresql.UUID(), nullable=False),
+        sa.Column("namespace", postgresql.UUID(), nullable=False),
+        sa.Column("node", postgresql.UUID(), nullable=False),
+        sa.Column("priority", postgresql.INTEGER(), nullable=True),
+        sa.Column("created_at", postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("submitted_at", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("finished_at", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("wms_id", postgresql.VARCHAR(), nullable=True),
+        sa.Column("site_affinity", postgresql.ARRAY(postgresql.VARCHAR()), nullable=True),
+        sa.Column("status", ENUM_COLUMN_AS_VARCHAR, nullable=False),
+        sa.Column("previous_status", ENUM_COLUMN_AS_VARCHAR, nullable=True),
+        sa.Column(
+            "metadata",
+            postgresql.JSONB(),
+            nullable=False,
+            default=dict,
+            server_default=sa.text("'{}'::json"),
+        ),
+        sa.Column(
+            "archived_at",
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.PrimaryKeyConstraint("archive_id"),
+        if_not_exists=True,
+    )
+
+    _ = op.create_table(
+        "activity_log_archive_v2",
+        sa.Column("archive_id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("id", postgresql.UUID(), nullable=False),
+        sa.Column("namespace", postgresql.UUID(), nullable=False),
+        sa.Column("node", postgresql.UUID(), nullable=True),
+        sa.Column("operator", postgresql.VARCHAR(), nullable=False),
+        sa.Column("created_at", postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("finished_at", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("from_status", ENUM_COLUMN_AS_VARCHAR, nullable=False),
+        sa.Column("to_status", ENUM_COLUMN_AS_VARCHAR, nullable=False),
+        sa.Column(
+            "detail",
+            postgresql.JSONB(),
+            nullable=False,
+            default=dict,
+            server_default=sa.text("'{}'::json"),
+        ),
+        sa.Column(
+            "metadata",
+            postgresql.JSONB(),
+            nullable=False,
+            default=dict,
+            server_default=sa.text("'{}'::json"),
+        ),
+        sa.Column(
+            "archived_at",
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.PrimaryKeyConstraint("archive_id"),
+        if_not_exists=True,
+    )
+
+    op.create_index("ix_tasks_archive_v2_id", "tasks_archive_v2", ["id"], if_not_exists=True)
+    op.create_index("ix_activity_log_archive_v2_id", "activity_log_archive_v2", ["id"], if_not_exists=True)
+    op.create_index("ix_tasks_archive_v2_namespace", "tasks_archive_v2", ["namespace"], if_not_exists=True)
+    op.create_index(
+        "ix_activity_log_archive_v2_namespace", "activity_log_archive_v2", ["namespace"], if_not_exists=True
+    )
+
+    # The compaction job scans for finished rows in the working tables
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_v2_finished_at
+        ON tasks_v2 (finished_at)
+        WHERE finished_at IS NOT NULL
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_activity_log_v2_finished_at
+        ON activity_log_v2 (finished_at)
+        WHERE finished_at IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activity_log_v2_finished_at", table_name="activity_log_v2", if_exists=True)
+    op.drop_index("ix_tasks_v2_finished_at", table_name="tasks_v2", if_exists=True)
+    op.drop_table("activity_log_archive_v2", if_exists=True)
+    op.drop_table("tasks_archive_v2", if_exists=True)
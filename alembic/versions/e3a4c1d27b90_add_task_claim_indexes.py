@@ -0,0 +1,39 @@
+"""add task claim indexes
+
+Revision ID: e3a4c1d27b90
+Revises: 0bac2c4206b1
+Create Date: 2026-10-16 09:12:41.318204+00:00
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a4c1d27b90"
+down_revision: str | None = "0bac2c4206b1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # The daemon claims unsubmitted tasks in order of priority and age, so
+    # these partial indexes only cover the rows that are still in the queue.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_v2_unsubmitted_priority
+        ON tasks_v2 (priority ASC NULLS LAST, created_at ASC)
+        WHERE submitted_at IS NULL
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tasks_v2_unsubmitted_site_affinity
+        ON tasks_v2
+        USING gin (site_affinity)
+        WHERE submitted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_v2_unsubmitted_site_affinity", table_name="tasks_v2", if_exists=True)
+    op.drop_index("ix_tasks_v2_unsubmitted_priority", table_name="tasks_v2", if_exists=True)
@@ -1,4 +1,4 @@
-from . import audit, campaigns, schedules
+from . import archive, audit, campaigns, schedules
 from .base import BaseSQLModel as Base
 
-__all__ = ["audit", "Base", "campaigns", "schedules"]
+__all__ = ["archive", "audit", "Base", "campaigns", "schedules"]
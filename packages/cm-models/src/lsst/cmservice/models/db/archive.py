@@ -0,0 +1,99 @@
+"""Module for database models of archived campaign elements.
+
+Tombstoned Tasks and expired Activity Log entries are moved out of their
+working tables and into these archive tables by the compaction job. The
+archive tables mirror the columns of their working tables without any foreign
+keys, so archived rows never prevent the deletion of a Node or a Campaign.
+
+A Task's ID is derived from its Node and desired state, so the same Task may
+be tombstoned and archived more than once. Archived rows are therefore
+identified by a surrogate ``archive_id`` and keep the ID of their working row
+as an indexed column.
+"""
+
+from uuid import UUID
+
+from pydantic import AwareDatetime
+from sqlalchemy import BigInteger, Identity, func
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Column, DateTime, Enum, Field, String
+
+from ..enums import StatusEnum
+from ..lib.timestamp import now_utc
+from ..types import StatusField
+from .base import BaseSQLModel
+from .campaigns import jsonb_column
+
+
+class TaskArchive(BaseSQLModel, table=True):
+    """tasks_archive_v2 db table"""
+
+    __tablename__: str = "tasks_archive_v2"  # type: ignore[misc]
+
+    archive_id: int | None = Field(
+        default=None,
+        description="The surrogate key of an archived Task",
+        sa_column=Column(BigInteger, Identity(), primary_key=True),
+    )
+    id: UUID = Field(index=True, description="The ID of the archived Task")
+    namespace: UUID = Field(description="The ID of a Campaign")
+    node: UUID = Field(description="The ID of the target node")
+    priority: int | None = Field(default=None)
+    created_at: AwareDatetime = Field(sa_column=Column(DateTime(timezone=True)))
+    submitted_at: AwareDatetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+    finished_at: AwareDatetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+    wms_id: str | None = Field(default=None)
+    site_affinity: list[str] | None = Field(
+        default=None, sa_column=Column("site_affinity", postgresql.ARRAY(String()))
+    )
+    status: StatusField = Field(
+        sa_column=Column("status", Enum(StatusEnum, length=20, native_enum=False, create_constraint=False)),
+    )
+    previous_status: StatusField = Field(
+        sa_column=Column(
+            "previous_status", Enum(StatusEnum, length=20, native_enum=False, create_constraint=False)
+        ),
+    )
+    metadata_: dict = jsonb_column("metadata", aliases=["metadata", "metadata_"])
+    archived_at: AwareDatetime = Field(
+        description="The `datetime` (UTC) at which this Task was archived",
+        default_factory=now_utc,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+    )
+
+
+class ActivityLogArchive(BaseSQLModel, table=True):
+    """activity_log_archive_v2 db table"""
+
+    __tablename__: str = "activity_log_archive_v2"  # type: ignore[misc]
+
+    archive_id: int | None = Field(
+        default=None,
+        description="The surrogate key of an archived entry",
+        sa_column=Column(BigInteger, Identity(), primary_key=True),
+    )
+    id: UUID = Field(index=True, description="The ID of the archived entry")
+    namespace: UUID = Field(description="The ID of a Campaign")
+    node: UUID | None = Field(default=None, description="The ID of a Node")
+    operator: str
+    created_at: AwareDatetime = Field(sa_column=Column(DateTime(timezone=True)))
+    finished_at: AwareDatetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    to_status: StatusField = Field(
+        sa_column=Column(
+            "to_status", Enum(StatusEnum, length=20, native_enum=False, create_constraint=False)
+        ),
+    )
+    from_status: StatusField = Field(
+        sa_column=Column(
+            "from_status", Enum(StatusEnum, length=20, native_enum=False, create_constraint=False)
+        ),
+    )
+    detail: dict = jsonb_column("detail")
+    metadata_: dict = jsonb_column("metadata", aliases=["metadata", "metadata_"])
+    archived_at: AwareDatetime = Field(
+        description="The `datetime` (UTC) at which this entry was archived",
+        default_factory=now_utc,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+    )
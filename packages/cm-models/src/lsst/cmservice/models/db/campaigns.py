@@ -216,7 +216,16 @@ class MachineBase(BaseSQLModel):
     """machines_v2 db table."""
 
     id: UUID = Field(primary_key=True, default_factory=uuid4)
-    state: Any = Field(sa_column=Column("state", PickleType))
+    state: Any = Field(
+        default=None,
+        description="A pickled state machine. Deprecated in favor of the versioned `record`.",
+        sa_column=Column("state", PickleType, nullable=True),
+    )
+    record: dict | None = Field(
+        default=None,
+        description="A versioned record of the state needed to rebuild a state machine.",
+        sa_column=Column("record", postgresql.JSONB, nullable=True),
+    )
 
 
 class Machine(MachineBase, table=True):
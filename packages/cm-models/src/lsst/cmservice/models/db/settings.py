@@ -59,6 +59,11 @@ class DatabaseConfiguration(BaseSettings):
         description="Set of fields used for connection pool configuration",
     )
 
+    upsert_batch_size: int = Field(
+        default=1000,
+        description="The maximum number of rows written by a single multi-row upsert statement",
+    )
+
 
 settings = DatabaseConfiguration()
 """Configuration instance for cm-service models package."""
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping, MutableSet, Sequence
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
 from typing import TYPE_CHECKING, Literal, TypedDict, cast
 from uuid import UUID, uuid4, uuid5
 
 import networkx as nx
 from networkx.exception import NodeNotFound
+from sqlalchemy import insert, inspect, union
+from sqlalchemy.exc import NoResultFound
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -38,6 +41,12 @@ class SimpleNode(TypedDict):
     version: str
 
 
+GRAPH_NODE_QUERY_CHUNK_SIZE = 5_000
+"""The maximum number of node IDs bound to a single ``IN`` clause when hydrat-
+ing a graph from an arbitrary sequence of edges.
+"""
+
+
 async def graph_from_edge_list_v2(
     edges: Sequence[Edge],
     session: AnyAsyncSession,
@@ -47,6 +56,9 @@ async def graph_from_edge_list_v2(
     """Given a sequence of Edges, create a directed graph for these
     edges with nodes derived from database lookups of the related objects.
 
+    The nodes are hydrated with set-based ``SELECT ... WHERE id IN (...)``
+    statements instead of a lookup per graph node.
+
     Parameters
     ----------
     edges: Sequence[Edge]
@@ -64,13 +76,80 @@ async def graph_from_edge_list_v2(
     """
     g: nx.DiGraph = nx.DiGraph()
     g.add_edges_from([(e.source, e.target) for e in edges])
+
+    node_ids = list(g.nodes)
+    db_nodes: list[Node] = []
+    for i in range(0, len(node_ids), GRAPH_NODE_QUERY_CHUNK_SIZE):
+        s = select(Node).where(col(Node.id).in_(node_ids[i : i + GRAPH_NODE_QUERY_CHUNK_SIZE]))
+        db_nodes.extend((await session.execute(s)).scalars().all())
+
+    return hydrate_graph_nodes(g, db_nodes, session=session, node_view=node_view)
+
+
+async def graph_from_namespace(
+    namespace: UUID,
+    session: AnyAsyncSession,
+    node_view: Literal["simple", "model"] = "model",
+) -> nx.DiGraph:
+    """Create a directed graph for a campaign namespace using exactly two
+    set-based queries: one for the namespace's Edges and one for every Node
+    referenced by those Edges.
+
+    Parameters
+    ----------
+    namespace: UUID
+        The namespace (campaign ID) of the graph
+
+    session
+        An async database session
+
+    node_view: "simple" or "model"
+        Whether the node metadata in the graph should be simplified (dict) or
+        using the full expunged model form.
+    """
+    e_statement = select(Edge).where(Edge.namespace == namespace)
+    edges = (await session.execute(e_statement)).scalars().all()
+
+    g: nx.DiGraph = nx.DiGraph()
+    g.add_edges_from([(e.source, e.target) for e in edges])
+
+    # Only Nodes participating in an Edge are part of the graph; a namespace
+    # may also hold Nodes that have been removed from (or never added to) it.
+    graph_node_ids = union(
+        select(Edge.source).where(Edge.namespace == namespace),
+        select(Edge.target).where(Edge.namespace == namespace),
+    )
+    n_statement = select(Node).where(col(Node.id).in_(graph_node_ids))
+    db_nodes = (await session.execute(n_statement)).scalars().all()
+
+    return hydrate_graph_nodes(g, db_nodes, session=session, node_view=node_view)
+
+
+def hydrate_graph_nodes(
+    g: nx.DiGraph,
+    db_nodes: Iterable[Node],
+    *,
+    session: AnyAsyncSession,
+    node_view: Literal["simple", "model"] = "model",
+) -> nx.DiGraph:
+    """Decorates the nodes of graph ``g``, whose node identifiers are Node IDs,
+    with the data of the ``db_nodes`` according to the ``node_view``.
+
+    Raises
+    ------
+    sqlalchemy.exc.NoResultFound
+        If any node in the graph has no matching database Node.
+    """
     relabel_mapping = {}
+    hydrated: set[UUID] = set()
 
     # The graph understands the nodes in terms of the IDs used in the edges,
     # but we want to hydrate the entire Node model for subsequent users of this
     # graph to reference without dipping back to the Database.
-    for node in g.nodes:
-        db_node = await session.get_one(Node, node)
+    for db_node in db_nodes:
+        if db_node.id not in g:
+            continue
+        hydrated.add(db_node.id)
         # This Node is going on an adventure where it does not need to drag its
         # SQLAlchemy baggage along, so we expunge it from the session before
         # adding it to the graph.
@@ -79,14 +158,18 @@ async def graph_from_edge_list_v2(
             # for the simple node view, the goal is to minimize the amount of
             # data attached to the node and ensure that this data is json-
             # serializable and otherwise appropriate for an API response
-            g.nodes[node]["uuid"] = str(db_node.id)
-            g.nodes[node]["name"] = db_node.name
-            g.nodes[node]["status"] = db_node.status.name
-            g.nodes[node]["kind"] = db_node.kind.name
-            g.nodes[node]["version"] = db_node.version
-            relabel_mapping[node] = f"{db_node.name}.{db_node.version}"
+            g.nodes[db_node.id]["uuid"] = str(db_node.id)
+            g.nodes[db_node.id]["name"] = db_node.name
+            g.nodes[db_node.id]["status"] = db_node.status.name
+            g.nodes[db_node.id]["kind"] = db_node.kind.name
+            g.nodes[db_node.id]["version"] = db_node.version
+            relabel_mapping[db_node.id] = f"{db_node.name}.{db_node.version}"
         else:
-            g.nodes[node]["model"] = db_node
+            g.nodes[db_node.id]["model"] = db_node
+
+    if len(hydrated) != g.number_of_nodes():
+        msg = f"Graph has {g.number_of_nodes() - len(hydrated)} node(s) with no database row"
+        raise NoResultFound(msg)
 
     if relabel_mapping:
         g = nx.relabel_nodes(g, mapping=relabel_mapping, copy=False)
@@ -253,12 +336,23 @@ def validate_graph(g: nx.DiGraph, source_name: str = "START", sink_name: str = "
     return True
 
 
-def processable_graph_nodes(g: nx.DiGraph) -> Iterable[Node]:
+def processable_graph_nodes(g: nx.DiGraph, frontier: Iterable[UUID] | None = None) -> Iterable[Node]:
     """Traverse the graph G and produce an iterator of any nodes that are
     candidates for processing, i.e., their status is waiting/prepared/running
     and their ancestors are complete/successful. Graph nodes in a failed state
     will block the graph and prevent candidacy for subsequent nodes.
 
+    Parameters
+    ----------
+    g : `networkx.DiGraph`
+        A campaign graph with a "model" view of its nodes.
+
+    frontier : `Iterable` [`uuid.UUID`] | None
+        The graph nodes from which to start the traversal. By default, this is
+        the graph's single source (START) node. A caller holding a cached graph
+        may instead resume from the nodes yielded by a previous traversal,
+        provided the status of no node upstream of them has since changed.
+
     Yields
     ------
     `lsst.cmservice.cm_models.db.campaigns.Node`
@@ -271,33 +365,40 @@ def processable_graph_nodes(g: nx.DiGraph) -> Iterable[Node]:
     graph-node is decorated with a "model" attribute referring to an expunged
     instance of ``Node``. This ``Node`` can be ``add``ed back to a ``Session``
     and manipulated in the usual way.
+
+    A node is processable when it is reachable from the frontier along a path
+    whose other nodes are all neither processable nor failed. The traversal
+    expands the frontier breadth-first and visits each node at most once, so
+    its cost is linear in the size of the graph no matter how many paths run
+    through parallel groups.
     """
-    processable_nodes: MutableSet[Node] = set()
-
-    # A valid campaign graph will have only one source (START) with in_degree 0
-    # and only one sink (END) with out_degree 0
-    source = next(v for v, d in g.in_degree() if d == 0)
-    sink = next(v for v, d in g.out_degree() if d == 0)
-
-    # For each path through the graph, evaluate the state of nodes to determine
-    # which nodes are up for processing. When there are multiple paths, we have
-    # parallelization and common ancestors may be evaluated more than once,
-    # which is an exercise in optimization left as a TODO
-    for path in nx.all_simple_paths(g, source, sink):
-        for n in path:
-            node: Node = g.nodes[n]["model"]
-            # A "script" considers "reviewable" a terminal status; nodes share
-            # this opinion.
-            if node.status.is_processable_script():
-                processable_nodes.add(node)
-                # We found a processable node in this path, stop traversal
-                break
-            elif node.status is StatusEnum.failed:
-                # We reached a failed node in this path, it is blocked
-                break
-            else:
-                # This node must be in a "successful" terminal state
-                continue
+    processable_nodes: list[Node] = []
+
+    if frontier is None:
+        # A valid campaign graph will have only one source (START) with
+        # in_degree 0
+        frontier = [next(v for v, d in g.in_degree() if d == 0)]
+
+    queue = deque(frontier)
+    visited = set(queue)
+    while queue:
+        n = queue.popleft()
+        node: Node = g.nodes[n]["model"]
+        # A "script" considers "reviewable" a terminal status; nodes share
+        # this opinion.
+        if node.status.is_processable_script():
+            # We found a processable node, stop traversal beyond it
+            processable_nodes.append(node)
+            continue
+        elif node.status is StatusEnum.failed:
+            # We reached a failed node, everything behind it is blocked
+            continue
+        # This node must be in a "successful" terminal state, so expand the
+        # frontier to its successors
+        for successor in g.successors(n):
+            if successor not in visited:
+                visited.add(successor)
+                queue.append(successor)
 
     # the inspection should stop when there are no more nodes to check
     yield from processable_nodes
@@ -506,6 +607,87 @@ async def append_node_to_graph(
         await session.commit()
 
 
+async def fan_out_step_groups(
+    step: UUID,
+    collect: Node,
+    groups: Sequence[Node],
+    *,
+    namespace: UUID,
+    session: AsyncSession | None = None,
+    commit: bool = True,
+) -> None:
+    """Apply a fan-out operation to a graph by inserting a collect node after
+    a step node and a set of parallel group nodes between the two, writing
+    every new node and edge with set-based multi-row inserts.
+
+    ```
+    A --> B --> C  becomes  A --> B --> B1 --> Bx --> C
+                                    `-> B2 -/
+    ```
+
+    The result is equivalent to an insert of the collect node ``Bx`` after
+    the step ``B``, an insert of the first group ``B1`` after ``B`` and an
+    append of every other group in parallel with ``B1``, without issuing a
+    lookup for each group.
+
+    Parameters
+    ----------
+    step : UUID
+        The ID of the step node from which the groups fan out.
+
+    collect : Node
+        A new collect node, which inherits the downstream edges of the step.
+
+    groups : Sequence[Node]
+        The new group nodes, each of which becomes a successor of the step and
+        a predecessor of the collect node.
+
+    Notes
+    -----
+    The new nodes are inserted with ORM bulk inserts and are not added to the
+    session. Large batches are split by SQLAlchemy into statements within the
+    database driver's parameter limit.
+    """
+    if TYPE_CHECKING:
+        assert session is not None
+
+    node_columns = [attr.key for attr in inspect(Node).column_attrs]
+    await session.execute(
+        insert(Node), [{key: getattr(node, key) for key in node_columns} for node in (collect, *groups)]
+    )
+
+    # Move all the downstream edges from the step to the collect node
+    s = select(Edge).with_for_update().where(Edge.source == step)
+    downstream_edges = (await session.exec(s)).all()
+    for edge in downstream_edges:
+        edge.source = collect.id
+        edge.metadata_["mtime"] = element_time()
+
+    adjacencies = [(group.id, collect.id) for group in groups]
+    adjacencies.extend((step, group.id) for group in groups)
+    if not groups:
+        adjacencies.append((step, collect.id))
+
+    new_edges = []
+    for source, target in adjacencies:
+        new_adjacency_name = uuid4()
+        new_edges.append(
+            {
+                "id": uuid5(namespace, new_adjacency_name.bytes),
+                "name": new_adjacency_name.hex,
+                "namespace": namespace,
+                "source": source,
+                "target": target,
+                "metadata_": {},
+                "configuration": {},
+            }
+        )
+    await session.execute(insert(Edge), new_edges)
+
+    if commit:
+        await session.commit()
+
+
 async def delete_node_from_graph(
     node_0: UUID,
     *,
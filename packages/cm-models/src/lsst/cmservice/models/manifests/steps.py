@@ -29,10 +29,16 @@ class StepGroupsQuerySpec(ManifestSpec):
     partitioned according to the `min_groups` and/or `max_size` settings as
     appropriate. The Butler used for this query is the Butler defined for the
     step or the campaign.
+
+    With `split_by: dimension`, the Butler is asked only for the distinct
+    values of the `dimension` for which the dataset exists, instead of for
+    every dataset. With `split_by: weighted`, the values are partitioned into
+    ranges with roughly the same number of datasets instead of the same
+    number of values.
     """
 
     model_config = SPEC_CONFIG | {"title": "Split by Query"}
-    split_by: Literal["query"]
+    split_by: Literal["query", "dimension", "weighted"]
     dataset: str = Field(description="The name of a dataset to query")
     dimension: str = Field(
         description="The name of a Butler dimension to associate with each "
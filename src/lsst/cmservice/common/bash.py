@@ -2,7 +2,7 @@
 
 import pathlib
 import re
-from collections import deque
+from collections.abc import Iterable
 from typing import Any
 
 import yaml
@@ -14,6 +14,7 @@ from lsst.cmservice.models.enums import StatusEnum
 
 from ..config import config
 from .errors import CMBashSubmitError
+from .logtail import last_line
 
 
 async def get_diagnostic_message(
@@ -21,6 +22,9 @@ async def get_diagnostic_message(
 ) -> str:
     """Read the last line of a log file as a diagnostic error message
 
+    The log file is read backwards from its end, so only the last line is
+    read however long the log is.
+
     Parameters
     ----------
     log_url : `str` | `anyio.Path`
@@ -32,21 +36,40 @@ async def get_diagnostic_message(
         The last line of the file, or an error message
     """
     log_path = Path(log_url)
-    last_line: deque[str] = deque(maxlen=1)
     if not await log_path.exists():
         return f"ERROR Log file {log_url} does not exist"
     try:
-        async with await open_file(log_url) as f:
-            async for line in f:
-                last_line.append(line)
-
-        if last_line:
-            return last_line.pop().strip()
+        if (line := await last_line(log_path)) is not None:
+            return line.strip()
         return "ERROR Empty log file"
     except Exception as e:
         return f"ERROR reading log file: {e}"
 
 
+BPS_STDOUT_PARSER = re.compile(r"^(?P<token>[\w\s]+):\s*(?P<value>.*)$")
+"""A line of the stdout from a bps submit job."""
+
+
+def parse_bps_stdout_lines(lines: Iterable[str]) -> dict[str, str]:
+    """Parse lines of the stdout from a bps submit job.
+
+    Parameters
+    ----------
+    lines : `Iterable[str]`
+        lines of BPS submit stdout
+
+    Returns
+    -------
+    out_dict `str`
+        a dictionary containing the tokens found in the lines
+    """
+    out_dict = {}
+    for line in lines:
+        if (match := BPS_STDOUT_PARSER.match(line)) is not None:
+            out_dict[match.group("token")] = match.group("value")
+    return out_dict
+
+
 async def parse_bps_stdout(url: str | Path) -> dict[str, str]:
     """Parse the stdout from a bps submit job.
 
@@ -60,12 +83,8 @@ async def parse_bps_stdout(url: str | Path) -> dict[str, str]:
     out_dict `str`
         a dictionary containing the stdout from BPS submit
     """
-    bps_stdout_parser = re.compile(r"^(?P<token>[\w\s]+):\s*(?P<value>.*)$", re.MULTILINE)
-    out_dict = {}
     stdout = await Path(url).read_text()
-    for match in re.finditer(bps_stdout_parser, stdout):
-        out_dict[match.group("token")] = match.group("value")
-    return out_dict
+    return parse_bps_stdout_lines(stdout.splitlines())
 
 
 async def run_bash_job(
@@ -0,0 +1,230 @@
+"""Module implementing a process-wide service for BPS workflow status and
+reports.
+
+A running group checks the status of its BPS workflow, and reports on it, at
+every check. Both calls are made through a WMS service whose class is named in
+the group's configuration chain and which reads the DAGMan logs in the
+workflow's submit directory, which for a large workflow can run to megabytes.
+
+The ``BPS_REPORT_SERVICE`` keeps one WMS service instance for each service
+class and configuration, and caches the result of each call for a submit
+directory until the files in the directory change or the result is older than
+``config.bps.report_cache_ttl`` seconds. The calls block, so they are made in
+worker threads bounded by a capacity limiter of their own, which keeps many
+running groups from occupying every thread of anyio's default limiter.
+
+Notes
+-----
+The report service follows a "global" pattern where it is assigned to a
+module-level variable at import-time, like the manifest cache.
+
+A submit directory is fingerprinted by the number of its entries and the
+latest modification time among the directory and its entries, which is where
+DAGMan writes its logs. The files of workflow jobs are written in
+subdirectories but are reflected in the DAGMan logs. A WMS that does not keep
+its state in the submit directory, such as PanDA, relies on the TTL alone. The
+results for a workflow id that is not a directory are not cached.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from types import ModuleType
+from typing import Any
+
+from anyio import CapacityLimiter, to_thread
+
+from lsst.ctrl.bps import BaseWmsService, WmsRunReport, WmsStates
+from lsst.ctrl.bps.bps_reports import compile_job_summary
+from lsst.utils import doImport
+
+from ..config import config
+from .logging import LOGGER
+
+logger = LOGGER.bind(module=__name__)
+
+type ServiceKey = tuple[str, str]
+"""The name of a WMS service class and the JSON form of its configuration."""
+
+type ReportKey = tuple[str, ServiceKey, str]
+"""The WMS service method, service key and workflow id of a cached result."""
+
+type Fingerprint = tuple[int, int]
+"""The number of entries in a submit directory and their latest mtime."""
+
+
+@dataclass
+class BpsReportServiceStats:
+    """Counters describing the use of a BPS report service."""
+
+    services: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def submit_dir_fingerprint(submit_dir: str) -> Fingerprint | None:
+    """Returns a fingerprint of the files in a submit directory, or `None` if
+    the workflow id is not a directory.
+
+    This function blocks on the filesystem and should be called from a worker
+    thread.
+    """
+    try:
+        latest = Path(submit_dir).stat().st_mtime_ns
+        count = 0
+        with os.scandir(submit_dir) as entries:
+            for entry in entries:
+                count += 1
+                latest = max(latest, entry.stat(follow_symlinks=False).st_mtime_ns)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return count, latest
+
+
+def compiled_report(wms_svc: BaseWmsService, wms_workflow_id: str) -> tuple[list[WmsRunReport], str]:
+    """Returns the run reports of a workflow with their job summaries compiled,
+    so that the summaries are compiled in the same worker thread as the
+    report.
+    """
+    run_reports, message = wms_svc.report(wms_workflow_id=wms_workflow_id)
+    for run_report in run_reports:
+        if run_report.job_summary is None:
+            compile_job_summary(run_report)
+    return run_reports, message
+
+
+class BpsReportService:
+    """A service making BPS status and report calls through shared WMS
+    service instances, with a bounded cache of their results.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._stats = BpsReportServiceStats()
+        self._services: dict[ServiceKey, BaseWmsService] = {}
+        self._results: OrderedDict[ReportKey, tuple[Fingerprint, float, Any]] = OrderedDict()
+        self._lock = Lock()
+        self._limiter: CapacityLimiter | None = None
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @property
+    def limiter(self) -> CapacityLimiter:
+        """The capacity limiter bounding the worker threads of the service,
+        which is created in the event loop of its first use.
+        """
+        if self._limiter is None:
+            self._limiter = CapacityLimiter(config.bps.report_concurrency)
+        return self._limiter
+
+    def get_service(self, service_class: str, service_config: Mapping[str, Any]) -> BaseWmsService:
+        """Returns the WMS service instance for a service class and config,
+        creating it the first time it is needed.
+
+        Raises
+        ------
+        RuntimeError
+            Raised when the service class names a module.
+        """
+        key = (service_class, json.dumps(service_config, sort_keys=True, default=str))
+        with self._lock:
+            if (wms_svc := self._services.get(key)) is None:
+                if isinstance(wms_svc_class := doImport(service_class), ModuleType):
+                    raise RuntimeError("WMS Service Class is a Module, not a BaseWmsService subclass")
+                wms_svc = self._services[key] = wms_svc_class(config=dict(service_config))
+                self._stats.services += 1
+        return wms_svc
+
+    async def get_status(
+        self, service_class: str, service_config: Mapping[str, Any], wms_workflow_id: str
+    ) -> tuple[WmsStates, str]:
+        """Returns the status of a workflow and any message from the WMS."""
+        wms_svc = self.get_service(service_class, service_config)
+        status_f = partial(wms_svc.get_status, wms_workflow_id)
+        return await self._call("get_status", status_f, service_class, service_config, wms_workflow_id)
+
+    async def report(
+        self, service_class: str, service_config: Mapping[str, Any], wms_workflow_id: str
+    ) -> tuple[list[WmsRunReport], str]:
+        """Returns the run reports of a workflow, with their job summaries
+        compiled, and any message from the WMS.
+
+        The run reports may be shared with other callers, so they should not be
+        modified.
+        """
+        wms_svc = self.get_service(service_class, service_config)
+        report_f = partial(compiled_report, wms_svc, wms_workflow_id)
+        return await self._call("report", report_f, service_class, service_config, wms_workflow_id)
+
+    async def _call(
+        self,
+        method: str,
+        func: Callable[[], Any],
+        service_class: str,
+        service_config: Mapping[str, Any],
+        wms_workflow_id: str,
+    ) -> Any:
+        """Returns the cached result of a WMS service call for a workflow if
+        the files of its submit directory have not changed since, or else
+        makes the call in a worker thread and caches its result.
+        """
+        key = (
+            method,
+            (service_class, json.dumps(service_config, sort_keys=True, default=str)),
+            str(wms_workflow_id),
+        )
+        fingerprint = await to_thread.run_sync(
+            submit_dir_fingerprint, str(wms_workflow_id), limiter=self.limiter
+        )
+        if fingerprint is not None and (cached := self._results.get(key)) is not None:
+            cached_fingerprint, cached_at, result = cached
+            if cached_fingerprint == fingerprint and monotonic() - cached_at < config.bps.report_cache_ttl:
+                self._stats.hits += 1
+                self._results.move_to_end(key)
+                return result
+
+        self._stats.misses += 1
+        result = await to_thread.run_sync(func, limiter=self.limiter)
+        if fingerprint is not None:
+            self._put(key, (fingerprint, monotonic(), result))
+        return result
+
+    def _put(self, key: ReportKey, value: tuple[Fingerprint, float, Any]) -> None:
+        """Adds a result to the cache, evicting the least recently used results
+        if the cache is full.
+        """
+        if self.maxsize <= 0:
+            return
+        self._results[key] = value
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            evicted, _ = self._results.popitem(last=False)
+            self._stats.evictions += 1
+            logger.debug("Evicted BPS report from cache", method=evicted[0], wms_workflow_id=evicted[2])
+
+    def invalidate(self, wms_workflow_id: str) -> None:
+        """Discard any cached result for a workflow."""
+        for key in [key for key in self._results if key[2] == str(wms_workflow_id)]:
+            del self._results[key]
+
+    def clear(self) -> None:
+        """Discard every cached result."""
+        self._results.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the service counters along with the current and maximum size
+        of the cache.
+        """
+        return asdict(self._stats) | {"size": len(self._results), "maxsize": self.maxsize}
+
+
+BPS_REPORT_SERVICE = BpsReportService(maxsize=config.bps.report_cache_size)
+"""A process-wide service for BPS workflow status and reports."""
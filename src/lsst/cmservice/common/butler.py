@@ -16,17 +16,22 @@ module should be imported as early as possible in the application startup;
 it does not depend on a running event loop.
 """
 
-from collections.abc import Callable
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
 from functools import cache, partial
-from typing import TYPE_CHECKING
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Literal
 
 from anyio import to_thread
 from botocore.exceptions import ClientError, NoCredentialsError
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError, OperationalError
 
-from lsst.daf.butler import Butler, ButlerConfig, ButlerRepoIndex, MissingCollectionError
+from lsst.daf.butler import Butler, ButlerConfig, ButlerRepoIndex, CollectionType, MissingCollectionError  # type: ignore[attr-defined]
 from lsst.daf.butler.direct_butler import DirectButler
-from lsst.daf.butler.registry import CollectionArgType, RegistryConfig
+from lsst.daf.butler.registry import CollectionArgType, RegistryConfig, RegistryDefaults
 from lsst.resources import ResourcePathExpression
 
 from ..config import config
@@ -42,6 +47,25 @@ BUTLER_REPO_INDEX = ButlerRepoIndex()
 ``DAF_BUTLER_REPOSITORIES`` environment variable.
 """
 
+HEALTH_CHECK_COLLECTION = "cm-service-health-check"
+"""The name of a collection looked up to check the registry connection of a
+pooled butler clone, which is not expected to exist.
+"""
+
+
+@dataclass
+class ButlerFactoryStats:
+    """Counters describing the Butlers constructed, cloned and pooled by a
+    butler factory.
+    """
+
+    constructions: int = 0
+    construction_seconds: float = 0.0
+    last_construction_seconds: float = 0.0
+    clones: int = 0
+    reuses: int = 0
+    discards: int = 0
+
 
 class ButlerFactory:
     """The ButlerFactory will create an instance of each Butler known to the
@@ -54,6 +78,9 @@ class ButlerFactory:
         """Initialize a ButlerFactory by creating butler pool instances for
         each known repository.
         """
+        self._stats = ButlerFactoryStats()
+        self._pools: dict[str, deque[tuple[float, Butler]]] = {}
+        self._lock = Lock()
         # create and cache any butler factories known to the service
         for label in BUTLER_REPO_INDEX.get_known_repos():
             if config.butler.eager:
@@ -86,7 +113,7 @@ class ButlerFactory:
 
     @cache
     def get_butler_factory(
-        self, label: str, *, without_datastore: bool = True
+        self, label: str, *, without_datastore: bool = True, writeable: bool = False
     ) -> Callable[..., Butler] | None:
         """Return a factory function that creates a butler clone.
 
@@ -104,15 +131,21 @@ class ButlerFactory:
         parameter is false, then calling this method the first time will block
         until the requested Butler is ready.
 
+        Butlers are read-only unless ``writeable`` is set, as it is for the
+        pooled clones leased for collection maintenance.
+
         Returns
         -------
         `lsst.daf.butler` or `None`
             A cloned instance of a ``Butler`` or None if the labelled Butler
             could not be created from the configuration inputs.
         """
+        start = perf_counter()
         try:
             _butler_config = self.get_butler_config(label=label)
-            _butler = Butler.from_config(_butler_config, without_datastore=without_datastore)
+            _butler = Butler.from_config(
+                _butler_config, without_datastore=without_datastore, writeable=writeable
+            )
             if TYPE_CHECKING:
                 assert isinstance(_butler, DirectButler)
             _butler._preload_cache(load_dimension_record_cache=False)
@@ -125,12 +158,124 @@ class ButlerFactory:
             # Case that no such butler was configured
             logger.warning("No such butler configured: %s", label)
             return None
+        elapsed = perf_counter() - start
+        with self._lock:
+            self._stats.constructions += 1
+            self._stats.construction_seconds += elapsed
+            self._stats.last_construction_seconds = elapsed
+        logger.info("Constructed butler", label=label, elapsed=elapsed)
 
         def factory(collections: CollectionArgType) -> Butler:
+            with self._lock:
+                self._stats.clones += 1
             return _butler.clone(collections=collections)
 
         return factory
 
+    def checkout(self, label: str, collections: list[str] | None = None) -> tuple[float, Butler]:
+        """Take a healthy, writeable butler clone for a repo from its pool, or
+        make a new clone if there is none, with the specified collections
+        constraint applied.
+
+        This method blocks on database queries and should be called from a
+        worker thread; `lease` is the asynchronous interface to the pool.
+
+        Returns
+        -------
+        tuple[float, ``lsst.daf.butler.Butler``]
+            The monotonic time at which the clone was made, and the clone.
+
+        Raises
+        ------
+        CMNoButlerError
+            Raised when the factory cannot produce a Butler for the repo.
+        """
+        while True:
+            with self._lock:
+                pool = self._pools.get(label)
+                if not pool:
+                    break
+                created, butler = pool.pop()
+            if monotonic() - created > config.butler.pool_max_age or not self.is_healthy(butler):
+                self._discard(label)
+                continue
+            butler.registry.defaults = RegistryDefaults(collections=collections)
+            with self._lock:
+                self._stats.reuses += 1
+            return created, butler
+
+        factory = self.get_butler_factory(label, writeable=True)
+        if factory is None:
+            msg = f"No butler available for repo {label}"
+            raise errors.CMNoButlerError(msg)
+        try:
+            return monotonic(), factory(collections=collections)
+        except Exception as e:
+            raise errors.CMNoButlerError(e) from e
+
+    def checkin(self, label: str, butler: Butler, *, created: float) -> None:
+        """Return a butler clone made at the ``created`` monotonic time to the
+        pool of its repo, discarding it if the pool is full.
+        """
+        with self._lock:
+            pool = self._pools.setdefault(label, deque())
+            if len(pool) < config.butler.pool_size:
+                pool.append((created, butler))
+                return
+        self._discard(label)
+
+    def _discard(self, label: str) -> None:
+        with self._lock:
+            self._stats.discards += 1
+        logger.debug("Discarded pooled butler clone", label=label)
+
+    @staticmethod
+    def is_healthy(butler: Butler) -> bool:
+        """Check that a butler clone can still query its registry database,
+        by looking up a collection that is not expected to exist.
+        """
+        try:
+            butler.collections.query_info(HEALTH_CHECK_COLLECTION)
+        except MissingCollectionError:
+            pass
+        except DBAPIError:
+            logger.warning("Pooled butler clone failed its health check")
+            return False
+        return True
+
+    @asynccontextmanager
+    async def lease(self, label: str, collections: list[str] | None = None) -> AsyncIterator[Butler]:
+        """Lease a butler clone from the pool of a repo for the duration of a
+        context, returning it to the pool afterwards unless the context exits
+        with a database error.
+
+        Raises
+        ------
+        CMNoButlerError
+            Raised when the factory cannot produce a Butler for the repo.
+        """
+        checkout_f = partial(self.checkout, label, collections=collections)
+        created, butler = await to_thread.run_sync(checkout_f)
+        healthy = True
+        try:
+            yield butler
+        except DBAPIError:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self.checkin(label, butler, created=created)
+            else:
+                self._discard(label)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the factory counters along with the number of idle clones
+        pooled for each repo.
+        """
+        with self._lock:
+            pooled = {label: len(pool) for label, pool in self._pools.items()}
+            return asdict(self._stats) | {"pooled": pooled, "pool_size": config.butler.pool_size}
+
     @cache
     def get_butler_config(self, label: str, *, without_datastore: bool = True) -> ButlerConfig:
         """Create a butler config object for a repo known to the service's
@@ -181,6 +326,117 @@ in other modules.
 """
 
 
+@dataclass(frozen=True)
+class CollectionOperation:
+    """A single operation on a Butler collection, for use with
+    `batch_collection_operations`.
+
+    Parameters
+    ----------
+    op : str
+        The operation, one of "remove" to remove the collection, "chain" to
+        (re)define the collection as a chained collection of the children, or
+        "unchain" to remove the children from the chained collection. A RUN
+        collection that holds datasets is never removed.
+
+    collection : str
+        The name of the collection to operate on.
+
+    children : tuple[str, ...]
+        The child collections of a "chain" or "unchain" operation.
+    """
+
+    op: Literal["remove", "chain", "unchain"]
+    collection: str
+    children: tuple[str, ...] = ()
+
+
+def apply_collection_operations(butler: Butler, operations: Sequence[CollectionOperation]) -> int:
+    """Apply a sequence of collection operations, in order, in a single
+    registry transaction, returning the number of operations applied.
+
+    Removing a collection that does not exist, or removing children from a
+    chain that does not exist, is not an error, so the same operations may be
+    applied more than once.
+
+    A RUN collection whose summary has any dataset type is left in place, as
+    removing it from the registry alone would orphan its datastore artifacts.
+
+    Notes
+    -----
+    This function blocks on database operations and should be called from a
+    worker thread.
+    """
+    applied = 0
+    with butler.transaction():
+        for operation in operations:
+            try:
+                match operation.op:
+                    case "remove":
+                        info = butler.collections.get_info(operation.collection, include_summary=True)
+                        if info.type is CollectionType.RUN and info.dataset_types:
+                            logger.warning(
+                                "Not removing a RUN collection with datasets", collection=operation.collection
+                            )
+                            continue
+                        butler.registry.removeCollection(operation.collection)
+                    case "chain":
+                        butler.collections.register(operation.collection, CollectionType.CHAINED)
+                        butler.collections.redefine_chain(operation.collection, list(operation.children))
+                    case "unchain":
+                        butler.collections.remove_from_chain(operation.collection, list(operation.children))
+            except MissingCollectionError:
+                if operation.op == "chain":
+                    raise
+                continue
+            applied += 1
+    return applied
+
+
+async def batch_collection_operations(
+    butler_repo: str,
+    operations: Sequence[CollectionOperation],
+    *,
+    fake_reset: bool = False,
+) -> None:
+    """Apply a batch of collection operations to a Butler repo in a single
+    registry transaction.
+
+    Parameters
+    ----------
+    butler_repo: str
+        Butler Repo
+
+    operations: Sequence[CollectionOperation]
+        The collection operations to apply, in order.
+
+    fake_reset: bool
+        Allow for missing butler
+
+    Raises
+    ------
+    CMNoButlerError
+        Raised when no Butler is available for the repo.
+
+    CMButlerCallError
+        Raised when any operation fails, in which case none are applied.
+    """
+    if not operations:
+        return
+    fake_reset = fake_reset or (Features.MOCK_BUTLER in config.features.enabled)
+    try:
+        async with BUTLER_FACTORY.lease(butler_repo) as butler:
+            apply_f = partial(apply_collection_operations, butler, operations)
+            applied = await to_thread.run_sync(apply_f)
+    except errors.CMNoButlerError:
+        if fake_reset:
+            return
+        raise
+    except Exception as msg:
+        raise errors.CMButlerCallError(msg) from msg
+    logger.info("Applied butler collection operations", repo=butler_repo, applied=applied)
+
+
 # TODO: deprecate these functions that attempt to "remove" data from Butlers.
 async def remove_run_collections(
     butler_repo: str,
@@ -203,22 +459,15 @@ async def remove_run_collections(
     """
     fake_reset = fake_reset or (Features.MOCK_BUTLER in config.features.enabled)
     try:
-        butler_f = partial(
-            Butler.from_config,
-            butler_repo,
-            collections=[collection_name],
-            without_datastore=True,
-        )
-        butler = await to_thread.run_sync(butler_f)
-    except Exception as e:
+        async with BUTLER_FACTORY.lease(butler_repo) as butler:
+            await to_thread.run_sync(butler.registry.removeCollection, collection_name)
+    except errors.CMNoButlerError:
         if fake_reset:
             return
-        raise errors.CMNoButlerError(e) from e  # pragma: no cover
-    try:  # pragma: no cover
-        await to_thread.run_sync(butler.registry.removeCollection, collection_name)
-    except MissingCollectionError:
+        raise  # pragma: no cover
+    except MissingCollectionError:  # pragma: no cover
         pass
-    except Exception as msg:
+    except Exception as msg:  # pragma: no cover
         raise errors.CMButlerCallError(msg) from msg
 
 
@@ -244,20 +493,13 @@ async def remove_non_run_collections(
     """
     fake_reset = fake_reset or (Features.MOCK_BUTLER in config.features.enabled)
     try:
-        butler_f = partial(
-            Butler.from_config,
-            butler_repo,
-            collections=[collection_name],
-            without_datastore=True,
-        )
-        butler = await to_thread.run_sync(butler_f)
-    except Exception as e:
+        async with BUTLER_FACTORY.lease(butler_repo) as butler:
+            await to_thread.run_sync(butler.registry.removeCollection, collection_name)
+    except errors.CMNoButlerError:
         if fake_reset:
             return
-        raise errors.CMNoButlerError(e) from e  # pragma: no cover
-    try:  # pragma: no cover
-        await to_thread.run_sync(butler.registry.removeCollection, collection_name)
-    except Exception as msg:
+        raise  # pragma: no cover
+    except Exception as msg:  # pragma: no cover
         raise errors.CMButlerCallError(msg) from msg
 
 
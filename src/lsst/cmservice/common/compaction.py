@@ -0,0 +1,160 @@
+"""Module implementing the compaction of the tasks and activity log tables.
+
+Finished Tasks are tombstoned in the task queue and an Activity Log entry is
+written for every milestone of every Node, so both tables grow for the life of
+the service. The compaction job periodically moves rows that have outlived
+their retention into archive tables, keeping the working tables small for the
+daemon and the API.
+
+Notes
+-----
+Retention is configured in seconds by the daemon's ``task_retention`` and
+``activity_log_retention`` settings, and may be overridden by a campaign with
+a ``retention`` mapping of numbers in its metadata, e.g.,
+
+.. code-block:: yaml
+
+   metadata:
+     retention:
+       tasks: 3600
+       activity_log: 604800
+
+Rows are moved in batches by a single ``DELETE ... RETURNING`` statement whose
+output is inserted into the archive table, so a row is never in both tables.
+"""
+
+import asyncio
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from time import perf_counter
+
+from sqlalchemy import Float, Table, case, delete, func, insert, select
+from sqlalchemy import cast as sql_cast
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import col
+
+from lsst.cmservice.models.db.archive import ActivityLogArchive, TaskArchive
+from lsst.cmservice.models.db.campaigns import ActivityLog, Campaign, Task
+from lsst.cmservice.models.types import AnyAsyncSession
+
+from ..config import config
+from ..db.session import db_session_dependency
+from .logging import LOGGER
+
+logger = LOGGER.bind(module=__name__)
+
+
+@dataclass
+class CompactionStats:
+    """Counters describing the work of the compaction job."""
+
+    runs: int = 0
+    tasks_archived: int = 0
+    activity_log_archived: int = 0
+    last_elapsed: float = 0.0
+
+
+COMPACTION_STATS = CompactionStats()
+"""Process-wide counters of the compaction job."""
+
+
+def retention_seconds(key: str, default: int) -> ColumnElement[float]:
+    """Returns a SQL expression for a campaign's retention of a kind of row in
+    seconds, from the campaign's metadata or else the default. A retention in
+    the metadata that is not a number is ignored.
+    """
+    retention = func.jsonb_extract_path(col(Campaign.metadata_), "retention", key)
+    return case(
+        (
+            func.jsonb_typeof(retention) == "number",
+            sql_cast(func.jsonb_extract_path_text(col(Campaign.metadata_), "retention", key), Float),
+        ),
+        else_=default,
+    )
+
+
+async def archive_rows(
+    session: AnyAsyncSession,
+    source_table: Table,
+    archive_table: Table,
+    retention: ColumnElement[float],
+    batch_size: int,
+) -> int:
+    """Moves a batch of at most ``batch_size`` finished rows older than their
+    campaign's retention from a source table to its archive table, returning
+    the number of rows moved.
+    """
+    expired = (
+        select(source_table.c.id)
+        .join(Campaign, col(Campaign.id) == source_table.c.namespace)
+        .where(source_table.c.finished_at.is_not(None))
+        .where(func.extract("epoch", func.now() - source_table.c.finished_at) > retention)
+        .limit(batch_size)
+        .with_for_update(of=source_table, skip_locked=True)
+    )
+    moved = (
+        delete(source_table)
+        .where(source_table.c.id.in_(expired.scalar_subquery()))
+        .returning(*source_table.c)
+        .cte("moved")
+    )
+    columns = [c.name for c in source_table.c]
+    statement = insert(archive_table).from_select(columns, select(*[moved.c[c] for c in columns]))
+    result = await session.execute(statement)
+    return int(result.rowcount)  # type: ignore[attr-defined]
+
+
+async def compact(session: AnyAsyncSession) -> CompactionStats:
+    """Archives every tombstoned task and expired activity log entry, one
+    committed batch at a time, returning the counts of rows moved.
+    """
+    start = perf_counter()
+    stats = CompactionStats(runs=1)
+    batch_size = config.daemon.compaction_batch_size
+    for source_table, archive_table, retention, counter in (
+        (
+            Task.__table__,  # type: ignore[attr-defined]
+            TaskArchive.__table__,  # type: ignore[attr-defined]
+            retention_seconds("tasks", config.daemon.task_retention),
+            "tasks_archived",
+        ),
+        (
+            ActivityLog.__table__,  # type: ignore[attr-defined]
+            ActivityLogArchive.__table__,  # type: ignore[attr-defined]
+            retention_seconds("activity_log", config.daemon.activity_log_retention),
+            "activity_log_archived",
+        ),
+    ):
+        while True:
+            moved = await archive_rows(session, source_table, archive_table, retention, batch_size)
+            await session.commit()
+            setattr(stats, counter, getattr(stats, counter) + moved)
+            if moved < batch_size:
+                break
+    stats.last_elapsed = perf_counter() - start
+
+    COMPACTION_STATS.runs += stats.runs
+    COMPACTION_STATS.tasks_archived += stats.tasks_archived
+    COMPACTION_STATS.activity_log_archived += stats.activity_log_archived
+    COMPACTION_STATS.last_elapsed = stats.last_elapsed
+    logger.info("Compaction complete", **asdict(stats))
+    return stats
+
+
+async def compaction_loop(sentinel: asyncio.Event) -> None:
+    """Background task running the compaction job every compaction interval
+    until the sentinel is set.
+    """
+    if db_session_dependency.sessionmaker is None:
+        raise RuntimeError("Database SessionMaker is not ready!")
+
+    logger.info("Starting compaction job...")
+    while not sentinel.is_set():
+        async with db_session_dependency.sessionmaker() as session:
+            try:
+                await compact(session)
+            except Exception:
+                logger.exception()
+                await session.rollback()
+        with suppress(TimeoutError):
+            await asyncio.wait_for(sentinel.wait(), timeout=config.daemon.compaction_interval)
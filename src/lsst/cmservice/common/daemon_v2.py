@@ -1,11 +1,12 @@
-import pickle
+from asyncio import Semaphore, TaskGroup, create_task, timeout
 from asyncio import Task as AsyncTask
-from asyncio import TaskGroup, create_task
-from collections.abc import Awaitable, Mapping
+from collections import Counter
+from collections.abc import Awaitable, Mapping, Sequence, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 from itertools import groupby
 from operator import attrgetter
+from time import perf_counter
 from types import TracebackType
 from typing import TYPE_CHECKING, Self, cast
 from uuid import UUID, uuid5
@@ -16,22 +17,24 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.orm import make_transient, selectinload
 from sqlalchemy.orm.attributes import InstrumentedAttribute
-from sqlmodel import col, select
+from sqlmodel import col, exists, or_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from transitions import Event
 
 from lsst.cmservice.common.scheduler import Scheduler
 from lsst.cmservice.models.api.schedules import ScheduleConfiguration
-from lsst.cmservice.models.db.campaigns import Campaign, Edge, Machine, Node, Task
+from lsst.cmservice.models.db.campaigns import Campaign, Machine, Node, Task
 from lsst.cmservice.models.db.schedules import Schedule
-from lsst.cmservice.models.enums import StatusEnum
+from lsst.cmservice.models.enums import ManifestKind, StatusEnum
 from lsst.cmservice.models.lib import graph, timestamp
 
 from ..common.flags import Features
 from ..common.templates import build_sandbox_and_render_templates
 from ..config import config
 from ..db.session import db_session_dependency
-from ..machines.node import NodeMachine, node_machine_factory
+from ..machines.node import NodeMachine, load_node_machine, node_machine_factory
+from .graph_cache import GRAPH_CACHE
+from .htcondor import HTCONDOR_POLLER
 from .logging import LOGGER
 from .scheduler import JobEventReturnCode
 
@@ -59,16 +62,10 @@ class DaemonContext:
         return None
 
 
-async def daemon_process_node(session: AsyncSession, node: Node, request_id: str | None = None) -> None:
-    """Processes a single state transition for a single Node by constructing
-    a ``Task`` record for the next "desired" status along the Node's "happy
-    path".
-
-    This function is usually called by the `consider_campaigns` phase of a
-    daemon iteration for each "processable" node in a campaign graph, but can
-    be also called manually for a specific Node, as in an RPC API.
+def desired_node_task(node: Node, request_id: str | None = None) -> Task:
+    """Constructs a ``Task`` record for the next "desired" status along the
+    Node's "happy path".
     """
-    logger.info("Daemon considering node", id=str(node.id))
     desired_state = node.status.next_status()
     node_task = Task(
         id=uuid5(node.id, desired_state.name),
@@ -79,28 +76,56 @@ async def daemon_process_node(session: AsyncSession, node: Node, request_id: str
     )
     if request_id is not None:
         node_task.metadata_["request_id"] = request_id
-    statement = insert(node_task.__table__).values(**node_task.model_dump(by_alias=True))  # type: ignore[attr-defined]
-
-    # When testing or developing, allow the daemon to upsert tasks
-    # that already exist by unsetting their submitted_at/finished_at
-    if Features.ALLOW_TASK_UPSERT in config.features.enabled:
-        statement = statement.on_conflict_do_update(
-            index_elements=[col.name for col in node_task.__table__.primary_key],  # type: ignore[attr-defined]
-            set_={col(Task.finished_at): None, col(Task.submitted_at): None},
-        )
-    else:
-        statement = statement.on_conflict_do_nothing()
-    await session.exec(statement)
+    return node_task
+
+
+async def daemon_enqueue_tasks(session: AsyncSession, tasks: Sequence[Task]) -> None:
+    """Writes a set of ``Task`` records to the Tasks table with a multi-row
+    insert statement for each batch of at most ``task_batch_size`` tasks.
+
+    A task that already exists is left alone, unless the ``ALLOW_TASK_UPSERT``
+    feature is enabled, in which case its submitted_at and finished_at are
+    unset so that it is handled again.
+    """
+    # A row may not be affected twice by the same statement's conflict clause
+    unique_tasks = list({task.id: task for task in tasks}.values())
+    batch_size = config.daemon.task_batch_size
+    tasks_table = Task.__table__  # type: ignore[attr-defined]
+    for i in range(0, len(unique_tasks), batch_size):
+        batch = unique_tasks[i : i + batch_size]
+        statement = insert(tasks_table).values([task.model_dump(by_alias=True) for task in batch])
+
+        # When testing or developing, allow the daemon to upsert tasks
+        # that already exist by unsetting their submitted_at/finished_at
+        if Features.ALLOW_TASK_UPSERT in config.features.enabled:
+            statement = statement.on_conflict_do_update(
+                index_elements=[col.name for col in tasks_table.primary_key],
+                set_={col(Task.finished_at): None, col(Task.submitted_at): None},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing()
+        await session.exec(statement)
+
+
+async def daemon_process_node(session: AsyncSession, node: Node, request_id: str | None = None) -> None:
+    """Processes a single state transition for a single Node by constructing
+    a ``Task`` record for the next "desired" status along the Node's "happy
+    path".
+
+    This function can be called manually for a specific Node, as in an RPC
+    API. The `consider_campaigns` phase of a daemon iteration instead enqueues
+    the tasks for every "processable" node in a campaign graph at once.
+    """
+    logger.info("Daemon considering node", id=str(node.id))
+    await daemon_enqueue_tasks(session, [desired_node_task(node, request_id)])
 
 
 async def assemble_campaign_graph(session: AsyncSession, campaign_id: UUID) -> nx.DiGraph:
     """Assembles a campaign graph for the purpose of identifying processable
-    nodes for a campaign.
+    nodes for a campaign, reusing a cached graph if the campaign has not
+    changed since it was last assembled.
     """
-    # Fetch the Edges for the campaign
-    e_statement = select(Edge).filter_by(namespace=campaign_id)
-    edges = (await session.exec(e_statement)).all()
-    campaign_graph = await graph.graph_from_edge_list_v2(edges=edges, session=session)
+    campaign_graph = await GRAPH_CACHE.get(campaign_id, session=session)
     return campaign_graph
 
 
@@ -115,8 +140,39 @@ async def daemon_consider_campaign(
     campaign_graph = await assemble_campaign_graph(session, campaign_id)
 
     # Create or update tasks for each Processable Node in a campaign's graph
+    tasks = []
     for node in graph.processable_graph_nodes(campaign_graph):
-        await daemon_process_node(session, node, request_id=request_id)
+        logger.info("Daemon considering node", id=str(node.id))
+        tasks.append(desired_node_task(node, request_id))
+    await daemon_enqueue_tasks(session, tasks)
+
+
+async def consider_campaign_with_budget(campaign_id: UUID, semaphore: Semaphore) -> None:
+    """Considers a single campaign in a new database session once the
+    semaphore allows it, abandoning the campaign's consideration if it does
+    not complete within the daemon's per-campaign time budget or if it fails,
+    so that other campaigns are still considered.
+    """
+    if TYPE_CHECKING:
+        assert db_session_dependency.sessionmaker is not None
+    async with semaphore, db_session_dependency.sessionmaker() as session:
+        start = perf_counter()
+        try:
+            async with timeout(config.daemon.campaign_time_budget):
+                await daemon_consider_campaign(session, campaign_id)
+                await session.commit()
+        except TimeoutError:
+            logger.warning(
+                "Daemon exceeded time budget for campaign",
+                id=str(campaign_id),
+                budget=config.daemon.campaign_time_budget,
+            )
+            await session.rollback()
+        except Exception:
+            logger.exception("Daemon failed to consider campaign", id=str(campaign_id))
+            await session.rollback()
+        finally:
+            logger.info("Daemon considered campaign", id=str(campaign_id), elapsed=perf_counter() - start)
 
 
 async def consider_campaigns(context: DaemonContext) -> None:
@@ -129,6 +185,9 @@ async def consider_campaigns(context: DaemonContext) -> None:
     from the campaign's Edges, and starting at the START node, walks the graph
     until a Node is found that requires attention. Each Node found is added to
     the Tasks table as a queue item.
+
+    Campaigns are considered concurrently, up to the daemon's configured
+    ``campaign_concurrency``, and each within its ``campaign_time_budget``.
     """
     session = context.session
     c_statement = (
@@ -138,8 +197,12 @@ async def consider_campaigns(context: DaemonContext) -> None:
     )
     campaigns = (await session.exec(c_statement)).all()
 
-    for campaign_id in campaigns:
-        await daemon_consider_campaign(session, campaign_id)
+    # Each campaign is considered concurrently in its own session while the
+    # iteration session keeps the campaigns locked.
+    semaphore = Semaphore(config.daemon.campaign_concurrency)
+    async with TaskGroup() as tg:
+        for campaign_id in campaigns:
+            tg.create_task(consider_campaign_with_budget(campaign_id, semaphore), name=str(campaign_id))
 
     # For campaigns in paused state, we want to make sure any RUNNING nodes in
     # those campaigns are checked.
@@ -150,15 +213,128 @@ async def consider_campaigns(context: DaemonContext) -> None:
         .where(Node.status == StatusEnum.running)
     )
     nodes = (await session.exec(n_statement)).all()
+    tasks = []
     for node in nodes:
-        await daemon_process_node(session, node)
+        logger.info("Daemon considering node", id=str(node.id))
+        tasks.append(desired_node_task(node))
+    await daemon_enqueue_tasks(session, tasks)
     await session.commit()
 
 
+class NodeWorkerPool:
+    """A bounded pool of workers for node transitions, which limits the number
+    of transitions in flight overall and for each kind of node.
+
+    A slot in the pool must be reserved before a task is claimed from the
+    Tasks table and is released when the node transition is complete, so a
+    daemon cannot claim more work than it is prepared to handle. A node is
+    only admitted to a reserved slot when the limit for its kind allows
+    another transition, so a slot is never held by a node waiting on its kind.
+    """
+
+    def __init__(self, size: int, kind_limits: Mapping[str, int]) -> None:
+        self.slots = Semaphore(size)
+        self.kind_limits = dict(kind_limits)
+        self.kind_running: Counter[str] = Counter()
+
+    async def reserve(self, n: int) -> int:
+        """Wait until at least one slot is available, then reserve up to `n`
+        slots, returning the number of slots reserved.
+        """
+        await self.slots.acquire()
+        reserved = 1
+        while reserved < n and not self.slots.locked():
+            await self.slots.acquire()
+            reserved += 1
+        return reserved
+
+    def release(self, n: int = 1) -> None:
+        """Release `n` reserved slots."""
+        for _ in range(n):
+            self.slots.release()
+
+    def saturated_kinds(self) -> list[ManifestKind]:
+        """Return the kinds of node at the limit of their transitions."""
+        return [
+            ManifestKind[kind]
+            for kind, limit in self.kind_limits.items()
+            if kind in ManifestKind.__members__ and self.kind_running[kind] >= limit
+        ]
+
+    def admit(self, kind: ManifestKind) -> bool:
+        """Admit a transition for a node of the given kind without waiting,
+        returning False if the limit for the kind allows no more transitions.
+        """
+        limit = self.kind_limits.get(kind.name)
+        if limit is not None and self.kind_running[kind.name] >= limit:
+            return False
+        self.kind_running[kind.name] += 1
+        return True
+
+    def dismiss(self, kind: ManifestKind) -> None:
+        """Give up an admission for a node of the given kind."""
+        self.kind_running[kind.name] -= 1
+
+    async def run(self, kind: ManifestKind, transition: Awaitable[bool]) -> bool:
+        """Await an admitted node transition in a reserved slot, releasing the
+        slot and the admission afterward.
+        """
+        try:
+            return await transition
+        finally:
+            self.dismiss(kind)
+            self.release()
+
+
+async def claim_tasks(
+    session: AsyncSession, limit: int, exclude: Set[UUID], exclude_kinds: Sequence[ManifestKind] = ()
+) -> Sequence[Task]:
+    """Claims a page of at most `limit` unsubmitted tasks from the Tasks table,
+    locking the claimed rows and skipping any rows locked by another daemon.
+
+    Tasks are claimed in order of priority, where a lower value is a higher
+    priority and tasks without a priority come last, then in order of age.
+    When the daemon is configured with a priority, tasks with a higher value
+    are left for another daemon. When the daemon is configured with site
+    affinities, only tasks without a site affinity or sharing one of these
+    sites are claimed. Tasks for nodes of any of the `exclude_kinds` are left
+    unclaimed.
+    """
+    statement = (
+        select(Task)
+        .where(col(Task.submitted_at).is_(None))
+        .options(selectinload(cast(InstrumentedAttribute, Task.node_orm)))
+    )
+    if exclude:
+        statement = statement.where(col(Task.id).not_in(exclude))
+    if exclude_kinds:
+        statement = statement.where(
+            ~exists().where(col(Node.id) == col(Task.node), col(Node.kind).in_(exclude_kinds))
+        )
+    if config.daemon.priority is not None:
+        statement = statement.where(
+            or_(col(Task.priority).is_(None), col(Task.priority) <= config.daemon.priority)
+        )
+    if config.daemon.site_affinity:
+        statement = statement.where(
+            or_(
+                col(Task.site_affinity).is_(None),
+                cast(InstrumentedAttribute, Task.site_affinity).overlap(config.daemon.site_affinity),
+            )
+        )
+    statement = (
+        statement.order_by(col(Task.priority).asc().nulls_last(), col(Task.created_at).asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (await session.exec(statement)).all()
+
+
 async def consider_nodes(context: DaemonContext) -> None:
     """In Phase Two, the daemon considers Nodes. Nodes subject to consideration
     are only those Nodes found on the Tasks table that have a priority lower
-    than the daemon's own priority, and share the daemon's site affinity.
+    than the daemon's own priority, and share the daemon's site affinity (see
+    `claim_tasks`).
 
     For each node considered by the daemon, the Node's FSM is loaded from the
     Machines table, or creates one if needed. The daemon uses methods on the
@@ -166,79 +342,99 @@ async def consider_nodes(context: DaemonContext) -> None:
 
     After handling, the Node's FSM is serialized and the Node is updated with
     new values as necessary. The Task is not returned to the Task table.
+
+    Tasks are claimed in pages of at most ``node_claim_page_size``, and only
+    as worker slots become available in a pool bounded by the daemon's
+    ``node_concurrency`` and ``node_kind_concurrency`` settings.
     """
     session = context.session
-    # Select and lock unsubmitted tasks
-    statement = (
-        select(Task)
-        .where(col(Task.submitted_at).is_(None))
-        .options(selectinload(cast(InstrumentedAttribute, Task.node_orm)))
-    )
-    # TODO add filter criteria for priority and site affinity
-    statement = statement.with_for_update(skip_locked=True)
-
-    cm_tasks = (await session.exec(statement)).all()
+    pool = NodeWorkerPool(config.daemon.node_concurrency, config.daemon.node_kind_concurrency)
+    # Tasks claimed but not submitted during this iteration are not claimed
+    # again until the next iteration.
+    unsubmitted: set[UUID] = set()
 
     # Using a TaskGroup context manager means all "tasks" added to the group
     # are awaited when the CM exits, giving us concurrency for all the nodes
     # being considered in the current iteration.
     async with TaskGroup() as tg:
-        for cm_task in cm_tasks:
-            node = cm_task.node_orm
-            request_id = node.metadata_.get("request_id")
-            logger.info("Daemon evolving node", id=str(node.id), task=str(cm_task.id), request_id=request_id)
-
-            # the task's status field is the target status for the node, so the
-            # daemon intends to evolve the node machine to that state.
-            try:
-                assert node.status is cm_task.previous_status
-            except AssertionError:
-                logger.error("Node status out of sync with Machine", id=str(node.id))
-                continue
-
-            # Expunge the node from *this* session and make it transient to
-            # support cross-session transfers with modifications
-            session.expunge(node)
-            make_transient(node)
-
-            node_machine: NodeMachine
-            node_machine_pickle: Machine | None
-            if node.machine is None:
-                # create a new machine for the node
-                # FIXME a node stored without serializing the FSM will not have
-                # a prepared configuration chain, so cannot be triggered with
-                # any transition beyond "prepare"
-                node_machine = node_machine_factory(node.kind)(o=node, initial_state=node.status)
-                node_machine_pickle = None
-            else:
-                # unpickle the node's machine and rehydrate the Stateful Model
-                node_machine_pickle = await session.get_one(Machine, node.machine)
-                node_machine = (pickle.loads(node_machine_pickle.state)).model
-                node_machine.db_model = node
-                node_machine.state = node.status
-                # discard the pickled machine from this session and context
-                session.expunge(node_machine_pickle)
-                del node_machine_pickle
-
-            # check possible triggers for state
-            # TODO how to pick the "best" trigger from multiple available?
-            # - Add a caller-backed conditional to the triggers, to identify
-            #   triggers the daemon is "allowed" to use
-            # - Determine the "desired" trigger from the task (source, dest)
-            if (trigger := trigger_for_transition(cm_task, node_machine.machine.events)) is None:
-                logger.warning(
-                    "No trigger available for desired state transition",
-                    source=cm_task.previous_status,
-                    dest=cm_task.status,
+        while True:
+            reserved = await pool.reserve(config.daemon.node_claim_page_size)
+            cm_tasks = await claim_tasks(session, reserved, unsubmitted, pool.saturated_kinds())
+            if not cm_tasks:
+                pool.release(reserved)
+                await session.commit()
+                break
+
+            for cm_task in cm_tasks:
+                unsubmitted.add(cm_task.id)
+                node = cm_task.node_orm
+                request_id = node.metadata_.get("request_id")
+                logger.info(
+                    "Daemon evolving node", id=str(node.id), task=str(cm_task.id), request_id=request_id
                 )
-                continue
-
-            # Add the node transition trigger method to the task group
-            task = tg.create_task(node_machine.trigger(trigger, request_id=request_id), name=str(cm_task.id))
-            task.add_done_callback(task_runner_callback)
 
-            # wrap up - update the task and commit
-            cm_task.submitted_at = timestamp.now_utc()
+                # the task's status field is the target status for the node, so
+                # the daemon intends to evolve the node machine to that state.
+                try:
+                    assert node.status is cm_task.previous_status
+                except AssertionError:
+                    logger.error("Node status out of sync with Machine", id=str(node.id))
+                    continue
+
+                # A node of a kind at its limit is left unsubmitted for a later
+                # iteration instead of holding a slot while it waits its turn
+                if not pool.admit(node.kind):
+                    continue
+
+                # Expunge the node from *this* session and make it transient to
+                # support cross-session transfers with modifications
+                session.expunge(node)
+                make_transient(node)
+
+                node_machine: NodeMachine
+                if node.machine is None:
+                    # create a new machine for the node
+                    # FIXME a node stored without serializing the FSM will not
+                    # have a prepared configuration chain, so cannot be
+                    # triggered with any transition beyond "prepare"
+                    node_machine = node_machine_factory(node.kind)(o=node, initial_state=node.status)
+                else:
+                    # rebuild the Stateful Model from the node's stored machine
+                    stored_machine = await session.get_one(Machine, node.machine)
+                    node_machine = load_node_machine(stored_machine, node)
+                    # discard the stored machine from this session and context
+                    session.expunge(stored_machine)
+                    del stored_machine
+
+                # check possible triggers for state
+                # TODO how to pick the "best" trigger from multiple available?
+                # - Add a caller-backed conditional to the triggers, to
+                #   identify triggers the daemon is "allowed" to use
+                # - Determine the "desired" trigger from the task (source,
+                #   dest)
+                if (trigger := trigger_for_transition(cm_task, node_machine.machine.events)) is None:
+                    logger.warning(
+                        "No trigger available for desired state transition",
+                        source=cm_task.previous_status,
+                        dest=cm_task.status,
+                    )
+                    pool.dismiss(node.kind)
+                    continue
+
+                # Add the node transition trigger method to the task group, to
+                # run in one of the slots reserved for this page
+                transition = node_machine.trigger(trigger, request_id=request_id)
+                task = tg.create_task(pool.run(node.kind, transition), name=str(cm_task.id))
+                task.add_done_callback(task_runner_callback)
+                reserved -= 1
+
+                # update the task, which is committed with its page
+                cm_task.submitted_at = timestamp.now_utc()
+                unsubmitted.discard(cm_task.id)
+
+            # release any slots reserved for tasks that were not submitted and
+            # commit the page
+            pool.release(reserved)
             await session.commit()
 
 
@@ -382,7 +578,12 @@ async def daemon_iteration(context: DaemonContext) -> None:
     logger.debug("Daemon V2 Iteration: %s", context.iteration_start)
     if Features.DAEMON_CAMPAIGNS in config.features.enabled:
         await consider_campaigns(context)
+        logger.debug("Campaign graph cache", **GRAPH_CACHE.stats())
     if Features.DAEMON_NODES in config.features.enabled:
+        # Poll the jobs of every running node at once before any node checks
+        # its own job
+        if config.mock_status is None:
+            await HTCONDOR_POLLER.poll_running_nodes(context.session)
         await consider_nodes(context)
     if Features.SCHEDULER in config.features.enabled:
         if context.app.state.scheduler.is_running:
@@ -194,4 +194,6 @@ class SplitterEnum(enum.Enum):
 
     NULL = "null"
     QUERY = "query"
+    DIMENSION = "dimension"
     VALUES = "values"
+    WEIGHTED = "weighted"
@@ -0,0 +1,220 @@
+"""Module implementing a process-wide classifier of pipetask errors.
+
+A pipetask error is classified by the first pipetask error type whose task
+name pattern matches the name of the failed task and whose diagnostic message
+pattern matches the error's diagnostic message. Loading a pipetask report can
+classify tens of thousands of failed quanta, so rather than querying and
+matching every error type for each of them, the ``ERROR_CLASSIFIER`` loads the
+error types once and compiles their patterns.
+
+The error types are grouped by task name pattern, and the diagnostic message
+patterns of each group are combined into a single alternation. Alternatives
+are tried in order, so the first pattern to match in the alternation is the
+first error type to match in the group. An empty named group follows each
+alternative to identify it. A group whose patterns cannot be combined, e.g.,
+because they use numbered backreferences or inline global flags, keeps a
+compiled pattern for each error type instead.
+
+Notes
+-----
+The classifier follows a "global" pattern where it is assigned to a
+module-level variable at import-time, like the manifest cache.
+
+The classifier is kept while the version of the error type rows (see
+`lsst.cmservice.common.row_version`) is unchanged, which is checked before
+each pipetask report is loaded. The error type routes and loaders also
+explicitly invalidate the classifier.
+"""
+
+import re
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from itertools import groupby
+from typing import Any
+
+from sqlalchemy import select
+
+from lsst.cmservice.models.types import AnyAsyncSession
+
+from ..db.pipetask_error_type import PipetaskErrorType
+from .logging import LOGGER
+from .row_version import row_version
+
+logger = LOGGER.bind(module=__name__)
+
+BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+"""A numbered or named backreference in a regular expression."""
+
+NEVER = re.compile(r"(?!)")
+"""A regular expression that never matches."""
+
+
+@dataclass
+class ErrorClassifierStats:
+    """Counters describing the use of an error classifier."""
+
+    builds: int = 0
+    reuses: int = 0
+    invalidations: int = 0
+    classified: int = 0
+    unmatched: int = 0
+
+
+def compile_or_never(pattern: str) -> re.Pattern[str]:
+    """Compile a pattern of an error type, or a pattern that never matches if
+    the pattern is not a valid regular expression.
+    """
+    try:
+        return re.compile(pattern)
+    except re.error:
+        logger.warning("Invalid pipetask error type pattern", pattern=pattern)
+        return NEVER
+
+
+@dataclass
+class TaskPatternGroup:
+    """The compiled diagnostic message patterns of the error types sharing a
+    task name pattern.
+
+    Parameters
+    ----------
+    task_pattern : re.Pattern
+        The compiled task name pattern of the group.
+
+    error_type_ids : list[int]
+        The ids of the error types in the group, in match order.
+
+    combined : re.Pattern | None
+        The alternation of every diagnostic message pattern of the group, if
+        they can be combined.
+
+    patterns : list[re.Pattern]
+        The compiled diagnostic message pattern of each error type, if they
+        cannot be combined.
+    """
+
+    task_pattern: re.Pattern[str]
+    error_type_ids: list[int]
+    combined: re.Pattern[str] | None = None
+    patterns: list[re.Pattern[str]] | None = None
+
+    @classmethod
+    def compile(cls, task_pattern: str, error_types: Sequence[tuple[int, str]]) -> "TaskPatternGroup":
+        """Compile the diagnostic message patterns of the error types sharing
+        a task name pattern, given as pairs of error type id and pattern.
+        """
+        ids = [error_type_id for error_type_id, _ in error_types]
+        group = cls(task_pattern=compile_or_never(task_pattern), error_type_ids=ids)
+        messages = [message for _, message in error_types]
+        if not any(BACKREFERENCE.search(message) for message in messages):
+            try:
+                group.combined = re.compile(
+                    "|".join(f"(?:{message})(?P<_e{i}>)" for i, message in enumerate(messages))
+                )
+                return group
+            except re.error:
+                pass
+        group.patterns = [compile_or_never(message) for message in messages]
+        return group
+
+    def match(self, diagnostic_message: str) -> int | None:
+        """Returns the id of the first error type of the group matching a
+        diagnostic message, or `None`.
+        """
+        if self.combined is not None:
+            if (m := self.combined.match(diagnostic_message)) is None:
+                return None
+            # only the group following the matching alternative participates
+            name = next(n for n, value in m.groupdict().items() if n.startswith("_e") and value == "")
+            return self.error_type_ids[int(name[2:])]
+        assert self.patterns is not None
+        for index, pattern in enumerate(self.patterns):
+            if pattern.match(diagnostic_message):
+                return self.error_type_ids[index]
+        return None
+
+
+class ErrorClassifier:
+    """A classifier of pipetask errors by the compiled patterns of all the
+    pipetask error types.
+    """
+
+    def __init__(self) -> None:
+        self._stats = ErrorClassifierStats()
+        self._fingerprint: tuple[int, int] | None = None
+        self._groups: list[TaskPatternGroup] = []
+        self._order: dict[int, int] = {}
+
+    async def refresh(self, session: AnyAsyncSession) -> "ErrorClassifier":
+        """Make sure the classifier reflects the error types in the database,
+        loading and compiling them again if the table has changed.
+        """
+        count, xmin = (await session.execute(row_version(PipetaskErrorType))).one()
+        if (count, xmin) == self._fingerprint:
+            self._stats.reuses += 1
+            return self
+
+        rows = (
+            await session.execute(
+                select(
+                    PipetaskErrorType.id, PipetaskErrorType.task_name, PipetaskErrorType.diagnostic_message
+                ).order_by(PipetaskErrorType.id)
+            )
+        ).all()
+        self.build([(row.id, row.task_name, row.diagnostic_message) for row in rows])
+        self._fingerprint = (count, xmin)
+        return self
+
+    def build(self, error_types: Sequence[tuple[int, str, str]]) -> None:
+        """Compile the patterns of a sequence of error types, given in match
+        order as their id, task name pattern and diagnostic message pattern.
+        """
+        self._order = {error_type_id: order for order, (error_type_id, _, _) in enumerate(error_types)}
+        self._groups = []
+        by_task = sorted(error_types, key=lambda error_type: error_type[1].strip())
+        for task_pattern, members in groupby(by_task, key=lambda error_type: error_type[1].strip()):
+            ordered = sorted(members, key=lambda error_type: self._order[error_type[0]])
+            self._groups.append(
+                TaskPatternGroup.compile(
+                    task_pattern, [(error_type_id, message.strip()) for error_type_id, _, message in ordered]
+                )
+            )
+        self._stats.builds += 1
+        logger.debug("Compiled pipetask error types", error_types=len(error_types), groups=len(self._groups))
+
+    def classify(self, task_name: str, diagnostic_message: str) -> int | None:
+        """Returns the id of the first error type matching a failed task name
+        and diagnostic message, or `None` if no error type matches.
+        """
+        task_name = task_name.strip()
+        diagnostic_message = diagnostic_message.strip()
+        best: int | None = None
+        for group in self._groups:
+            if not group.task_pattern.match(task_name):
+                continue
+            if (error_type_id := group.match(diagnostic_message)) is None:
+                continue
+            if best is None or self._order[error_type_id] < self._order[best]:
+                best = error_type_id
+        if best is None:
+            self._stats.unmatched += 1
+        else:
+            self._stats.classified += 1
+        return best
+
+    def invalidate(self) -> None:
+        """Discard the compiled error types, so they are loaded again before
+        the next classification.
+        """
+        self._fingerprint = None
+        self._stats.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the classifier counters along with the number of compiled
+        error types and task name groups.
+        """
+        return asdict(self._stats) | {"error_types": len(self._order), "groups": len(self._groups)}
+
+
+ERROR_CLASSIFIER = ErrorClassifier()
+"""A process-wide classifier of pipetask errors."""
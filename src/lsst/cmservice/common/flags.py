@@ -24,6 +24,8 @@ class Features(IntFlag):
     ALLOW_TASK_UPSERT = auto()
     MOCK_BUTLER = auto()
     MOCK_BPS = auto()
+    DAEMON_EVENTS = auto()
+    COMPACTION = auto()
 
 
 class EnabledFeatures(BaseSettings):
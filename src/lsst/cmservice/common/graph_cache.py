@@ -0,0 +1,133 @@
+"""Module implementing a process-wide cache of campaign graphs.
+
+Campaign graphs are built from the Edges and Nodes of a campaign namespace
+by the daemon, the RPC API, the graph API and some node machines. The
+``GRAPH_CACHE`` keeps recently built graphs in memory so that these callers
+do not rebuild the same graph over and over again.
+
+Notes
+-----
+The graph cache follows a "global" pattern where it is assigned to a
+module-level variable at import-time, like the butler factory.
+
+Each cached graph is stored alongside a version of the Node and Edge rows in
+its namespace (see `lsst.cmservice.common.row_version`), which is checked on
+each cache lookup. Operations that change a campaign graph also explicitly
+invalidate the cached entry for that campaign.
+"""
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Literal
+from uuid import UUID
+
+import networkx as nx
+from sqlalchemy import select, true
+from sqlmodel import col
+
+from lsst.cmservice.models.db.campaigns import Edge, Node
+from lsst.cmservice.models.lib.graph import graph_from_namespace
+from lsst.cmservice.models.types import AnyAsyncSession
+
+from ..config import config
+from .logging import LOGGER
+from .row_version import row_version
+
+logger = LOGGER.bind(module=__name__)
+
+type GraphVersion = tuple[int, ...]
+"""A fingerprint of the Node and Edge rows in a campaign namespace."""
+
+
+@dataclass
+class GraphCacheStats:
+    """Counters describing the use of a graph cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+async def graph_version(campaign_id: UUID, session: AnyAsyncSession) -> GraphVersion:
+    """Returns a fingerprint of the Node and Edge rows in a campaign namespace,
+    made of the version of the rows in each table.
+    """
+    node_version = row_version(Node, col(Node.namespace) == campaign_id).subquery("node_version")
+    edge_version = row_version(Edge, col(Edge.namespace) == campaign_id).subquery("edge_version")
+    version = (
+        await session.execute(
+            select(node_version, edge_version).select_from(node_version.join(edge_version, true()))
+        )
+    ).one()
+    return tuple(int(v) for v in version)
+
+
+class CampaignGraphCache:
+    """A bounded, least-recently-used cache of campaign graphs keyed by the
+    campaign id and the node view of the graph.
+
+    Notes
+    -----
+    Each lookup returns a copy of the cached graph, so the graph itself may be
+    modified by the caller, but the ``Node`` objects decorating a "model" view
+    are shared by every copy and must be treated as read-only. These objects
+    are expunged from their session and may be ``merge``d into a session to
+    be manipulated.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._stats = GraphCacheStats()
+        self._graphs: OrderedDict[tuple[UUID, str], tuple[GraphVersion, nx.DiGraph]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+    async def get(
+        self,
+        campaign_id: UUID,
+        session: AnyAsyncSession,
+        node_view: Literal["simple", "model"] = "model",
+    ) -> nx.DiGraph:
+        """Return the graph of a campaign from the cache when its version is
+        current, otherwise build, cache and return a new graph.
+        """
+        key = (campaign_id, node_view)
+        version = await graph_version(campaign_id, session)
+        cached = self._graphs.get(key)
+        if cached is not None and cached[0] == version:
+            self._stats.hits += 1
+            self._graphs.move_to_end(key)
+            return cached[1].copy()
+
+        self._stats.misses += 1
+        g = await graph_from_namespace(campaign_id, session, node_view=node_view)
+        if self.maxsize > 0:
+            self._graphs[key] = (version, g)
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.maxsize:
+                evicted, _ = self._graphs.popitem(last=False)
+                self._stats.evictions += 1
+                logger.debug("Evicted campaign graph from cache", id=str(evicted[0]), view=evicted[1])
+        return g.copy()
+
+    def invalidate(self, campaign_id: UUID) -> None:
+        """Discard any cached graph for a campaign."""
+        for key in [key for key in self._graphs if key[0] == campaign_id]:
+            del self._graphs[key]
+            self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Discard every cached graph."""
+        self._graphs.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache counters along with the current and maximum size of
+        the cache.
+        """
+        return asdict(self._stats) | {"size": len(self._graphs), "maxsize": self.maxsize}
+
+
+GRAPH_CACHE = CampaignGraphCache(maxsize=config.daemon.graph_cache_size)
+"""A process-wide cache of campaign graphs."""
@@ -1,22 +1,48 @@
-"""Utility functions for working with htcondor jobs"""
+"""Utility functions for working with htcondor jobs
+
+Notes
+-----
+The ``HTCONDOR_POLLER`` follows a "global" pattern where it is assigned to a
+module-level variable at import-time. Once per daemon iteration, the poller
+queries each schedd for the jobs launched to it by running nodes with a single
+constraint, and a node checking its job uses the polled status instead of
+reading its job event log. When no polled status is available, the job event
+log is read from the position where the node's previous check stopped (see
+`lsst.cmservice.common.logtail`).
+
+The ``HTCONDOR_MANAGER`` is likewise shared by every node machine and by the
+poller, so that the schedd ads it locates through the collector are reused
+between launches and polls, and the jobs launched by the nodes of one daemon
+iteration are submitted together.
+"""
 
 import importlib.util
 import json
 import random
 import sys
-from collections.abc import Mapping
+from asyncio import CancelledError, Future, Task, create_task, get_running_loop, sleep
+from collections.abc import Iterable, Mapping, Set
+from dataclasses import asdict, dataclass
+from functools import partial
+from time import monotonic, perf_counter
 from types import ModuleType
 from typing import TYPE_CHECKING, Any
 
-from anyio import Path, open_process
+from anyio import Path, open_process, to_thread
 from anyio.streams.text import TextReceiveStream
+from sqlalchemy import BigInteger, func, select
+from sqlalchemy import cast as sql_cast
+from sqlmodel import col
 
+from lsst.cmservice.models.db.campaigns import Node
 from lsst.cmservice.models.enums import StatusEnum
+from lsst.cmservice.models.types import AnyAsyncSession
 
 from ..config import config
 from .errors import CMHTCondorCheckError, CMHTCondorSubmitError
 from .launchers import LauncherCheckResponse, LaunchManager
 from .logging import LOGGER
+from .logtail import LogPosition
 from .panda import get_panda_token
 
 logger = LOGGER.bind(module=__name__)
@@ -40,6 +66,11 @@ A terminal status is mapped to reviewable here because the job's exit code
 will ultimately determine whether the job is accepted or failed.
 """
 
+LAUNCHER_JOB_ATTRIBUTE = "CMServiceId"
+"""The job ClassAd attribute set to the service id in every job launched by
+the HTCondor launch manager.
+"""
+
 
 async def write_htcondor_script(
     htcondor_script_path: Path,
@@ -311,21 +342,68 @@ def import_htcondor() -> ModuleType | None:
     return htcondor
 
 
+@dataclass(frozen=True)
+class SubmittedJob:
+    """An HTCondor job submitted by a launch manager."""
+
+    cluster_id: int
+    schedd: str | None
+
+
+@dataclass
+class PendingSubmit:
+    """A job submission waiting for its batch to be submitted."""
+
+    description: dict[str, str]
+    result: Future[SubmittedJob | None]
+
+
+@dataclass
+class HTCondorManagerStats:
+    """Counters describing the work of an HTCondor launch manager."""
+
+    collector_queries: int = 0
+    batches: int = 0
+    submits: int = 0
+    failures: int = 0
+    largest_batch: int = 0
+
+
 class HTCondorManager(LaunchManager):
     """A Launch Manager for HTCondor Jobs. Allows the execution of node scripts
     during state transitions.
+
+    A single manager is shared by every node machine in the process (see
+    ``HTCONDOR_MANAGER``). The schedd ads located through the collector are
+    cached for ``config.htcondor.launcher_schedd_cache_ttl`` seconds, and the
+    jobs launched within ``config.htcondor.launcher_submit_batch_window``
+    seconds of each other are submitted to one schedd in a single transaction.
+    Blocking calls to the collector and schedds are made in worker threads.
     """
 
     collector: Any | None
-    schedd: Any | None
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        self._htcondor: ModuleType | None = import_htcondor()
-        if self._htcondor is not None:
-            self.collector = self._htcondor.Collector(config.htcondor.collector_host)
-        else:
-            self.collector = None
-        self.schedd = None
+        self._htcondor: ModuleType | None = None
+        self.collector = None
+        self._loaded = False
+        self._schedd_ads: list[Any] = []
+        self._schedd_ads_at: float | None = None
+        self._schedds: dict[str | None, Any] = {}
+        self._pending: list[PendingSubmit] = []
+        self._flush_task: Task | None = None
+        self._stats = HTCondorManagerStats()
+
+    def load(self) -> ModuleType | None:
+        """Import the htcondor module and create a collector the first time
+        the manager needs one, returning the module if it is available.
+        """
+        if not self._loaded:
+            self._htcondor = import_htcondor()
+            if self._htcondor is not None:
+                self.collector = self._htcondor.Collector(config.htcondor.collector_host)
+            self._loaded = True
+        return self._htcondor
 
     async def submit_description_from_file(self, submission_spec: str | Path) -> dict[str, str]:
         """Given an htcondor submit description file, parse it into a dict
@@ -353,7 +431,7 @@ class HTCondorManager(LaunchManager):
 
         if any(
             [
-                self._htcondor is None,
+                self.load() is None,
                 config.htcondor.launcher_authn_identity is None,
                 config.htcondor.launcher_authn_method != "IDTOKENS",
             ]
@@ -376,22 +454,51 @@ class HTCondorManager(LaunchManager):
         #      or token_request.result(timeout=...)
         # TODO write new token to file
 
-    def select_schedd(self) -> None:
-        """Determine a schedd host to use with this instance of an HTCondor
-        Manager.
-        """
-        if self._htcondor is None or self.collector is None:
-            return None
+    async def schedds(self) -> list[tuple[str | None, Any]]:
+        """Returns the name and a ``htcondor.Schedd`` of every schedd known to
+        the collector, or an empty list if the htcondor module is not
+        available.
 
-        # TODO make async with anyio run_thread?
-        schedds = self.collector.locateAll(self._htcondor.DaemonTypes.Schedd)
+        The schedd ads located through the collector are cached for
+        ``config.htcondor.launcher_schedd_cache_ttl`` seconds, and a
+        ``htcondor.Schedd`` is kept for each of them.
+        """
+        if self.load() is None or self.collector is None:
+            return []
+        if TYPE_CHECKING:
+            assert self._htcondor is not None
 
+        if (
+            self._schedd_ads_at is None
+            or monotonic() - self._schedd_ads_at > config.htcondor.launcher_schedd_cache_ttl
+        ):
+            self._schedd_ads = await to_thread.run_sync(
+                self.collector.locateAll, self._htcondor.DaemonTypes.Schedd
+            )
+            self._schedd_ads_at = monotonic()
+            self._schedds.clear()
+            self._stats.collector_queries += 1
+
+        if not self._schedd_ads:
+            self._schedd_ads_at = None
+
+        for schedd_ad in self._schedd_ads:
+            if (schedd_name := schedd_ad.get("Name")) not in self._schedds:
+                self._schedds[schedd_name] = self._htcondor.Schedd(schedd_ad)
+        return list(self._schedds.items())
+
+    async def select_schedd(self) -> tuple[str | None, Any] | None:
+        """Choose a schedd to which a batch of jobs is submitted, returning its
+        name and a ``htcondor.Schedd`` for it, or `None` if no schedd is known.
+        """
+        if not (schedds := await self.schedds()):
+            return None
         # the schedd to which we submit a job is randomly chosen from the list
-        self.schedd = self._htcondor.Schedd(random.choice(schedds))
+        return random.choice(schedds)
 
-    async def submit_ad(self, submission_spec: Path | dict | str) -> Any | None:
-        """Submits a job ad to the currently selected schedd and returns the
-        job reference which includes the cluster id.
+    async def submit_ad(self, submission_spec: Path | dict | str) -> SubmittedJob | None:
+        """Submits a job ad to a schedd as part of the current batch of
+        submissions and returns the cluster id and schedd of the job.
 
         If anything goes wrong, returns None.
 
@@ -399,14 +506,11 @@ class HTCondorManager(LaunchManager):
         ------
         FileNotFoundError
             If the executable indicated by the submission file does not exist.
-        """
-        if self._htcondor is None or self.collector is None:
-            return None
 
-        # Ensure we have obtained a Schedd ad from the collector
-        self.select_schedd()
-
-        if self.schedd is None:
+        Exception
+            Any error raised by the schedd when the job is submitted.
+        """
+        if self.load() is None or self.collector is None:
             return None
 
         # Parse the submit description file as a dictionary for "easier"
@@ -426,6 +530,10 @@ class HTCondorManager(LaunchManager):
         submission_spec["environment"] = f'"{submission_environment}"'
         submission_spec["getenv"] = "False"
 
+        # Tag the job as launched by this service, so the poller only finds
+        # the service's own jobs in a schedd's queue and history.
+        submission_spec[f"MY.{LAUNCHER_JOB_ATTRIBUTE}"] = f'"{config.service_id}"'
+
         # TODO some nodes may be too "heavy" for local universe execution.
         #      if not otherwise specified, use the local universe.
         if "universe" not in submission_spec:
@@ -439,15 +547,148 @@ class HTCondorManager(LaunchManager):
             msg = f"Launch Manager cannot locate {str(executable)}"
             raise FileNotFoundError(msg)
 
-        submit_ad = self._htcondor.Submit(submission_spec)
-        cluster_id = self.schedd.submit(submit_ad)
-        # TODO should log the schedd name and cluster id for reference. It's
-        # probably not a bad idea to persist these metadata in the launch
-        # just to have it available; it should agree with the same metdata
-        # gathered in the check method when the event log is parsed.
-        return cluster_id
+        # The first submission of a batch schedules the batch to be flushed
+        # after the batch window, by which time the other nodes launching in
+        # the same daemon iteration have joined it.
+        # A full batch is flushed in its own task, so that cancelling this
+        # launch cannot interrupt the submission of the other jobs in it.
+        pending = PendingSubmit(description=submission_spec, result=get_running_loop().create_future())
+        self._pending.append(pending)
+        if len(self._pending) >= config.htcondor.launcher_submit_batch_size:
+            self._flush_task = create_task(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = create_task(self._flush_after(config.htcondor.launcher_submit_batch_window))
+        try:
+            return await pending.result
+        except CancelledError:
+            # A cancelled launch still waiting on its batch is withdrawn from
+            # it, so its job is not submitted without a node to follow it.
+            if pending in self._pending:
+                self._pending.remove(pending)
+            raise
+
+    async def _flush_after(self, delay: float) -> None:
+        """Flush the pending submissions after a delay."""
+        await sleep(delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Submit every pending submission to one schedd, resolving the result
+        of each submission with its job or the error raised submitting it.
+
+        A submission whose launch has been cancelled is not submitted, and the
+        result of every submission in the batch is resolved even if the batch
+        cannot be submitted at all.
+        """
+        batch, self._pending = self._pending, []
+        try:
+            await self._submit_pending(batch)
+        finally:
+            msg = "HTCondor job batch was not submitted"
+            for pending in batch:
+                if not pending.result.done():
+                    pending.result.set_exception(CMHTCondorSubmitError(msg))
+
+    async def _submit_pending(self, batch: list[PendingSubmit]) -> None:
+        """Submit a batch of pending submissions to one schedd, resolving the
+        result of each submission that is still awaited.
+        """
+        batch = [pending for pending in batch if not pending.result.done()]
+        if not batch:
+            return
+
+        schedd_name: str | None = None
+        outcomes: list[int | Exception | None]
+        try:
+            if (selected := await self.select_schedd()) is None:
+                outcomes = [None] * len(batch)
+            else:
+                schedd_name, schedd = selected
+                # launches cancelled while the schedd was selected are dropped
+                batch = [pending for pending in batch if not pending.result.done()]
+                submit_f = partial(self._submit_batch, schedd, [p.description for p in batch])
+                outcomes = await to_thread.run_sync(submit_f)
+        except Exception as e:
+            outcomes = [e] * len(batch)
+
+        self._stats.batches += 1
+        self._stats.submits += len(batch)
+        self._stats.largest_batch = max(self._stats.largest_batch, len(batch))
+        if any(isinstance(outcome, Exception) for outcome in outcomes):
+            # The schedd ads are located again in case a schedd has gone away
+            self._schedd_ads_at = None
+            self._stats.failures += sum(isinstance(outcome, Exception) for outcome in outcomes)
+
+        logger.debug("Submitted HTCondor job batch", schedd=schedd_name, jobs=len(batch))
+        for pending, outcome in zip(batch, outcomes):
+            if pending.result.cancelled() and isinstance(outcome, int):
+                logger.warning(
+                    "HTCondor job submitted for a cancelled launch", schedd=schedd_name, cluster_id=outcome
+                )
+            if pending.result.done():
+                continue
+            if isinstance(outcome, Exception):
+                pending.result.set_exception(outcome)
+            elif outcome is None:
+                pending.result.set_result(None)
+            else:
+                pending.result.set_result(SubmittedJob(cluster_id=outcome, schedd=schedd_name))
+
+    def _submit_batch(self, schedd: Any, descriptions: list[dict[str, str]]) -> list[int | Exception | None]:
+        """Submit a batch of jobs to a schedd in a single transaction, or one
+        job at a time if the transaction fails, returning the cluster id of
+        each job or the error raised submitting it.
+
+        This method blocks on the schedd and should be called from a worker
+        thread.
+        """
+        if TYPE_CHECKING:
+            assert self._htcondor is not None
+
+        submits = [self._htcondor.Submit(description) for description in descriptions]
+        # Schedd transactions are only available with version 1 of the
+        # htcondor python bindings.
+        if len(submits) > 1 and hasattr(schedd, "transaction"):
+            try:
+                with schedd.transaction() as txn:
+                    return [submit.queue(txn) for submit in submits]
+            except Exception:
+                logger.exception("HTCondor batch submit failed, submitting jobs one at a time")
 
-    async def check(self, cluster_id: int, condor_log: Path) -> LauncherCheckResponse:
+        outcomes: list[int | Exception | None] = []
+        for submit in submits:
+            try:
+                outcomes.append(schedd.submit(submit).cluster())
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    def _read_job_events(self, condor_log: str, state: list[int] | None) -> tuple[list[Any], list[int]]:
+        """Read the events written to a job event log since a saved state of a
+        ``htcondor.JobEventLog``, returning the events and the state following
+        them.
+
+        The state is the one with which the bindings pickle a JobEventLog,
+        which resumes reading where it stopped as long as the log has only been
+        appended to since. It is kept as a list of integers rather than a
+        pickle, so it can be stored in node metadata.
+
+        This method blocks on the log and should be called from a worker
+        thread.
+        """
+        if TYPE_CHECKING:
+            assert self._htcondor is not None
+
+        job_event_log = self._htcondor.JobEventLog(condor_log)
+        if state is not None:
+            job_event_log.__setstate__(({}, *state))
+        events = list(job_event_log.events(stop_after=0))
+        _, *new_state = job_event_log.__getstate__()
+        return events, new_state
+
+    async def check(
+        self, cluster_id: int, condor_log: Path, position: LogPosition | None = None
+    ) -> LauncherCheckResponse:
         """Using the cluster_id or the htcondor log file, check job status.
 
         This launcher method should be invoked by a Node Machine during its
@@ -463,6 +704,14 @@ class HTCondorManager(LaunchManager):
             ify entries in the HTCondor job log. Otherwise, the job log entries
             may not disambiguate between multiple cluster_ids in the same log.
 
+        condor_log : Path
+            The path of the HTCondor job event log.
+
+        position : LogPosition | None
+            The position up to which the job event log has been read by a
+            previous check, which is advanced in place past the events read by
+            this check. If not provided, the log is read from the start.
+
         Returns
         -------
         ``lsst.cmservice.common.launcher.LauncherCheckResponse``
@@ -474,39 +723,43 @@ class HTCondorManager(LaunchManager):
         Raises
         ------
         RuntimeError
-            Raised when a error is encountered. Errors may include inability
-            to import required packages or when error conditions are encounter-
-            ed during the check. For HTCondor event log parsing, any abnormal
-            termination or job abend (held, aborted, removal) will raise an
-            exception. This exception should be eventually handled by the Node
-            state machine's error handler (therefore should be reraised if
-            caught anywhere else).
+            Raised when a error is encountered. For HTCondor event log parsing,
+            any abnormal termination or job abend (held, aborted, removal) will
+            raise an exception. This exception should be eventually handled by
+            the Node state machine's error handler (therefore should be
+            reraised if caught anywhere else).
         """
-        response = LauncherCheckResponse(success=False)
-
-        # TODO it would be nice if this method returned a richer value so the
-        # calling Node could reflect more job information in its metadata. Esp-
-        # ecially with the EXECUTE event, pass back the event time and host;
-        # and for abnormal termination the exit code could be useful.
-        if self._htcondor is None or self.collector is None:
+        if self.load() is None or self.collector is None:
             msg = "HTCondor is not available or cannot be imported"
             raise RuntimeError(msg)
+        if TYPE_CHECKING:
+            assert self._htcondor is not None
+        if position is None:
+            position = LogPosition(path=str(condor_log))
 
         # Using htcondor.JobEventLog with the userlog specified in the job
         # submit ad, we can approximate the `condor_q -userlog` command without
         # querying job history from the schedd. This limits us to what we can
         # understand about the job through a JobEvent entry, which is quite
-        # limited compared to a Job ClassAd we could get from the schedd.
+        # limited compared to a Job ClassAd we could get from the schedd. The
+        # state of the JobEventLog is kept in the detail of the log position,
+        # along with any outcome of the events read by previous checks, so the
+        # log is read from where the previous check stopped.
         # FIXME the JobEventLog raises an HTCondorIOError if the eventlog can't
         # be found. We should check its existence first, although the eventlog
         # is meant to be "touched" by the schedd as soon as the submit goes
         # through (i.e., a 0-byte file should be present).
         logger.debug(
-            "Checking HTCondor Log for Launch Events", cluster_id=cluster_id, job_event_log=str(condor_log)
+            "Checking HTCondor Log for Launch Events",
+            cluster_id=cluster_id,
+            job_event_log=str(condor_log),
+            offset=position.offset,
         )
-        job_event_log = self._htcondor.JobEventLog(str(condor_log))
+        read_f = partial(self._read_job_events, str(condor_log), position.detail.get("job_event_log"))
+        events, state = await to_thread.run_sync(read_f)
+        detail = dict(position.detail)
 
-        for event in job_event_log.events(stop_after=0):
+        for event in events:
             # make sure the event is related to our job; if the provided
             # cluster id is 0, then we do not try to disambiguate job events.
             if (cluster_id > 0 and event.cluster != cluster_id) or event.proc != 0:
@@ -521,7 +774,7 @@ class HTCondorManager(LaunchManager):
                         # Job succeeded
                         msg = "Job Normally Terminated"
                         logger.debug(msg, cluster_id=cluster_id, return_value=return_value)
-                        response.success = True
+                        detail["success"] = True
                     elif normal_termination:
                         # Job failed successfully
                         msg = "Job Abnormally Terminated"
@@ -553,10 +806,7 @@ class HTCondorManager(LaunchManager):
                     timestamp = event.get("EventTime", None)
                     msg = f"Job has been executed on {host} at {timestamp}"
                     logger.info(msg, cluster_id=cluster_id)
-                    response.job_id = event.cluster
-                    if timestamp is not None:
-                        response.timestamp = timestamp
-                    response.metadata_["execute_host"] = host
+                    detail |= {"job_id": event.cluster, "timestamp": timestamp, "execute_host": host}
                     continue
                 case _:
                     # Proceed past any non-terminal event in the log
@@ -566,18 +816,30 @@ class HTCondorManager(LaunchManager):
                         event_type=event.type,
                     )
                     continue
+
+        response = LauncherCheckResponse(success=detail.get("success", False))
+        if "job_id" in detail:
+            response.job_id = detail["job_id"]
+            if detail["timestamp"] is not None:
+                response.timestamp = detail["timestamp"]
+            response.metadata_["execute_host"] = detail["execute_host"]
+        position.offset = state[-1]
+        position.count += len(events)
+        position.detail = detail | {"job_event_log": state}
         logger.debug(
             "Finished reading HTCondor Launcher Event Log",
             cluster_id=cluster_id,
             outcome=response.model_dump_json(),
+            events=len(events),
         )
         return response
 
-    async def launch(self, submission_spec: Path | dict | str) -> int:
+    async def launch(self, submission_spec: Path | dict | str) -> SubmittedJob:
         """Main entrypoint for a LaunchManager instance.
 
-        The prepared submission file is sent to HTCondor and a SubmitResult is
-        returned, which includes the job's ``cluster_id`` (an int).
+        The prepared submission file is sent to HTCondor along with any other
+        submissions in the same batch, and the job's ``cluster_id`` (an int)
+        is returned with the name of the schedd to which it was submitted.
 
         Parameters
         ----------
@@ -593,11 +855,231 @@ class HTCondorManager(LaunchManager):
 
         Returns
         -------
-        int
-            The HTCondor job cluster ID as an integer.
+        SubmittedJob
+            The HTCondor job cluster ID and the name of its schedd.
         """
-        job_id = await self.submit_ad(submission_spec)
-        if job_id is None:
+        job = await self.submit_ad(submission_spec)
+        if job is None:
             msg = "No submit result returned from htcondor"
             raise RuntimeError(msg)
-        return job_id.cluster()
+        return job
+
+    def stats(self) -> dict[str, Any]:
+        """Return the manager counters along with the age of the cached schedd
+        ads.
+        """
+        age = None if self._schedd_ads_at is None else monotonic() - self._schedd_ads_at
+        return asdict(self._stats) | {"schedds": len(self._schedd_ads), "schedd_ads_age": age}
+
+
+@dataclass(frozen=True)
+class PolledJob:
+    """The status of an HTCondor job as reported by a schedd query."""
+
+    cluster_id: int
+    schedd: str | None
+    job_status: int
+    exit_code: int | None = None
+    exit_by_signal: bool = False
+    exit_signal: int | None = None
+    remote_host: str | None = None
+
+    def check_response(self) -> LauncherCheckResponse:
+        """Returns a launcher check response for the job, with the same
+        outcomes as checking the job's event log.
+
+        Raises
+        ------
+        RuntimeError
+            Raised when the job was removed, is held, or terminated with a
+            non-zero exit code or on a signal.
+        """
+        response = LauncherCheckResponse(success=False, job_id=self.cluster_id)
+        match self.job_status:
+            case 4 if self.exit_by_signal:
+                msg = f"Job terminated on signal {self.exit_signal}"
+                raise RuntimeError(msg)
+            case 4 if self.exit_code == 0:
+                response.success = True
+            case 4:
+                msg = "Job Abnormally Terminated"
+                raise RuntimeError(msg)
+            case 3:
+                msg = "Job has been removed"
+                raise RuntimeError(msg)
+            case 5:
+                msg = "Job has been held"
+                raise RuntimeError(msg)
+        if self.remote_host is not None:
+            response.metadata_["execute_host"] = self.remote_host
+        return response
+
+
+@dataclass
+class HTCondorPollerStats:
+    """Counters describing the work of an HTCondor poller."""
+
+    polls: int = 0
+    jobs: int = 0
+    hits: int = 0
+    misses: int = 0
+    last_elapsed: float = 0.0
+
+
+def cluster_constraint(cluster_ids: Iterable[int]) -> str:
+    """Returns a ClassAd constraint matching the first job of each of a set of
+    job clusters launched by this service.
+    """
+    return (
+        f'{LAUNCHER_JOB_ATTRIBUTE} == "{config.service_id}" && ProcId == 0 && '
+        f"member(ClusterId, {{{', '.join(str(c) for c in sorted(cluster_ids))}}})"
+    )
+
+
+class HTCondorPoller:
+    """A poller of the status of every HTCondor job launched by a running
+    node, with one query of the queue of each schedd to which these jobs were
+    submitted and, for jobs that have left the queue, one query of its
+    history. Only jobs tagged with the service id are matched.
+    """
+
+    projection = ["ClusterId", "ProcId", "JobStatus", "ExitCode", "ExitBySignal", "ExitSignal", "RemoteHost"]
+
+    def __init__(self, manager: HTCondorManager) -> None:
+        self.manager = manager
+        self._jobs: dict[tuple[str | None, int], PolledJob] = {}
+        self._clusters: dict[int, list[PolledJob]] = {}
+        self._stats = HTCondorPollerStats()
+        self.polled_at: float | None = None
+
+    def query(
+        self, schedds: Iterable[tuple[str | None, Any]], cluster_ids: Mapping[str | None, Set[int]]
+    ) -> list[PolledJob]:
+        """Queries schedds, given by name and ``htcondor.Schedd``, for the jobs
+        of a set of job clusters, keyed by the name of the schedd to which each
+        cluster was submitted.
+
+        Each schedd's queue is queried for the clusters submitted to it and
+        for any clusters whose schedd is not known, but only the history of
+        the schedd to which a cluster was submitted is queried for it.
+
+        This method blocks on the schedd queries and should be called from a
+        worker thread.
+        """
+        jobs: list[PolledJob] = []
+        for schedd_name, schedd in schedds:
+            submitted = cluster_ids.get(schedd_name, set())
+            if not (queried := submitted | cluster_ids.get(None, set())):
+                continue
+            ads = list(schedd.query(constraint=cluster_constraint(queried), projection=self.projection))
+            if missing := submitted - {ad["ClusterId"] for ad in ads}:
+                ads.extend(
+                    schedd.history(
+                        constraint=cluster_constraint(missing), projection=self.projection, match=len(missing)
+                    )
+                )
+            jobs.extend(
+                PolledJob(
+                    cluster_id=ad["ClusterId"],
+                    schedd=schedd_name,
+                    job_status=ad["JobStatus"],
+                    exit_code=ad.get("ExitCode"),
+                    exit_by_signal=ad.get("ExitBySignal", False),
+                    exit_signal=ad.get("ExitSignal"),
+                    remote_host=ad.get("RemoteHost"),
+                )
+                for ad in ads
+            )
+        return jobs
+
+    async def poll(self, cluster_ids: Mapping[str | None, Set[int]]) -> None:
+        """Replaces the polled jobs with the status of the jobs of a set of
+        job clusters, keyed by the name of the schedd to which each cluster
+        was submitted. If the schedds cannot be queried, no jobs are known to
+        the poller until the next successful poll.
+
+        The schedds are those known to the poller's launch manager, whose
+        cached schedd ads are shared with the manager's launches.
+        """
+        start = perf_counter()
+        self._jobs.clear()
+        self._clusters.clear()
+        self.polled_at = None
+        if cluster_ids:
+            try:
+                if self.manager.load() is None:
+                    msg = "HTCondor is not available or cannot be imported"
+                    raise RuntimeError(msg)
+                schedds = await self.manager.schedds()
+                jobs = await to_thread.run_sync(self.query, schedds, cluster_ids)
+            except Exception:
+                logger.exception()
+                return
+            for job in jobs:
+                self._jobs[(job.schedd, job.cluster_id)] = job
+                self._clusters.setdefault(job.cluster_id, []).append(job)
+        self.polled_at = monotonic()
+        self._stats.polls += 1
+        self._stats.jobs = len(self._jobs)
+        self._stats.last_elapsed = perf_counter() - start
+        logger.debug("Polled HTCondor jobs", jobs=len(self._jobs), elapsed=self._stats.last_elapsed)
+
+    async def poll_running_nodes(self, session: AnyAsyncSession) -> None:
+        """Polls the status of the job launched by each running node on the
+        schedd to which it was submitted.
+        """
+        wms_job = sql_cast(func.jsonb_extract_path_text(col(Node.metadata_), "wms_job"), BigInteger)
+        wms_schedd = func.jsonb_extract_path_text(col(Node.metadata_), "wms_schedd")
+        statement = (
+            select(wms_schedd, wms_job)
+            .where(col(Node.status) == StatusEnum.running)
+            .where(func.jsonb_typeof(func.jsonb_extract_path(col(Node.metadata_), "wms_job")) == "number")
+        )
+        cluster_ids: dict[str | None, set[int]] = {}
+        for schedd, cluster_id in (await session.execute(statement)).all():
+            if cluster_id > 0:
+                cluster_ids.setdefault(schedd, set()).add(cluster_id)
+        await self.poll(cluster_ids)
+
+    def check(self, cluster_id: int, schedd: str | None = None) -> LauncherCheckResponse | None:
+        """Returns a launcher check response for a polled job, or `None` if the
+        job was not found by a recent poll, in which case the job should be
+        checked some other way.
+
+        Without the name of the schedd to which the job was submitted, a job
+        is only found if a single schedd knows of its cluster id.
+
+        Raises
+        ------
+        RuntimeError
+            Raised when the job was removed, is held, or failed.
+        """
+        if self.polled_at is None or monotonic() - self.polled_at > config.htcondor.launcher_poll_max_age:
+            return None
+        if schedd is not None:
+            job = self._jobs.get((schedd, cluster_id))
+        elif len(candidates := self._clusters.get(cluster_id, [])) == 1:
+            job = candidates[0]
+        else:
+            job = None
+        if job is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        return job.check_response()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the poller counters along with the age of the last poll."""
+        age = None if self.polled_at is None else monotonic() - self.polled_at
+        return asdict(self._stats) | {"age": age}
+
+
+HTCONDOR_MANAGER = HTCondorManager()
+"""A process-wide launch manager shared by every node launching or checking an
+HTCondor job.
+"""
+
+HTCONDOR_POLLER = HTCondorPoller(HTCONDOR_MANAGER)
+"""A process-wide poller of the HTCondor jobs launched by running nodes, which
+locates schedds through the process-wide launch manager.
+"""
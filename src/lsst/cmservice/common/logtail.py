@@ -0,0 +1,109 @@
+"""Module implementing the incremental reading of log files.
+
+A running node checks the same log files over and over again: the HTCondor
+job event log of its launched job and, for a group, the stdout of its BPS
+submission. Rather than reading each file from the start at every check, the
+byte offset up to which a log has been read is kept as a `LogPosition` in the
+node's metadata, and each check only reads what has been appended since.
+
+Only complete lines are consumed, so a log that is being written while it is
+read is read again from the start of its incomplete line at the next check. A
+log that is shorter than its stored offset, or that is not the log whose
+position was stored, is read from the start. An HTCondor job event log is
+read through the htcondor bindings instead, which keep their own position in
+the `LogPosition` detail (see `lsst.cmservice.common.htcondor`).
+"""
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from anyio import Path, open_file
+
+
+@dataclass
+class LogPosition:
+    """The position up to which a log has been read.
+
+    Parameters
+    ----------
+    path : str
+        The path of the log.
+
+    offset : int
+        The byte offset of the first unread line or event of the log.
+
+    count : int
+        The number of lines or events read so far.
+
+    detail : dict
+        Any state accumulated by the reader of the log.
+    """
+
+    path: str
+    offset: int = 0
+    count: int = 0
+    detail: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_metadata(cls, path: str | Path, metadata: Mapping[str, Any] | None) -> "LogPosition":
+        """Returns the position stored in a metadata mapping, or the start of
+        the log if no position, or the position of another log, is stored.
+        """
+        if metadata is None or metadata.get("path") != str(path):
+            return cls(path=str(path))
+        return cls(**metadata)
+
+    def to_metadata(self) -> dict[str, Any]:
+        """Returns the position as a mapping to store in metadata."""
+        return asdict(self)
+
+
+async def read_new(path: str | Path, position: LogPosition, terminator: bytes) -> tuple[str, LogPosition]:
+    """Reads the text appended to a log since a position, up to and including
+    the last ``terminator``, returning the text and the position following it.
+    """
+    log_path = Path(path)
+    if not await log_path.exists():
+        return "", position
+    if (await log_path.stat()).st_size < position.offset:
+        # The log has been truncated or rewritten, so it is read again
+        position = LogPosition(path=position.path)
+    async with await open_file(log_path, "rb") as f:
+        await f.seek(position.offset)
+        data = await f.read()
+    end = data.rfind(terminator) + len(terminator) if terminator in data else 0
+    new_position = LogPosition(
+        path=position.path, offset=position.offset + end, count=position.count, detail=dict(position.detail)
+    )
+    return data[:end].decode(errors="replace"), new_position
+
+
+async def tail_lines(path: str | Path, position: LogPosition) -> tuple[list[str], LogPosition]:
+    """Returns the complete lines appended to a log since a position and the
+    position following them.
+    """
+    text, position = await read_new(path, position, b"\n")
+    lines = text.splitlines()
+    position.count += len(lines)
+    return lines, position
+
+
+async def last_line(path: str | Path, block_size: int = 4096) -> str | None:
+    """Returns the last line of a file, read backwards from the end of the
+    file one block at a time, or `None` if the file is empty.
+    """
+    async with await open_file(path, "rb") as f:
+        end = await f.seek(0, 2)
+        data = b""
+        position = end
+        while position > 0:
+            position = max(0, position - block_size)
+            await f.seek(position)
+            data = await f.read(end - position)
+            # a final newline ends the last line rather than starting another
+            if b"\n" in data.removesuffix(b"\n"):
+                break
+    if not data:
+        return None
+    return data.removesuffix(b"\n").rsplit(b"\n", 1)[-1].decode(errors="replace")
@@ -0,0 +1,156 @@
+"""Module implementing a process-wide cache of manifest specs.
+
+Every node preparation assembles a configuration chain from the latest
+manifest of each kind in the node's campaign namespace and from the library
+manifest of each kind. The ``MANIFEST_CACHE`` keeps the specs of these
+manifests in memory so that preparing many nodes in the same campaign, such as
+the groups of a step, does not fetch the same specs over and over again.
+
+Notes
+-----
+The manifest cache follows a "global" pattern where it is assigned to a
+module-level variable at import-time, like the graph cache.
+
+Manifests are versioned and a new version is a new row, so a spec is cached
+by the namespace, kind and version of its manifest. A single query finds the
+latest manifest of each kind for a namespace along with its id and ``xmin``
+(see `lsst.cmservice.common.row_version`), and a cached spec is only used when
+both match, even when a library manifest is deleted and created again with the
+same version. The manifest routes also explicitly invalidate the cached specs
+of a namespace.
+"""
+
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import asdict, dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import literal, select, union_all
+from sqlmodel import col
+
+from lsst.cmservice.models.db.campaigns import Manifest
+from lsst.cmservice.models.enums import DEFAULT_NAMESPACE
+from lsst.cmservice.models.types import AnyAsyncSession
+
+from ..config import config
+from .logging import LOGGER
+from .row_version import xmin_column
+
+logger = LOGGER.bind(module=__name__)
+
+type ManifestKey = tuple[UUID, str, int]
+"""The namespace, kind name and version of a manifest."""
+
+
+@dataclass
+class ManifestCacheStats:
+    """Counters describing the use of a manifest cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class ManifestCache:
+    """A bounded, least-recently-used cache of manifest specs keyed by the
+    namespace, kind and version of the manifest.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._stats = ManifestCacheStats()
+        self._specs: OrderedDict[ManifestKey, tuple[UUID, int, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    async def get_latest_specs(
+        self, namespace: UUID, session: AnyAsyncSession
+    ) -> tuple[dict[str, dict], dict[str, dict]]:
+        """Returns the specs of the latest manifest of each kind in a namespace
+        and of the library manifest of each kind, as two mappings of kind name
+        to a copy of the spec.
+
+        The latest manifests are found with a single query, and the specs of
+        any manifests that are not in the cache are fetched with another.
+        """
+        xmin = xmin_column().label("xmin")
+        columns = (col(Manifest.id), col(Manifest.namespace), col(Manifest.kind), col(Manifest.version), xmin)
+        campaign_manifests = (
+            select(*columns, literal("campaign").label("scope"))
+            .where(col(Manifest.namespace) == namespace)
+            .distinct(col(Manifest.kind))
+            .order_by(col(Manifest.kind), col(Manifest.version).desc())
+        )
+        library_manifests = (
+            select(*columns, literal("library").label("scope"))
+            .where(col(Manifest.namespace) == DEFAULT_NAMESPACE)
+            .where(col(Manifest.version) == 0)
+            .distinct(col(Manifest.kind))
+            .order_by(col(Manifest.kind))
+        )
+        rows = (await session.execute(union_all(campaign_manifests, library_manifests))).all()
+
+        specs: dict[ManifestKey, dict] = {}
+        missing: dict[UUID, ManifestKey] = {}
+        for row in rows:
+            key = (row.namespace, row.kind.name, row.version)
+            cached = self._specs.get(key)
+            if cached is not None and cached[:2] == (row.id, row.xmin):
+                self._stats.hits += 1
+                self._specs.move_to_end(key)
+                specs[key] = cached[2]
+            else:
+                self._stats.misses += 1
+                missing[row.id] = key
+
+        if missing:
+            s = select(col(Manifest.id), col(Manifest.spec)).where(col(Manifest.id).in_(missing))
+            xmins = {row.id: row.xmin for row in rows}
+            for manifest_id, spec in (await session.execute(s)).all():
+                key = missing[manifest_id]
+                specs[key] = spec
+                self._put(key, (manifest_id, xmins[manifest_id], spec))
+
+        campaign_specs: dict[str, dict] = {}
+        library_specs: dict[str, dict] = {}
+        for row in rows:
+            key = (row.namespace, row.kind.name, row.version)
+            target = campaign_specs if row.scope == "campaign" else library_specs
+            target[row.kind.name] = deepcopy(specs.get(key, {}))
+        return campaign_specs, library_specs
+
+    def _put(self, key: ManifestKey, value: tuple[UUID, int, dict]) -> None:
+        """Adds a spec to the cache, evicting the least recently used specs if
+        the cache is full.
+        """
+        if self.maxsize <= 0:
+            return
+        self._specs[key] = value
+        self._specs.move_to_end(key)
+        while len(self._specs) > self.maxsize:
+            evicted, _ = self._specs.popitem(last=False)
+            self._stats.evictions += 1
+            logger.debug("Evicted manifest spec from cache", namespace=str(evicted[0]), kind=evicted[1])
+
+    def invalidate(self, namespace: UUID) -> None:
+        """Discard any cached spec for a namespace."""
+        for key in [key for key in self._specs if key[0] == namespace]:
+            del self._specs[key]
+            self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Discard every cached spec."""
+        self._specs.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache counters along with the current and maximum size of
+        the cache.
+        """
+        return asdict(self._stats) | {"size": len(self._specs), "maxsize": self.maxsize}
+
+
+MANIFEST_CACHE = ManifestCache(maxsize=config.daemon.manifest_cache_size)
+"""A process-wide cache of manifest specs."""
@@ -0,0 +1,159 @@
+"""Module implementing the parsing of pipetask reports away from the event
+loop.
+
+A pipetask (manifest) report of a large workflow is a YAML document that can
+run to hundreds of megabytes, mostly listing the failed quanta of each task.
+Loading such a document and walking its tasks, outputs and failed quanta is
+CPU-bound work that would freeze the API or daemon if it were done on the
+event loop, and would hold the GIL if it were done in a worker thread.
+
+The report is instead parsed in a worker process, using the C-accelerated
+YAML loader when PyYAML was built with libyaml, and only a compact summary of
+each task is returned to the event loop. The number of worker processes used
+at once is bounded by ``config.bps.report_parse_processes``; when this is 0
+the report is parsed in a worker thread instead.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path as SyncPath
+from typing import Any
+
+import yaml
+from anyio import CapacityLimiter, Path, to_process, to_thread
+
+from ..config import config
+from .errors import CMYamlParseError
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class ProductSummary:
+    """The counts of a dataset type produced by a task in a pipetask report."""
+
+    name: str
+    n_expected: int = 0
+    n_done: int = 0
+    n_failed: int = 0
+    n_failed_upstream: int = 0
+    n_missing: int = 0
+
+
+@dataclass(frozen=True)
+class FailedQuantumSummary:
+    """A quantum that failed in a pipetask report, with the last line of its
+    error as the diagnostic message.
+    """
+
+    quanta: str
+    data_id: dict[str, Any]
+    diagnostic_message: str
+
+
+@dataclass(frozen=True)
+class TaskSummary:
+    """The counts, products and failed quanta of a task in a report."""
+
+    name: str
+    n_expected: int = 0
+    n_done: int = 0
+    n_failed: int = 0
+    n_failed_upstream: int = 0
+    products: list[ProductSummary] = field(default_factory=list)
+    failed_quanta: list[FailedQuantumSummary] = field(default_factory=list)
+
+
+def summarize_manifest_data(manifest_data: Mapping[str, Any]) -> list[TaskSummary]:
+    """Summarize the tasks of a loaded pipetask report."""
+    summaries: list[TaskSummary] = []
+    for task_name, task_data in manifest_data.items():
+        failed_quanta = task_data.get("failed_quanta", {})
+        products = [
+            ProductSummary(
+                name=data_type,
+                n_expected=counts.get("expected", 0),
+                n_done=counts.get("produced", 0),
+                n_failed=counts.get("failed", 0),
+                n_failed_upstream=counts.get("blocked", 0),
+                n_missing=counts.get("not_produced", 0),
+            )
+            for data_type, counts in task_data.get("outputs", {}).items()
+        ]
+        failures = [
+            FailedQuantumSummary(
+                quanta=quanta,
+                data_id=quanta_data["data_id"],
+                diagnostic_message=(
+                    quanta_data["error"][-1] if quanta_data["error"] else "Super-unhelpful empty message"
+                ),
+            )
+            for quanta, quanta_data in failed_quanta.items()
+        ]
+        summaries.append(
+            TaskSummary(
+                name=task_name,
+                n_expected=task_data.get("n_expected", 0),
+                n_done=task_data.get("n_succeeded", 0),
+                n_failed=len(failed_quanta),
+                n_failed_upstream=task_data.get("n_quanta_blocked", 0),
+                products=products,
+                failed_quanta=failures,
+            )
+        )
+    return summaries
+
+
+def parse_manifest_report(yaml_file: str) -> list[TaskSummary]:
+    """Load and summarize a pipetask report yaml file.
+
+    This function blocks and should be called from a worker process or
+    thread.
+
+    Raises
+    ------
+    CMYamlParseError
+        Raised when the file cannot be read or parsed.
+    """
+    try:
+        with SyncPath(yaml_file).open("rb") as f:
+            manifest_data = yaml.load(f, Loader=SafeLoader)
+        return summarize_manifest_data(manifest_data)
+    except yaml.YAMLError as yaml_error:
+        # The error is raised with a message only so it can be sent back from
+        # a worker process
+        msg = f"Error parsing manifest report yaml at path {yaml_file}; threw {yaml_error}"
+        raise CMYamlParseError(msg) from None
+    except Exception as e:
+        msg = f"{e}"
+        raise CMYamlParseError(msg) from None
+
+
+_limiter: CapacityLimiter | None = None
+
+
+def report_process_limiter() -> CapacityLimiter:
+    """Returns the capacity limiter bounding the worker processes parsing
+    reports, which is created in the event loop of its first use.
+    """
+    global _limiter
+    if _limiter is None:
+        _limiter = CapacityLimiter(max(config.bps.report_parse_processes, 1))
+    return _limiter
+
+
+async def load_manifest_summary(yaml_file: str | Path) -> list[TaskSummary]:
+    """Parse a pipetask report yaml file in a worker process and return the
+    summary of each of its tasks.
+
+    Raises
+    ------
+    CMYamlParseError
+        Raised when the file cannot be read or parsed.
+    """
+    if config.bps.report_parse_processes <= 0:
+        return await to_thread.run_sync(parse_manifest_report, str(yaml_file))
+    return await to_process.run_sync(parse_manifest_report, str(yaml_file), limiter=report_process_limiter())
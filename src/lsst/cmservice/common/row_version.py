@@ -0,0 +1,39 @@
+"""Module implementing versions of database rows for process-wide caches.
+
+The process-wide caches of campaign graphs, manifest specs and pipetask error
+types keep objects built from database rows, and must notice when another
+daemon or API replica has changed those rows.
+
+Notes
+-----
+Every row in Postgres has a system column ``xmin``, the id of the transaction
+that created the current version of the row. Any committed insert or update of
+a row changes its ``xmin``, and any committed insert or delete changes the
+count of rows, so the count of a set of rows and the sum of their ``xmin``
+make a version of the set that changes with any committed write to it. Reading
+this version is a single aggregate query, which keeps multiple replicas
+coherent without any schema changes or cross-process messaging.
+"""
+
+from typing import Any
+
+from sqlalchemy import BigInteger, ColumnElement, Select, cast, func, literal_column, select
+
+
+def xmin_column() -> ColumnElement[int]:
+    """Returns the Postgres system column ``xmin`` of the rows of a query as
+    a bigint.
+    """
+    # The xid type has no arithmetic, but it is an unsigned 32-bit integer
+    return literal_column("xmin::text::bigint", type_=BigInteger)
+
+
+def row_version(entity: Any, *criteria: Any) -> Select[tuple[int, int]]:
+    """Returns a query of the version of the rows of a table, optionally
+    limited by some criteria, as the count of the rows and the sum of their
+    ``xmin``.
+    """
+    # The sum of bigints is a numeric, but it fits a bigint for any table
+    # with fewer than 2**31 rows
+    xmin = cast(func.coalesce(func.sum(xmin_column()), 0), BigInteger)
+    return select(func.count().label("count"), xmin.label("xmin")).select_from(entity).where(*criteria)
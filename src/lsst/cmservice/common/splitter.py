@@ -4,13 +4,17 @@ modules.
 
 from .enums import SplitterEnum as SplitterEnum
 from .splitters.abc import Splitter as Splitter
+from .splitters.dimension import DimensionSplitter as DimensionSplitter
 from .splitters.null import NullSplitter as NullSplitter
 from .splitters.query import QuerySplitter as QuerySplitter
 from .splitters.values import ValuesSplitter as ValuesSplitter
+from .splitters.weighted import WeightedSplitter as WeightedSplitter
 
 SplitterMapping: dict[str, type[Splitter]] = {
+    "dimension": DimensionSplitter,
     "null": NullSplitter,
     "query": QuerySplitter,
     "values": ValuesSplitter,
+    "weighted": WeightedSplitter,
 }
 """A mapping of Node configuration literals to splitter classes."""
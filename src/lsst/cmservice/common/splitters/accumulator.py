@@ -0,0 +1,87 @@
+"""Module implementing the incremental accumulation of dimension values for
+group splitting.
+
+A Butler query for the data IDs of a step may return millions of rows, but a
+splitter only needs the distinct values of one dimension. Values are added to
+a ``DimensionValueAccumulator`` one page of query results at a time, so no
+more than one page of Butler objects is held in memory, and the accumulated
+values are kept as compact, sorted and de-duplicated Numpy arrays.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+
+@dataclass
+class DimensionValueAccumulator:
+    """A running, sorted set of the distinct values of a dimension.
+
+    Each page of values is reduced to its distinct values, along with the
+    number of times each value occurs, as it is added. The distinct values of
+    the pages are merged into a single sorted array when the pending values
+    exceed ``merge_size``, which bounds both the memory held by duplicate
+    values and the cost of each merge.
+
+    Parameters
+    ----------
+    dtype : `numpy.dtype` or `type`
+        The Numpy dtype of the dimension values.
+
+    merge_size : int
+        The number of pending distinct values that triggers a merge.
+    """
+
+    dtype: Any
+    merge_size: int = 1_000_000
+    rows: int = 0
+    _values: np.ndarray = field(init=False)
+    _counts: np.ndarray = field(init=False)
+    _pending: list[tuple[np.ndarray, np.ndarray]] = field(init=False, default_factory=list)
+    _pending_size: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self._values = np.empty(0, dtype=self.dtype)
+        self._counts = np.empty(0, dtype=np.int64)
+
+    def add(self, values: Iterable[Any], count: int = -1) -> None:
+        """Adds a page of (not necessarily distinct) dimension values."""
+        page = np.fromiter(values, dtype=self.dtype, count=count)
+        self.rows += page.size
+        distinct, counts = np.unique(page, return_counts=True)
+        self._pending.append((distinct, counts))
+        self._pending_size += distinct.size
+        if self._pending_size >= self.merge_size:
+            self._merge()
+
+    def _merge(self) -> None:
+        """Merges the pending pages into the sorted distinct values."""
+        if self._pending:
+            values = np.concatenate([self._values, *(distinct for distinct, _ in self._pending)])
+            counts = np.concatenate([self._counts, *(counts for _, counts in self._pending)])
+            self._values, inverse = np.unique(values, return_inverse=True)
+            self._counts = np.bincount(inverse, weights=counts, minlength=self._values.size).astype(np.int64)
+            self._pending.clear()
+            self._pending_size = 0
+
+    @property
+    def values(self) -> np.ndarray:
+        """The sorted array of distinct values added to the accumulator."""
+        self._merge()
+        return self._values
+
+    @property
+    def counts(self) -> np.ndarray:
+        """The number of times each of the distinct `values` was added to the
+        accumulator.
+        """
+        self._merge()
+        return self._counts
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes held by the accumulated values."""
+        pending = sum(distinct.nbytes + counts.nbytes for distinct, counts in self._pending)
+        return self._values.nbytes + self._counts.nbytes + pending
@@ -0,0 +1,38 @@
+from lsst.daf.butler import Butler, DatasetType
+
+from ..enums import SplitterEnum
+from .accumulator import DimensionValueAccumulator
+from .query import QuerySplitter
+
+
+class DimensionSplitter(QuerySplitter):
+    """Class implementing a group splitter based on Dimension split rules.
+
+    The split rules and parameters are the same as for a `QuerySplitter`, but
+    instead of querying for the data IDs of every dataset, the Butler is asked
+    only for the distinct data IDs of the split dimension for which the
+    dataset exists. The de-duplication and ordering of these data IDs are
+    pushed down to the Butler registry's database, which returns one row per
+    dimension value instead of one row per dataset.
+
+    Notes
+    -----
+    Unlike the `QuerySplitter`, the dataset search is not a "find-first"
+    search, which has no bearing on the set of dimension values found in the
+    collections.
+    """
+
+    __kind__ = SplitterEnum.DIMENSION
+
+    def accumulate_query(
+        self, butler: Butler, dataset_type: DatasetType, accumulator: DimensionValueAccumulator
+    ) -> None:
+        """Runs the dimension query in the calling (worker) thread, consuming
+        the ordered, distinct data IDs into an accumulator of dimension values
+        (see `QuerySplitter.accumulate_results`).
+        """
+        with butler.query() as query:
+            query = query.join_dataset_search(dataset_type, collections=self.collection_constraint)
+            if self.where:
+                query = query.where(self.where)
+            self.accumulate_results(query.data_ids([self.dimension]).order_by(self.dimension), accumulator)
@@ -1,17 +1,22 @@
-from collections.abc import AsyncGenerator, Mapping, Sequence
-from functools import partial
-from itertools import pairwise
+from collections.abc import AsyncGenerator, Callable, Iterator, Mapping, Sequence
+from itertools import batched, pairwise
+from operator import attrgetter
+from typing import Any
 
 import numpy as np
 from anyio import to_thread
 
-from lsst.daf.butler import DimensionNameError, MissingDatasetTypeError
+from lsst.daf.butler import Butler, DatasetType, DimensionNameError, MissingDatasetTypeError
 
 from ...config import config
 from ..butler import BUTLER_FACTORY
 from ..enums import SplitterEnum
 from ..errors import CMInvalidGroupingError, CMNoButlerError
+from ..logging import LOGGER
 from .abc import Splitter
+from .accumulator import DimensionValueAccumulator
+
+logger = LOGGER.bind(module=__name__)
 
 
 class QuerySplitter(Splitter):
@@ -77,11 +82,26 @@ class QuerySplitter(Splitter):
         self.butler_label = butler_label
         self.collection_constraint = collections
         self.where = " AND ".join(predicates)
+        self.truncated = False
 
     async def butler_query(self) -> np.ndarray:
         """Get a butler and query its registry for the collection of data IDs
         associated with the subject dataset.
 
+        Returns
+        -------
+        `numpy.ndarray`
+            A sorted array of the distinct `dimension` values of the data IDs
+            discovered in the `dataset`, accumulated from the query results
+            one page at a time.
+        """
+        return (await self.accumulate()).values
+
+    async def accumulate(self) -> DimensionValueAccumulator:
+        """Get a butler and query its registry for the collection of data IDs
+        associated with the subject dataset, accumulating their `dimension`
+        values.
+
         The butler represented by `butler_label` is queried for dataset types
         where the supplied predicates are true. The query is constrained to
         either a step input collection or the campaign input collection
@@ -89,9 +109,9 @@ class QuerySplitter(Splitter):
 
         Returns
         -------
-        `numpy.ndarray`
-            A potentially unsorted array of `dimension` values for each data ID
-            discovered in the `dataset` as a Numpy array.
+        `DimensionValueAccumulator`
+            The accumulated distinct `dimension` values of the data IDs
+            discovered in the `dataset`, with the number of data IDs for each.
         """
         butler = await BUTLER_FACTORY.aget_butler(self.butler_label)
 
@@ -110,21 +130,6 @@ class QuerySplitter(Splitter):
         except DimensionNameError as e:
             raise CMInvalidGroupingError from e
 
-        # FIXME include campaign+step predicate constraints
-        # NOTE the default behavior of the limit parameter is to log a warning
-        # if the limit is exceeded and still cap the resultset. We are unlikely
-        # to notice this warning, but we don't really want unbounded queries.
-        # However, we don't want silently truncated results, either.
-        refs_f = partial(
-            butler.query_datasets,
-            dataset_type,
-            collections=self.collection_constraint,
-            where=self.where,
-            find_first=True,
-            with_dimension_records=False,
-            limit=config.butler.max_query_limit,
-        )
-        refs = await to_thread.run_sync(refs_f)
         # TODO could we just as well return an N-dimensional array and pull out
         # the specific target dimension later?
         dimension_dtype: np.dtypes.StringDType | type
@@ -132,7 +137,83 @@ class QuerySplitter(Splitter):
             dimension_dtype := butler.dimensions.dimensions[self.dimension].primaryKey.getPythonType()
         ) is str:
             dimension_dtype = np.dtypes.StringDType()
-        return np.fromiter({ref.dataId[self.dimension] for ref in refs}, dtype=dimension_dtype)
+
+        accumulator = DimensionValueAccumulator(dtype=dimension_dtype)
+        await to_thread.run_sync(self.accumulate_query, butler, dataset_type, accumulator)
+        return accumulator
+
+    def accumulate_query(
+        self, butler: Butler, dataset_type: DatasetType, accumulator: DimensionValueAccumulator
+    ) -> None:
+        """Runs the dataset query in the calling (worker) thread, consuming the
+        query results into an accumulator of dimension values (see
+        `accumulate_results`).
+        """
+        # FIXME include campaign+step predicate constraints
+        with butler.query() as query:
+            results = query.datasets(dataset_type, collections=self.collection_constraint, find_first=True)
+            if self.where:
+                results = results.where(self.where)
+            self.accumulate_results(results, accumulator, data_id=attrgetter("dataId"))
+
+    def accumulate_results(
+        self,
+        results: Any,
+        accumulator: DimensionValueAccumulator,
+        data_id: Callable[[Any], Mapping[str, Any]] | None = None,
+    ) -> None:
+        """Consumes butler query results one page at a time into an
+        accumulator of dimension values, within the butler query limit.
+
+        Parameters
+        ----------
+        results
+            The butler query results, which are limited before they are read.
+
+        accumulator : `DimensionValueAccumulator`
+            The accumulator of the `dimension` values of the results.
+
+        data_id : `Callable`, optional
+            A function returning the data ID of a result row, if the rows are
+            not data IDs themselves.
+
+        Raises
+        ------
+        CMInvalidGroupingError
+            If the query results exceed a positive ``max_query_limit``. When
+            the limit is negative, the truncation is logged as a warning.
+        """
+        # The query asks for one row more than the limit so that a truncated
+        # result set is reported instead of silently capped.
+        limit = abs(config.butler.max_query_limit)
+        if limit:
+            results = results.limit(limit + 1)
+        for page in batched(results, config.butler.query_page_size):
+            data_ids = page if data_id is None else map(data_id, page)
+            accumulator.add((row[self.dimension] for row in data_ids), count=len(page))
+
+        self.truncated = bool(limit) and accumulator.rows > limit
+        if not self.truncated:
+            return
+        msg = f"Query for {self.dimension} values of {self.dataset} exceeds the butler query limit of {limit}"
+        if config.butler.max_query_limit > 0:
+            raise CMInvalidGroupingError(msg)
+        logger.warning(msg, dataset=self.dataset, dimension=self.dimension, limit=limit)
+
+    def group_count(self, size: int) -> int:
+        """Determines the number of groups into which `size` distinct values
+        are split according to the `min_groups` and `max_size` parameters.
+
+        Raises
+        ------
+        CMInvalidGroupingError
+            If there are not enough values to support the minimum group count.
+        """
+        if size < self.min_groups:
+            raise CMInvalidGroupingError("Not enough dataset elements to support minimum group count")
+
+        group_size = min(self.max_size, size // self.min_groups)
+        return (size // group_size) + (size % group_size != 0)
 
     async def split(self) -> AsyncGenerator[str]:
         """Produces group predicates by first querying a Butler for a set of
@@ -145,12 +226,7 @@ class QuerySplitter(Splitter):
             A string predicate for a Butler query describing the group range.
         """
         dataset_ref_values = await self.butler_query()
-
-        if dataset_ref_values.size < self.min_groups:
-            raise CMInvalidGroupingError("Not enough dataset elements to support minimum group count")
-
-        group_size = min(self.max_size, dataset_ref_values.size // self.min_groups)
-        group_count = (dataset_ref_values.size // group_size) + (dataset_ref_values.size % group_size != 0)
+        group_count = self.group_count(dataset_ref_values.size)
 
         # Given an unsorted array of known size, partition around a set of more
         # or less equally-spaced indices
@@ -158,8 +234,15 @@ class QuerySplitter(Splitter):
             0, dataset_ref_values.size, num=group_count, dtype=int, endpoint=False
         )
         dataset_ref_values.partition(partition_indices)
-        for a, b in pairwise(partition_indices):
-            yield (
-                f"{self.dimension} >= {dataset_ref_values[a]} AND {self.dimension} < {dataset_ref_values[b]}"
-            )
-        yield f"{self.dimension} >= {dataset_ref_values[partition_indices[-1]]}"
+        for predicate in range_predicates(self.dimension, dataset_ref_values, partition_indices):
+            yield predicate
+
+
+def range_predicates(dimension: str, values: np.ndarray, indices: np.ndarray) -> Iterator[str]:
+    """Yields a right-open range predicate for the `dimension` values between
+    each pair of consecutive `indices` into the `values`, and a final
+    unbounded predicate from the last index.
+    """
+    for a, b in pairwise(indices):
+        yield f"{dimension} >= {values[a]} AND {dimension} < {values[b]}"
+    yield f"{dimension} >= {values[indices[-1]]}"
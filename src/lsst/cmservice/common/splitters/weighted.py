@@ -0,0 +1,84 @@
+from collections.abc import AsyncGenerator
+
+import numpy as np
+
+from ..enums import SplitterEnum
+from .query import QuerySplitter, range_predicates
+
+
+class WeightedSplitter(QuerySplitter):
+    """Class implementing a group splitter based on Weighted split rules.
+
+    The split rules and parameters are the same as for a `QuerySplitter`, but
+    instead of splitting the distinct dimension values into ranges with an
+    equal number of values, each value is weighted by the number of datasets
+    found for it, and the values are split into ranges of roughly equal total
+    weight. A visit with many detectors or a heavy tract then contributes
+    proportionally more to its group, which evens out the size of each
+    group's workflow.
+
+    The number of groups is determined as for a `QuerySplitter`, except that
+    a range of roughly equal weight with more than `max_size` values is split
+    further.
+    """
+
+    __kind__ = SplitterEnum.WEIGHTED
+
+    async def split(self) -> AsyncGenerator[str]:
+        """Produces group predicates by first querying a Butler for the number
+        of datasets for each dimension value, then cutting the sorted values
+        into ranges of roughly equal total weight.
+
+        Yields
+        ------
+        str
+            A string predicate for a Butler query describing the group range.
+        """
+        accumulator = await self.accumulate()
+        group_count = self.group_count(accumulator.values.size)
+        indices = weighted_partition_indices(accumulator.counts, group_count, self.max_size)
+        for predicate in range_predicates(self.dimension, accumulator.values, indices):
+            yield predicate
+
+
+def weighted_partition_indices(weights: np.ndarray, group_count: int, max_size: int) -> np.ndarray:
+    """Returns the start indices of ranges of an array of `weights` such that
+    the total weight of each range is roughly equal.
+
+    Parameters
+    ----------
+    weights : `numpy.ndarray`
+        The weight of each value, in the sorted order of the values.
+
+    group_count : int
+        The number of ranges to cut, which must not be more than the number of
+        weights. Each range has at least one value.
+
+    max_size : int
+        The maximum number of values in a range. A range with more values is
+        divided into equal-count ranges, adding to the number of ranges.
+
+    Returns
+    -------
+    `numpy.ndarray`
+        The sorted start index of each range, the first of which is 0.
+    """
+    size = weights.size
+    cumulative = np.cumsum(weights)
+    targets = cumulative[-1] * np.arange(1, group_count) / group_count
+
+    # A range starts with the first value whose weight is mostly beyond the
+    # range's target cumulative weight. Offsetting the indices by their
+    # position and taking a running maximum makes them strictly increasing,
+    # so no range is empty, and clipping them leaves at least one value for
+    # every later range.
+    offsets = np.arange(group_count)
+    midpoints = cumulative - weights / 2
+    starts = np.concatenate([[0], np.searchsorted(midpoints, targets, side="right")])
+    starts = np.clip(np.maximum.accumulate(starts - offsets), 0, size - group_count) + offsets
+
+    ends = np.append(starts[1:], size)
+    oversize = [np.arange(a, b, max_size) for a, b in zip(starts, ends) if b - a > max_size]
+    if oversize:
+        starts = np.unique(np.concatenate([starts, *oversize]))
+    return starts
@@ -0,0 +1,179 @@
+"""Module implementing event-driven wakeups for the daemon's work loop.
+
+When the ``DAEMON_EVENTS`` feature is enabled, the daemon does not sleep a
+full processing interval between iterations. Instead, it waits on a
+``DaemonWakeup``, which is set by events that may make new work available to
+the daemon, such as a Node status change or an RPC process request. The
+processing interval becomes the maximum time the daemon stays idle without any
+such event.
+
+Notes
+-----
+The daemon wakeup follows a "global" pattern where it is assigned to a
+module-level variable at import-time. Events raised in the daemon's own process
+set the wakeup directly. Events raised by any other process, such as an API
+replica, reach the daemon as a Postgres ``NOTIFY`` on a configured channel,
+which the daemon ``LISTEN``s to on a dedicated database connection.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lsst.cmservice.models.types import AnyAsyncSession
+
+from ..config import config
+from .flags import Features
+from .logging import LOGGER
+
+logger = LOGGER.bind(module=__name__)
+
+
+class DaemonWakeup:
+    """An event that wakes the daemon's work loop before the end of its
+    processing interval.
+    """
+
+    def __init__(self) -> None:
+        self.event = asyncio.Event()
+        self.reasons: Counter[str] = Counter()
+
+    def wake(self, reason: str) -> None:
+        """Wake the daemon, recording the reason for doing so."""
+        self.reasons[reason] += 1
+        self.event.set()
+
+    def clear(self) -> Counter[str]:
+        """Reset the wakeup at the start of a daemon iteration, returning the
+        reasons for which it was set since the previous iteration.
+        """
+        reasons = self.reasons
+        self.reasons = Counter()
+        self.event.clear()
+        return reasons
+
+    async def wait(self, sentinel: asyncio.Event, *, max_idle: float, debounce: float) -> None:
+        """Wait until the sentinel or the wakeup is set, or until the max idle
+        elapses. When the wakeup is set, continue waiting for the debounce
+        window so that a burst of events is handled by a single iteration.
+        """
+        waiters = {
+            asyncio.create_task(sentinel.wait()),
+            asyncio.create_task(self.event.wait()),
+        }
+        _, pending = await asyncio.wait(waiters, timeout=max_idle, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in pending:
+            waiter.cancel()
+
+        if self.event.is_set() and not sentinel.is_set():
+            with suppress(TimeoutError):
+                await asyncio.wait_for(sentinel.wait(), timeout=debounce)
+
+    def on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """Callback for a Postgres notification on the wakeup channel."""
+        self.wake(payload or channel)
+
+    @asynccontextmanager
+    async def listen(self, engine: AsyncEngine) -> AsyncGenerator[None]:
+        """Listen for notifications on the configured wakeup channel with a
+        dedicated connection for the duration of the context, connecting again
+        whenever the connection is lost.
+
+        If no channel is configured, only in-process events wake the daemon.
+
+        Raises
+        ------
+        Exception
+            Any error raised making the first connection.
+        """
+        if (channel := config.daemon.wakeup_channel) is None:
+            yield
+            return
+
+        # The context is entered once the first connection is listening
+        listening = asyncio.Event()
+        listener = asyncio.create_task(self.listen_forever(engine, channel, listening))
+        waiter = asyncio.create_task(listening.wait())
+        await asyncio.wait({listener, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        if listener.done():
+            listener.result()
+        try:
+            yield
+        finally:
+            listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await listener
+
+    async def listen_forever(self, engine: AsyncEngine, channel: str, listening: asyncio.Event) -> None:
+        """Listen for notifications on a channel with a dedicated connection,
+        connecting again whenever the connection is lost. Because any
+        notification sent while the connection was lost is missed, the daemon
+        is woken once it listens again.
+
+        Any error raised before `listening` is first set is raised, while later
+        errors are logged before connecting again.
+        """
+        while True:
+            try:
+                async with engine.connect() as connection:
+                    raw_connection = await connection.get_raw_connection()
+                    driver_connection = raw_connection.driver_connection
+                    assert driver_connection is not None
+                    lost = asyncio.Event()
+                    driver_connection.add_termination_listener(lambda _: lost.set())
+                    await driver_connection.add_listener(channel, self.on_notification)
+                    logger.info("Daemon listening for wakeup notifications", channel=channel)
+                    if listening.is_set():
+                        self.wake("reconnect")
+                    listening.set()
+                    try:
+                        await self.watch(driver_connection, lost)
+                    finally:
+                        with suppress(Exception):
+                            await driver_connection.remove_listener(channel, self.on_notification)
+                    await connection.invalidate()
+            except Exception:
+                if not listening.is_set():
+                    raise
+                logger.exception("Daemon wakeup listener failed", channel=channel)
+            logger.warning("Daemon wakeup listener connection lost, connecting again", channel=channel)
+            await asyncio.sleep(config.daemon.wakeup_check_interval)
+
+    async def watch(self, driver_connection: Any, lost: asyncio.Event) -> None:
+        """Return once a listening connection is lost, either as reported by
+        the driver or because a periodic check of the connection fails.
+        """
+        interval = config.daemon.wakeup_check_interval
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(lost.wait(), timeout=interval)
+                return
+            try:
+                async with asyncio.timeout(interval):
+                    await driver_connection.execute("SELECT 1")
+            except Exception:
+                return
+
+
+DAEMON_WAKEUP = DaemonWakeup()
+"""A process-wide wakeup for the daemon."""
+
+
+async def notify_daemon(session: AnyAsyncSession, reason: str) -> None:
+    """Wake the daemon after the session's current transaction is committed.
+
+    The daemon in this process is woken immediately, while a daemon in any
+    other process is woken by a Postgres notification, which is delivered when
+    the transaction commits and is discarded if it rolls back.
+    """
+    if Features.DAEMON_EVENTS not in config.features.enabled:
+        return
+    DAEMON_WAKEUP.wake(reason)
+    if (channel := config.daemon.wakeup_channel) is not None:
+        await session.execute(select(func.pg_notify(channel, reason)))
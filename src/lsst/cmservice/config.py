@@ -82,6 +82,29 @@ class BpsConfiguration(BaseModel):
         int, BeforeValidator(lambda v: getattr(logging, v.upper()) if isinstance(v, str) else v)
     ] = Field(default=logging.ERROR, title="BPS Log level", description="Logging level for the bps packages.")
 
+    report_concurrency: int = Field(
+        description="Maximum number of BPS status and report calls made at once in worker threads",
+        default=8,
+    )
+
+    report_cache_size: int = Field(
+        description="Maximum number of BPS status and report results cached by submit directory",
+        default=1024,
+    )
+
+    report_cache_ttl: int = Field(
+        description="Age in seconds after which a cached BPS status or report result is not used",
+        default=300,
+    )
+
+    report_parse_processes: int = Field(
+        description=(
+            "Maximum number of worker processes parsing pipetask reports at once. If 0, reports are parsed "
+            "in a worker thread instead."
+        ),
+        default=2,
+    )
+
 
 class ButlerConfiguration(BaseModel):
     """Configuration settings for butler client operations.
@@ -125,14 +148,33 @@ class ButlerConfiguration(BaseModel):
         default=None,
     )
 
+    pool_size: int = Field(
+        description="Maximum number of idle butler clones kept in the pool of each repo",
+        default=8,
+    )
+
+    pool_max_age: int = Field(
+        description="Age in seconds after which a pooled butler clone is discarded instead of reused",
+        default=3600,
+    )
+
     max_query_limit: int = Field(
         description=(
-            "Query limit for butler data queries. The butler package defaults to `-20_000`"
-            "(the negative meaning to log a warning before truncating results)"
+            "Query limit for butler data queries. The butler package defaults to `-20_000` "
+            "(the negative meaning to log a warning before truncating results). A group-splitting query "
+            "that exceeds a positive limit is an error, and a limit of 0 does not limit the query."
         ),
         default=-1_000_000,
     )
 
+    query_page_size: int = Field(
+        description=(
+            "The number of butler query result rows consumed at a time when accumulating the dimension "
+            "values of a group-splitting query."
+        ),
+        default=50_000,
+    )
+
 
 class HipsConfiguration(BaseModel):
     """Configuration settings for HiPS operations.
@@ -298,6 +340,36 @@ class HTCondorConfiguration(BaseModel):
         serialization_alias="_CONDOR_ARCH",
     )
 
+    launcher_poll_max_age: int = Field(
+        description=(
+            "Age in seconds after which the job statuses polled from the schedds by the daemon are not used "
+            "to check a node, which instead reads its job event log."
+        ),
+        default=120,
+        exclude=True,
+    )
+
+    launcher_schedd_cache_ttl: int = Field(
+        description="Age in seconds after which the schedd ads located through the collector are refreshed.",
+        default=300,
+        exclude=True,
+    )
+
+    launcher_submit_batch_window: float = Field(
+        description=(
+            "Seconds the launch manager waits after a job is launched for other launches to submit with it "
+            "in a single schedd transaction."
+        ),
+        default=0.5,
+        exclude=True,
+    )
+
+    launcher_submit_batch_size: int = Field(
+        description="Number of launched jobs after which a batch is submitted without waiting.",
+        default=100,
+        exclude=True,
+    )
+
 
 class PandaConfiguration(BaseModel, validate_assignment=True):
     """Configuration parameters for the PanDA WMS"""
@@ -589,7 +661,153 @@ class DaemonConfiguration(BaseModel):
         description=(
             "The maximum wait time (seconds) between daemon processing intervals "
             "and the minimum time between element processing attepts. This "
-            "duration may be lengthened depending on the element type."
+            "duration may be lengthened depending on the element type. When the "
+            "DAEMON_EVENTS feature is enabled, this is the maximum idle time "
+            "between iterations in the absence of wakeup events."
+        ),
+    )
+
+    wakeup_channel: str | None = Field(
+        default="cm_service_daemon",
+        description=(
+            "The Postgres notification channel on which the daemon listens for "
+            "wakeup events when the DAEMON_EVENTS feature is enabled. If not "
+            "set, only events raised in the daemon's own process wake it."
+        ),
+    )
+
+    wakeup_debounce: float = Field(
+        default=1.0,
+        description=(
+            "The time (seconds) the daemon waits after a wakeup event before "
+            "starting an iteration, so that a burst of events is handled by a "
+            "single iteration."
+        ),
+    )
+
+    wakeup_check_interval: float = Field(
+        default=30.0,
+        description=(
+            "The time (seconds) between checks of the connection on which the "
+            "daemon listens for wakeup notifications, and between attempts to "
+            "connect again when it is lost."
+        ),
+    )
+
+    campaign_concurrency: int = Field(
+        default=4,
+        description=(
+            "The maximum number of campaigns considered at once by the daemon, "
+            "each of which uses its own database session. This should not "
+            "exceed the size of the database connection pool."
+        ),
+    )
+
+    campaign_time_budget: int = Field(
+        default=30,
+        description=(
+            "The maximum time (seconds) the daemon spends considering a single "
+            "campaign in an iteration, after which the campaign's work for the "
+            "iteration is abandoned and retried in the next iteration."
+        ),
+    )
+
+    node_concurrency: int = Field(
+        default=32,
+        description=(
+            "The maximum number of node transitions the daemon runs at once. The "
+            "daemon does not claim more tasks than it has free workers."
+        ),
+    )
+
+    node_kind_concurrency: dict[str, int] = Field(
+        default={"group": 8, "step": 4, "collect_groups": 4},
+        description=(
+            "The maximum number of node transitions the daemon runs at once for "
+            "each named kind of node, such as group launches or the butler "
+            "collection operations of steps. Kinds not named are limited only by "
+            "the overall node concurrency."
+        ),
+    )
+
+    node_claim_page_size: int = Field(
+        default=100,
+        description="The maximum number of tasks the daemon claims from the task queue at once.",
+    )
+
+    priority: int | None = Field(
+        default=None,
+        description=(
+            "The daemon's own priority. The daemon does not claim tasks with a "
+            "priority value greater than its own, where a lower value is a "
+            "higher priority. If not set, tasks of any priority are claimed."
+        ),
+    )
+
+    site_affinity: list[str] | None = Field(
+        default=None,
+        description=(
+            "The sites with which the daemon has an affinity. When set, the "
+            "daemon only claims tasks without a site affinity or with an "
+            "affinity for one of these sites, so that daemons at different "
+            "sites may share a database."
+        ),
+    )
+
+    task_batch_size: int = Field(
+        default=1000,
+        description=(
+            "The maximum number of tasks written to the task queue by a single multi-row insert statement."
+        ),
+    )
+
+    compaction_interval: int = Field(
+        default=3600,
+        description=(
+            "The time (seconds) between runs of the compaction job that archives "
+            "tombstoned tasks and expired activity log entries, when the "
+            "COMPACTION feature is enabled."
+        ),
+    )
+
+    compaction_batch_size: int = Field(
+        default=1000,
+        description="The maximum number of rows archived by the compaction job in a single transaction.",
+    )
+
+    task_retention: int = Field(
+        default=86400,
+        description=(
+            "The time (seconds) a finished task is kept in the task queue before "
+            "it is archived. A campaign may override this with a "
+            "`retention.tasks` value in its metadata."
+        ),
+    )
+
+    activity_log_retention: int = Field(
+        default=2592000,
+        description=(
+            "The time (seconds) a finished activity log entry is kept before it "
+            "is archived. A campaign may override this with a "
+            "`retention.activity_log` value in its metadata."
+        ),
+    )
+
+    manifest_cache_size: int = Field(
+        default=1024,
+        description=(
+            "The maximum number of manifest specs held in the process-wide "
+            "manifest cache, after which the least recently used spec is "
+            "evicted. A size of 0 disables the cache."
+        ),
+    )
+
+    graph_cache_size: int = Field(
+        default=128,
+        description=(
+            "The maximum number of campaign graphs held in the process-wide "
+            "graph cache, after which the least recently used graph is evicted. "
+            "A size of 0 disables the cache."
         ),
     )
 
@@ -1,13 +1,14 @@
 import asyncio
 import os
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
 
 from . import __version__
 from .common.butler import BUTLER_FACTORY  # noqa: F401
+from .common.compaction import compaction_loop
 from .common.daemon import daemon_iteration
 from .common.daemon_v2 import DaemonContext
 from .common.daemon_v2 import daemon_iteration as daemon_iteration_v2
@@ -15,6 +16,7 @@ from .common.flags import Features
 from .common.logging import LOGGER, LoggingMiddleware
 from .common.panda import get_panda_token
 from .common.scheduler import Scheduler
+from .common.wakeup import DAEMON_WAKEUP
 from .config import config
 from .db.session import db_session_dependency
 from .routers.healthz import health_router
@@ -43,6 +45,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         daemon = tg.create_task(main_loop(app=app, sentinel=shutdown_signal), name="daemon")
         app.state.tasks.add(daemon)
 
+        # Compaction
+        if Features.COMPACTION in config.features.enabled:
+            compaction = tg.create_task(compaction_loop(sentinel=shutdown_signal), name="compaction")
+            app.state.tasks.add(compaction)
+
         # Scheduler
         if Features.SCHEDULER in config.features.enabled:
             scheduler = Scheduler(app=app, sentinel=shutdown_signal)
@@ -62,7 +69,8 @@ async def main_loop(app: FastAPI, sentinel: asyncio.Event) -> None:
     """Daemon execution loop.
 
     With a database session, perform a single daemon interation and then sleep
-    until the next daemon appointment.
+    until the next daemon appointment, or until a wakeup event when the
+    ``DAEMON_EVENTS`` feature is enabled.
     """
     sleep_time = config.daemon.processing_interval
 
@@ -72,23 +80,32 @@ async def main_loop(app: FastAPI, sentinel: asyncio.Event) -> None:
     logger.info("Starting Daemon...")
     _iteration_count = 0
 
-    while not sentinel.is_set():
-        _iteration_count += 1
-        logger.info("Daemon starting iteration %s", _iteration_count)
-        async with DaemonContext(app=app) as context:
-            if Features.DAEMON_V1 in config.features.enabled:
-                await daemon_iteration(context.session)
-            if Features.DAEMON_V2 in config.features.enabled:
-                await daemon_iteration_v2(context)
-
-        logger.info("Daemon completed %s iterations.", _iteration_count)
-        try:
-            await asyncio.wait_for(sentinel.wait(), timeout=sleep_time)
-            logger.info("Daemon stopping")
-            break
-        except TimeoutError:
-            # next iteration
-            pass
+    async with AsyncExitStack() as stack:
+        if Features.DAEMON_EVENTS in config.features.enabled:
+            assert db_session_dependency.engine is not None
+            await stack.enter_async_context(DAEMON_WAKEUP.listen(db_session_dependency.engine))
+
+        while not sentinel.is_set():
+            _iteration_count += 1
+            wakeup_reasons = DAEMON_WAKEUP.clear()
+            logger.info("Daemon starting iteration %s", _iteration_count, wakeup=dict(wakeup_reasons))
+            async with DaemonContext(app=app) as context:
+                if Features.DAEMON_V1 in config.features.enabled:
+                    await daemon_iteration(context.session)
+                if Features.DAEMON_V2 in config.features.enabled:
+                    await daemon_iteration_v2(context)
+
+            logger.info("Daemon completed %s iterations.", _iteration_count)
+            if Features.DAEMON_EVENTS in config.features.enabled:
+                # Wait for a wakeup event, with the interval as the max idle
+                await DAEMON_WAKEUP.wait(
+                    sentinel, max_idle=sleep_time, debounce=config.daemon.wakeup_debounce
+                )
+            else:
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(sentinel.wait(), timeout=sleep_time)
+
+    logger.info("Daemon stopping")
 
 
 def main() -> None:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 
 from lsst.cmservice.models.enums import StatusEnum
@@ -15,6 +16,7 @@ from ..common.errors import (
     CMMissingIDError,
 )
 from ..common.logging import LOGGER
+from ..config import config
 
 logger = LOGGER.bind(module=__name__)
 
@@ -349,6 +351,70 @@ class RowMixin:
         await session.refresh(row)
         return row
 
+    @classmethod
+    async def upsert_rows(
+        cls,
+        session: AnyAsyncSession,
+        rows: Sequence[dict[str, Any]],
+        *,
+        index_elements: Sequence[str] = ("fullname",),
+        update_columns: Sequence[str] = (),
+    ) -> None:
+        """Create or update many rows at once
+
+        The rows are written with a multi-row ``INSERT ... ON CONFLICT``
+        statement for each batch of at most ``config.db.upsert_batch_size``
+        rows, all within one nested transaction. Unlike `create_row`, this
+        does not call `get_create_kwargs`, so every column must be given.
+
+        Parameters
+        ----------
+        session : A
+            DB session manager
+
+        rows: Sequence[dict[str, Any]]
+            Columns and associated values of each row, with the same columns
+            for every row
+
+        index_elements: Sequence[str]
+            Columns of the unique constraint identifying an existing row
+
+        update_columns: Sequence[str]
+            Columns set in an existing row, which is left alone if empty
+
+        Raises
+        ------
+        CMIntegrityError : Catching a IntegrityError
+        """
+        # A row may not be affected twice by the same statement's conflict
+        # clause, so the last values of a row win if it is updated and the
+        # first if it is left alone
+        unique_rows: dict[tuple, dict[str, Any]] = {}
+        for row in rows:
+            key = tuple(row[column] for column in index_elements)
+            if update_columns or key not in unique_rows:
+                unique_rows[key] = row
+        values = list(unique_rows.values())
+        table = cls.__table__  # type: ignore[attr-defined]
+        batch_size = config.db.upsert_batch_size
+        try:
+            async with session.begin_nested():
+                for i in range(0, len(values), batch_size):
+                    statement = insert(table).values(values[i : i + batch_size])
+                    if update_columns:
+                        statement = statement.on_conflict_do_update(
+                            index_elements=list(index_elements),
+                            set_={column: statement.excluded[column] for column in update_columns},
+                        )
+                    else:
+                        statement = statement.on_conflict_do_nothing(index_elements=list(index_elements))
+                    await session.execute(statement)
+        except IntegrityError as msg:
+            await session.rollback()
+            if TYPE_CHECKING:
+                assert msg.orig  # for mypy
+            raise CMIntegrityError(params=msg.params, orig=msg.orig, statement=msg.statement) from msg
+
     @classmethod
     async def get_create_kwargs(
         cls,
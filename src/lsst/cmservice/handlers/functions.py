@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Any
 from uuid import UUID, uuid5
 
 import yaml
-from anyio import Path
+from anyio import Path, to_thread
 from pydantic.v1.utils import deep_update
 from sqlalchemy import select
 
@@ -15,8 +15,10 @@ from lsst.cmservice.models.types import AnyAsyncSession
 from lsst.ctrl.bps.bps_reports import compile_job_summary
 from lsst.ctrl.bps.wms_service import WmsRunReport, WmsStates
 
+from ..common.error_classifier import ERROR_CLASSIFIER
 from ..common.errors import CMMissingFullnameError, CMYamlParseError
 from ..common.logging import LOGGER
+from ..common.reports import load_manifest_summary
 from ..config import config
 from ..db.campaign import Campaign
 from ..db.element import ElementMixin
@@ -491,10 +493,10 @@ async def match_pipetask_error(
     error_type : PipetaskErrorType | None
         Matched error type, or None for no match
     """
-    for pipetask_error_type_ in await PipetaskErrorType.get_rows(session):
-        if pipetask_error_type_.match(task_name, diagnostic_message):
-            return pipetask_error_type_
-    return None
+    classifier = await ERROR_CLASSIFIER.refresh(session)
+    if (error_type_id := classifier.classify(task_name, diagnostic_message)) is None:
+        return None
+    return await session.get(PipetaskErrorType, error_type_id)
 
 
 async def load_manifest_report(
@@ -537,121 +539,85 @@ async def load_manifest_report(
     if not await yaml_file.exists():
         msg = f"Manifest report yaml does not exist at path {yaml_file}"
         raise CMYamlParseError(msg)
-    try:
-        manifest_yaml = await yaml_file.read_bytes()
-        manifest_data = yaml.safe_load(manifest_yaml)
-    except yaml.YAMLError as yaml_error:
-        msg = f"Error parsing manifest report yaml at path {yaml_file}; threw {yaml_error}"
-        raise CMYamlParseError(msg) from yaml_error
-    except Exception as e:
-        msg = f"{e}"
-        raise CMYamlParseError(msg) from e
-    for task_name_, task_data_ in manifest_data.items():
-        failed_quanta = task_data_.get("failed_quanta", {})
-        outputs = task_data_.get("outputs", {})
-        n_expected = task_data_.get("n_expected", 0)
-        n_failed = len(failed_quanta)
-        n_failed_upstream = task_data_.get("n_quanta_blocked", 0)
-        n_done = task_data_.get("n_succeeded", 0)
-
-        task_fullname = f"{job_name}/{task_name_}"
-        try:
-            task_set = await TaskSet.get_row_by_fullname(session, task_fullname)
-            if allow_update:
-                task_set = await TaskSet.update_row(
-                    session,
-                    row_id=task_set.id,
-                    job_id=job.id,
-                    name=task_name_,
-                    fullname=task_fullname,
-                    n_expected=n_expected,
-                    n_done=n_done,
-                )
-        except CMMissingFullnameError:
-            task_set = await TaskSet.create_row(
-                session,
-                job_id=job.id,
-                name=task_name_,
-                fullname=task_fullname,
-                n_expected=n_expected,
-                n_done=n_done,
-                n_failed=n_failed,
-                n_failed_upstream=n_failed_upstream,
-            )
-
-        for data_type_, counts_ in outputs.items():
-            product_fullname = f"{task_set.fullname}/{data_type_}"
-            try:
-                product_set = await ProductSet.get_row_by_fullname(
-                    session,
-                    product_fullname,
-                )
-                if allow_update:
-                    product_set = await ProductSet.update_row(
-                        session,
-                        row_id=product_set.id,
-                        job_id=job.id,
-                        task_id=task_set.id,
-                        name=data_type_,
-                        fullname=product_fullname,
-                        n_expected=counts_.get("expected", 0),
-                        n_done=counts_.get("produced", 0),
-                        n_failed=counts_.get("failed", 0),
-                        n_failed_upstream=counts_.get("blocked", 0),
-                        n_missing=counts_.get("not_produced", 0),
-                    )
-            except CMMissingFullnameError:
-                product_set = await ProductSet.create_row(
-                    session,
-                    job_id=job.id,
-                    task_id=task_set.id,
-                    name=data_type_,
-                    fullname=f"{task_set.fullname}/{data_type_}",
-                    n_expected=counts_.get("expected", 0),
-                    n_done=counts_.get("produced", 0),
-                    n_failed=counts_.get("failed", 0),
-                    n_failed_upstream=counts_.get("blocked", 0),
-                    n_missing=counts_.get("not_produced", 0),
-                )
-
-        for failed_quanta_uuid_, failed_quanta_data_ in failed_quanta.items():
-            diagnostic_message_list = failed_quanta_data_["error"]
-            if diagnostic_message_list:
-                diagnostic_message = diagnostic_message_list[-1]
-            else:  # pragma: no cover
-                diagnostic_message = "Super-unhelpful empty message"
-
-            error_type = await match_pipetask_error(
-                session,
-                task_name_,
-                diagnostic_message,
+    # The report is parsed and summarized in a worker process
+    task_summaries = await load_manifest_summary(yaml_file)
+    # The error types are loaded and compiled once for the whole report
+    classifier = await ERROR_CLASSIFIER.refresh(session)
+
+    # The rows of each table are written with bulk upserts rather than
+    # looked up and written one at a time
+    task_rows = [
+        {
+            "job_id": job.id,
+            "name": task_summary_.name,
+            "fullname": f"{job_name}/{task_summary_.name}",
+            "n_expected": task_summary_.n_expected,
+            "n_done": task_summary_.n_done,
+            "n_failed": task_summary_.n_failed,
+            "n_failed_upstream": task_summary_.n_failed_upstream,
+        }
+        for task_summary_ in task_summaries
+    ]
+    await TaskSet.upsert_rows(
+        session,
+        task_rows,
+        update_columns=["job_id", "name", "n_expected", "n_done"] if allow_update else [],
+    )
+    task_ids = {
+        row.fullname: row.id
+        for row in await session.execute(
+            select(TaskSet.id, TaskSet.fullname).where(
+                TaskSet.fullname.in_([task_row["fullname"] for task_row in task_rows])
             )
+        )
+    }
+
+    product_rows: list[dict[str, Any]] = []
+    error_rows: list[dict[str, Any]] = []
+    for task_summary_ in task_summaries:
+        task_fullname = f"{job_name}/{task_summary_.name}"
+        task_id = task_ids[task_fullname]
+        product_rows.extend(
+            {
+                "job_id": job.id,
+                "task_id": task_id,
+                "name": product_.name,
+                "fullname": f"{task_fullname}/{product_.name}",
+                "n_expected": product_.n_expected,
+                "n_done": product_.n_done,
+                "n_failed": product_.n_failed,
+                "n_failed_upstream": product_.n_failed_upstream,
+                "n_missing": product_.n_missing,
+            }
+            for product_ in task_summary_.products
+        )
+        error_rows.extend(
+            {
+                "error_type_id": classifier.classify(task_summary_.name, failed_quantum_.diagnostic_message),
+                "task_id": task_id,
+                "quanta": failed_quantum_.quanta,
+                "data_id": failed_quantum_.data_id,
+                "diagnostic_message": failed_quantum_.diagnostic_message,
+            }
+            for failed_quantum_ in task_summary_.failed_quanta
+        )
 
-            error_type_id = error_type.id if error_type is not None else None
-            try:
-                pipetask_error = await PipetaskError.get_row_by_fullname(
-                    session,
-                    failed_quanta_uuid_,
-                )
-                if allow_update:
-                    pipetask_error = await PipetaskError.update_row(
-                        session,
-                        row_id=pipetask_error.id,
-                        error_type_id=error_type_id,
-                        task_id=task_set.id,
-                        quanta=failed_quanta_uuid_,
-                        data_id=failed_quanta_data_["data_id"],
-                        diagnostic_message=diagnostic_message,
-                    )
-            except CMMissingFullnameError:
-                pipetask_error = await PipetaskError.create_row(
-                    session,
-                    error_type_id=error_type_id,
-                    task_id=task_set.id,
-                    quanta=failed_quanta_uuid_,
-                    data_id=failed_quanta_data_["data_id"],
-                    diagnostic_message=diagnostic_message,
-                )
+    await ProductSet.upsert_rows(
+        session,
+        product_rows,
+        update_columns=(
+            ["job_id", "task_id", "name", "n_expected", "n_done", "n_failed"]
+            + ["n_failed_upstream", "n_missing"]
+            if allow_update
+            else []
+        ),
+    )
+    await PipetaskError.upsert_rows(
+        session,
+        error_rows,
+        index_elements=["quanta"],
+        update_columns=["error_type_id", "task_id", "data_id", "diagnostic_message"] if allow_update else [],
+    )
 
     return job
 
@@ -752,24 +718,21 @@ async def load_wms_reports(
     if wms_run_report is None:
         return job
     if wms_run_report.job_summary is None:
-        compile_job_summary(wms_run_report)
+        await to_thread.run_sync(compile_job_summary, wms_run_report)
         if wms_run_report.job_summary is None:
             raise RuntimeError("compile_job_summary did not compile a job summary")
-    for task_name, job_summary in wms_run_report.job_summary.items():
-        fullname = f"{job.fullname}/{task_name}"
-        wms_dict = {f"n_{wms_state_.name.lower()}": count_ for wms_state_, count_ in job_summary.items()}
-        report: WmsTaskReport | None = None
-        try:
-            report = await WmsTaskReport.get_row_by_fullname(session, fullname)
-            await report.update_values(session, **wms_dict)
-        except CMMissingFullnameError:
-            _report = await WmsTaskReport.create_row(
-                session,
-                job_id=job.id,
-                name=task_name,
-                fullname=fullname,
-                **wms_dict,
-            )
+    wms_columns = [f"n_{wms_state_.name.lower()}" for wms_state_ in WmsStates]
+    report_rows = [
+        {
+            "job_id": job.id,
+            "name": task_name,
+            "fullname": f"{job.fullname}/{task_name}",
+            **dict.fromkeys(wms_columns, 0),
+            **{f"n_{wms_state_.name.lower()}": count_ for wms_state_, count_ in job_summary.items()},
+        }
+        for task_name, job_summary in wms_run_report.job_summary.items()
+    ]
+    await WmsTaskReport.upsert_rows(session, report_rows, update_columns=wms_columns)
     return job
 
 
@@ -818,6 +781,7 @@ async def load_error_types(
         new_error_type = await PipetaskErrorType.create_row(session, **val)
         ret_list.append(new_error_type)
 
+    ERROR_CLASSIFIER.invalidate()
     return ret_list
 
 
@@ -36,6 +36,7 @@ class StatefulModel(ABC):
     """
 
     __kind__ = [ManifestKind.other]
+    __persistent__: tuple[str, ...] = ()
     activity_log_entry: ActivityLog | None = None
     db_model: AnyStatefulObject
     machine: AnyMachine
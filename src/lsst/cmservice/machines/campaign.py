@@ -13,16 +13,15 @@ information about the overall campaign progress to pilots and other users.
 from typing import Any
 from uuid import uuid5
 
-from sqlmodel import select
 from transitions import EventData
 from transitions.extensions.asyncio import AsyncMachine
 
-from lsst.cmservice.models.db.campaigns import ActivityLog, Campaign, Edge, Node
+from lsst.cmservice.models.db.campaigns import ActivityLog, Campaign, Node
 from lsst.cmservice.models.enums import ManifestKind, StatusEnum
 from lsst.cmservice.models.lib import timestamp
 from lsst.cmservice.models.lib.graph import (
     InvalidCampaignGraphError,
-    graph_from_edge_list_v2,
+    graph_from_namespace,
     validate_graph,
 )
 
@@ -181,8 +180,7 @@ class CampaignMachine(NodeMachine):
         This callback asserts that the campaign graph is valid as a condition
         that must be met before the campaign may transition to a "ready" state.
         """
-        edges = await self.session.exec(select(Edge).where(Edge.namespace == self.db_model.id))
-        graph = await graph_from_edge_list_v2(edges.all(), self.session)
+        graph = await graph_from_namespace(self.db_model.id, self.session)
 
         # There may only be a single START or END node in a graph, but the
         # version of this node is variable. Regardless, the START must always
@@ -4,7 +4,7 @@ import re
 import shlex
 import traceback
 from collections import ChainMap
-from collections.abc import Callable, Generator, Sequence
+from collections.abc import Callable, Generator, Mapping, Sequence
 from functools import partial, reduce
 from shutil import rmtree
 from textwrap import dedent
@@ -13,15 +13,17 @@ from uuid import uuid5
 
 from anyio import Path, to_thread
 from sqlalchemy.dialects.postgresql import insert
-from sqlmodel import col, select
 from transitions import EventData
 
-from lsst.cmservice.models.db.campaigns import ActivityLog, Campaign, Manifest, Node
-from lsst.cmservice.models.enums import DEFAULT_NAMESPACE, ManifestKind
+from lsst.cmservice.models.db.campaigns import ActivityLog, Campaign, Node
+from lsst.cmservice.models.enums import ManifestKind
 from lsst.cmservice.models.lib.logging import LOGGER
 from lsst.cmservice.models.lib.timestamp import element_time, now_utc
 from lsst.cmservice.models.types import AsyncSession
 
+from ..common.butler import CollectionOperation
+from ..common.manifest_cache import MANIFEST_CACHE
+
 logger = LOGGER.bind(module=__name__)
 
 
@@ -53,45 +55,22 @@ async def assemble_config_chain(
     # TODO if the Node or Campaign has a selector in its spec, use those
     # instructions in the ORM where clause to match manifest metadata labels
     # TODO if manifest selection is ambiguous (i.e, more than one matching
-    # manifest is found), this should be an error. IOW, remove the limit(1)
-    # clause and allow the node to fail if <exec>.one_or_none() raises an
-    # exception. The exception to this is ambiguity in the library manifest
-    # namespace: if a campaign-scoped manifest is found, ambiguity in the
-    # default namespace should result in no library manifest used in the config
-    # chain; failure on ambiguous manifest for library manifests should only
-    # result when no namespace-scoped manifest candidate is available.
+    # manifest is found), this should be an error. The exception to this is
+    # ambiguity in the library manifest namespace: if a campaign-scoped
+    # manifest is found, ambiguity in the default namespace should result in
+    # no library manifest used in the config chain; failure on ambiguous
+    # manifest for library manifests should only result when no namespace-
+    # scoped manifest candidate is available.
+    # The "latest" manifest of each kind within the campaign and the library
+    # manifest of each kind are found together.
+    campaign_specs, library_specs = await MANIFEST_CACHE.get_latest_specs(node.namespace, session)
+
     for kind in ManifestKind.__members__:
         # each key in the node configuration is the basis of a configchain
-        # find the "latest" manifest of this kind within the campaign
-        campaign_config: dict[str, Any] = {}
-
-        s = (
-            select(Manifest)
-            .where(Manifest.namespace == node.namespace)
-            .where(col(Manifest.kind) == kind)
-            .order_by(col(Manifest.version).desc())
-            .limit(1)
-        )
-        if (manifest := (await session.exec(s)).one_or_none()) is not None:
-            campaign_config = manifest.spec
-        else:
-            campaign_config = {}
-        s = (
-            select(Manifest)
-            .where(Manifest.namespace == DEFAULT_NAMESPACE)
-            .where(col(Manifest.kind) == kind)
-            .where(col(Manifest.version) == 0)
-            .limit(1)
-        )
-        if (manifest := (await session.exec(s)).one_or_none()) is not None:
-            library_config = manifest.spec
-        else:
-            library_config = {}
-
         config_chain[kind] = ChainMap(
             node.configuration.get(kind, {}),
-            campaign_config,
-            library_config,
+            campaign_specs.get(kind, {}),
+            library_specs.get(kind, {}),
             extra.get(kind, {}),
         )
     # Add node metadata to config_chain
@@ -159,6 +138,25 @@ def ordinal_group_nonce() -> Generator[str]:
         n += 1
 
 
+def group_collection_removals(collections: Mapping[str, Any]) -> list[CollectionOperation]:
+    """Returns the collection operations removing the output collections of a
+    group, given the ``butler.collections`` configuration of the group.
+
+    The group's run collection is first removed from its step's output chain
+    and the group's output chain is removed before the run collection itself,
+    because a collection cannot be removed while it is the child of a chain.
+    """
+    run = collections.get("run")
+    operations: list[CollectionOperation] = []
+    if run is not None and (step_output := collections.get("step_output")) is not None:
+        operations.append(CollectionOperation("unchain", step_output, (run,)))
+    if (group_output := collections.get("group_output")) is not None:
+        operations.append(CollectionOperation("remove", group_output))
+    if run is not None:
+        operations.append(CollectionOperation("remove", run))
+    return operations
+
+
 async def deltree(path: Path) -> None:
     """Async wrapper for the `shutil.rmtree` function with error callback."""
 
@@ -5,9 +5,11 @@ export from this module.
 """
 
 import inspect
+import pickle
 import sys
 from functools import cache
 
+from lsst.cmservice.models.db.campaigns import Machine, Node
 from lsst.cmservice.models.enums import ManifestKind
 
 from ..common.logging import LOGGER
@@ -20,6 +22,7 @@ from .nodes.meta import StartMachine as StartMachine
 from .nodes.mixin import HTCondorLaunchMixin as HTCondorLaunchMixin
 from .nodes.steps import StepCollectMachine as StepCollectMachine
 from .nodes.steps import StepMachine as StepMachine
+from .serialization import load_machine_state
 
 logger = LOGGER.bind(module=__name__)
 
@@ -36,3 +39,27 @@ def node_machine_factory(kind: ManifestKind) -> type[NodeMachine]:
         if issubclass(o, NodeMachine) and kind in o.__kind__:
             return o
     return NodeMachine
+
+
+def load_node_machine(machine: Machine, node: Node) -> NodeMachine:
+    """Rebuilds the Stateful Model of a node from its stored Machine.
+
+    A new Stateful Model is constructed for the node in its current status and
+    the attributes in the Machine's state record are restored onto it. A
+    legacy Machine stored as a pickle is unpickled instead; it is replaced by
+    a state record the next time the machine is stored after a transition.
+    """
+    node_machine: NodeMachine
+    if machine.record is not None:
+        state_record = load_machine_state(machine.record)
+        node_machine = node_machine_factory(node.kind)(o=node, initial_state=node.status)
+        for name, value in state_record.attributes.items():
+            setattr(node_machine, name, value)
+    elif machine.state is not None:
+        logger.debug("Loading legacy pickled machine", id=str(node.id))
+        node_machine = (pickle.loads(machine.state)).model
+        node_machine.db_model = node
+        node_machine.state = node.status
+    else:
+        node_machine = node_machine_factory(node.kind)(o=node, initial_state=node.status)
+    return node_machine
@@ -4,10 +4,9 @@ from __future__ import annotations
 
 from collections import ChainMap
 from os.path import expandvars
-from types import ModuleType
 from typing import TYPE_CHECKING, Any, cast
 
-from anyio import Path, to_thread
+from anyio import Path
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from transitions import EventData
 
@@ -15,15 +14,17 @@ from lsst.cmservice.models.enums import ManifestKind, StatusEnum
 from lsst.cmservice.models.lib.parsers import as_templated_snake_case
 from lsst.cmservice.models.lib.timestamp import element_time
 from lsst.ctrl.bps import WmsRunReport, WmsStates
-from lsst.ctrl.bps.bps_reports import compile_job_summary
-from lsst.utils import doImport
 
-from ...common.bash import parse_bps_stdout
+from ...common.bash import parse_bps_stdout_lines
+from ...common.bps import BPS_REPORT_SERVICE
+from ...common.butler import batch_collection_operations
+from ...common.errors import CMButlerCallError, CMNoButlerError
 from ...common.flags import Features
 from ...common.logging import LOGGER
+from ...common.logtail import LogPosition, tail_lines
 from ...config import config
 from ...handlers.functions import status_from_bps_report
-from ..lib import materialize_activity_log
+from ..lib import group_collection_removals, materialize_activity_log
 from .meta import NodeMachine
 from .mixin import FilesystemActionMixin, HTCondorLaunchMixin
 
@@ -58,6 +59,11 @@ class GroupMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin):
         - remove artifact output directory
         - Butler collections are not modified (paint-over pattern)
 
+    - reset
+        - remove artifact output directory
+        - remove the group output collection, and the run collection if it
+          holds no datasets, from Butler
+
     Failure modes may include:
         - Unwritable artifact output directory
         - Manifests insufficient to render bps workflow artifacts
@@ -340,26 +346,31 @@ class GroupMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin):
 
         logger.debug("Checking BPS stdout Log", id=str(self.db_model.id), artifact=str(bps_stdout_log))
 
-        # Call a method provided by the ActionMixin to COPY the requested file
-        # to a temporary location.
-        bps_dict: dict[str, str] = {}
-        async for bps_stdout in self.get_artifact(event, bps_stdout_log):
-            # parse the bps stdout file
-            bps_dict = await parse_bps_stdout(bps_stdout)
+        # Only the lines written since the previous check are read and merged
+        # with the bps detail dictionary parsed from any earlier lines.
+        log_offsets = self.db_model.metadata_.get("log_offsets", {})
+        position = LogPosition.from_metadata(bps_stdout_log, log_offsets.get("bps_stdout"))
+        lines, position = await tail_lines(bps_stdout_log, position)
+        bps_dict: dict[str, str] = (
+            self.db_model.metadata_.get("bps", {}) if position.count > len(lines) else {}
+        ) | parse_bps_stdout_lines(lines)
 
         if not len(bps_dict):
             logger.warning(
-                "Did not receive a BPS stdout log from ActionMixin",
+                "Did not receive a BPS stdout log",
                 id=self.db_model.id,
                 artifact=bps_stdout_log,
             )
         else:
             logger.debug(
-                "Discovered BPS Submit Directory", id=str(self.db_model.id), artifact=bps_dict["Submit dir"]
+                "Discovered BPS Submit Directory",
+                id=str(self.db_model.id),
+                artifact=bps_dict.get("Submit dir"),
             )
         # Attach the bps detail dictionary to the machine's node metadata
         new_metadata = self.db_model.metadata_.copy()
         new_metadata["bps"] = bps_dict
+        new_metadata["log_offsets"] = log_offsets | {"bps_stdout": position.to_metadata()}
         self.db_model.metadata_ = new_metadata
 
         # Create an Activity Log entry
@@ -386,21 +397,20 @@ class GroupMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin):
         if (wms_svc_class_name := self.configuration_chain["wms"].get("service_class")) is None:
             raise RuntimeError("No WMS Service Class known to machine")
 
-        if isinstance(wms_svc_class := doImport(wms_svc_class_name), ModuleType):
-            raise RuntimeError("WMS Service Class is a Module, not a BaseWmsService subclass")
-
         wms_svc_class_config: dict[str, str] = self.configuration_chain["wms"].get("service_class_config", {})
 
-        wms_svc = wms_svc_class(config=wms_svc_class_config)
-
         # BPS Status
         # Using the bps_submit_dir as a WMS Workflow ID, it must be a existing
         # directory in order for BPS to identify it properly. Specifically, the
         # status is read from a `*.dag.dagman.log` file in the submit directory
         # - This only works with a shared filesystem between CM and BPS/WMS
+        # The shared report service reuses its result until the files in the
+        # submit directory change.
         bps_status: WmsStates
         status_message: str
-        bps_status, status_message = await to_thread.run_sync(wms_svc.get_status, bps_submit_dir)
+        bps_status, status_message = await BPS_REPORT_SERVICE.get_status(
+            wms_svc_class_name, wms_svc_class_config, bps_submit_dir
+        )
 
         # TODO implement an OVERDUE check in here. This should be a simple
         # algorithm to identify long-running jobs (especially those that remain
@@ -424,14 +434,15 @@ class GroupMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin):
         # BPS Report
         run_reports: list[WmsRunReport]
         report_message: str
-        run_reports, report_message = await to_thread.run_sync(wms_svc.report, bps_submit_dir)
+        run_reports, report_message = await BPS_REPORT_SERVICE.report(
+            wms_svc_class_name, wms_svc_class_config, bps_submit_dir
+        )
 
         if len(report_message):
             logger.warning(report_message, id=str(self.db_model.id))
 
         wms_run_report = run_reports[0]
         status = status_from_bps_report(wms_run_report)
-        compile_job_summary(wms_run_report)
 
         terminal_wms_states = {WmsStates.SUCCEEDED, WmsStates.FAILED, WmsStates.PRUNED}
         if all(
@@ -516,6 +527,7 @@ class GroupMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin):
 
         # remove the BPS runtime metadata
         self.db_model.metadata_.pop("bps", None)
+        self.db_model.metadata_.pop("log_offsets", None)
 
         # increment the number of retries tracked by the node
         attempt_num = self.db_model.metadata_.get("retries", 0)
@@ -579,6 +591,24 @@ class GroupMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin):
         # increment the number of restarts tracked by the node
         self.db_model.metadata_["restarts"] = self.db_model.metadata_.get("restarts", 0) + 1
 
+    async def butler_reset(self, event: EventData) -> None:
+        """Removes the group's output collection and its run collection, if
+        the run holds no datasets, and the run collection from its step's
+        output chain, with a single batch of butler collection operations.
+
+        The removal is best-effort and a butler error does not fail the reset.
+        """
+        group_butler = self.db_model.configuration.get("butler", {})
+        operations = group_collection_removals(group_butler.get("collections", {}))
+        if (butler_repo := group_butler.get("repo")) is None:
+            return
+        try:
+            await batch_collection_operations(butler_repo, operations)
+        except CMNoButlerError:
+            logger.warning("No butler available to remove group collections", repo=butler_repo)
+        except CMButlerCallError:
+            logger.exception("Failed to remove group collections", repo=butler_repo)
+
     async def do_reset(self, event: EventData) -> None:
         """Reverts the status of a Group node from Failed to Waiting.
 
@@ -589,6 +619,11 @@ class GroupMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin):
 
         # remove the BPS runtime metadata
         self.db_model.metadata_.pop("bps", None)
+        self.db_model.metadata_.pop("log_offsets", None)
+
+        # remove the group's output collections, leaving any datasets already
+        # written to its run collection in place
+        await self.butler_reset(event)
 
         # Additionally, any artifacts created by the node should be removed,
         # and because this is not a new version of the Node, the previous
@@ -4,7 +4,6 @@ nodes, including START/END/BREAKPOINT nodes.
 
 from __future__ import annotations
 
-import pickle
 import shutil
 from typing import TYPE_CHECKING, Any
 from uuid import uuid4
@@ -12,23 +11,24 @@ from uuid import uuid4
 from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import inspect
 from sqlalchemy.orm import make_transient_to_detached
-from sqlmodel import select
 from transitions import EventData
 from transitions.extensions.asyncio import AsyncEvent, AsyncMachine
 
-from lsst.cmservice.models.db.campaigns import ActivityLog, Edge, Machine, Node
+from lsst.cmservice.models.db.campaigns import ActivityLog, Machine, Node
 from lsst.cmservice.models.enums import ManifestKind, StatusEnum
 from lsst.cmservice.models.lib import timestamp
-from lsst.cmservice.models.lib.graph import graph_from_edge_list_v2
 from lsst.cmservice.models.manifest import ButlerManifest
 
 from ...common.flags import Features
+from ...common.graph_cache import GRAPH_CACHE
 from ...common.launchers import LauncherCheckResponse
 from ...common.logging import LOGGER
+from ...common.wakeup import notify_daemon
 from ...config import config
 from ...db.session import db_session_dependency
 from ..abc import StatefulModel
 from ..lib import event_error_heuristic
+from ..serialization import dump_machine_state
 from . import TRANSITIONS
 from .mixin import FilesystemActionMixin, HTCondorLaunchMixin, NodeMixIn
 
@@ -44,6 +44,20 @@ class NodeMachine(StatefulModel):
     """
 
     __kind__ = [ManifestKind.node]
+    # The attributes, where set, that are written to the Machines table with
+    # the state record of the machine (see ``machines.serialization``).
+    __persistent__ = (
+        "configuration_chain",
+        "artifact_path",
+        "templates",
+        "launch_templates",
+        "command_templates",
+        "artifact_templates",
+        "artifact_resources",
+        "anchor_group",
+        "collect_group",
+        "collections",
+    )
 
     def __init__(
         self, *args: Any, o: Node, initial_state: StatusEnum = StatusEnum.waiting, **kwargs: Any
@@ -198,6 +212,7 @@ class NodeMachine(StatefulModel):
         await self.repatriate_node(event)
         self.db_model.status = self.state
         self.db_model.metadata_ = new_metadata
+        await notify_daemon(self.session, reason="status")
         await self.session.commit()
 
     async def flush_activity_log(self, event: EventData) -> None:
@@ -254,7 +269,7 @@ class NodeMachine(StatefulModel):
         # create or update a machine entry in the db
         if Features.STORE_FSM in config.features.enabled:
             new_machine = Machine.model_validate(
-                dict(id=self.db_model.machine or uuid4(), state=pickle.dumps(self.machine))
+                dict(id=self.db_model.machine or uuid4(), state=None, record=dump_machine_state(self))
             )
             try:
                 logger.debug("Serializing the state machine after transition.", id=str(self.db_model.id))
@@ -296,7 +311,7 @@ class NodeMachine(StatefulModel):
         )
 
         if not hasattr(self, "configuration_chain"):
-            # this can happen if the Node FSM was not pickled between trans-
+            # this can happen if the Node FSM was not stored between trans-
             # itions (see `Features.STORE_FSM`).
             # TODO reconstitute the necessary parts of the configuration chain
             #      to affect a start trigger
@@ -468,9 +483,7 @@ class EndMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchMi
         """
         # For every node in the campaign graph of kind collect_groups, discover
         # its output collection.
-        s = select(Edge).where(Edge.namespace == self.db_model.namespace)
-        edges = (await self.session.exec(s)).all()
-        graph = await graph_from_edge_list_v2(edges, self.session)
+        graph = await GRAPH_CACHE.get(self.db_model.namespace, self.session)
 
         collect_steps = [
             node[1]["model"]
@@ -21,8 +21,9 @@ from lsst.cmservice.models.manifest import LibraryManifest
 from lsst.resources import ResourcePath
 
 from ...common.errors import CMNoSuchManifestError
-from ...common.htcondor import HTCondorManager
+from ...common.htcondor import HTCONDOR_MANAGER, HTCONDOR_POLLER
 from ...common.launchers import LauncherCheckResponse
+from ...common.logtail import LogPosition
 from ...config import config
 from .. import lib
 from .abc import ActionMixIn, LaunchMixIn, MixIn
@@ -465,7 +466,7 @@ class HTCondorLaunchMixin(LaunchMixIn):
         if config.mock_status is not None:
             return
 
-        self.launch_manager = HTCondorManager()
+        self.launch_manager = HTCONDOR_MANAGER
 
         # The wms_submission_path must be set in the configuration chain
         # by the `launch_prepare` method.
@@ -478,15 +479,27 @@ class HTCondorLaunchMixin(LaunchMixIn):
         # whether the job can be sent to the local universe for immediate
         # processing on a schedd or if it should go to the vanilla universe
         # for regular scheduling (which may involve needing to allocate nodes)
-        cluster_id = await self.launch_manager.launch(submission_spec=wms_submission_path)
-        self.db_model.metadata_["wms_job"] = cluster_id
+        job = await self.launch_manager.launch(submission_spec=wms_submission_path)
+        self.db_model.metadata_["wms_job"] = job.cluster_id
+        self.db_model.metadata_["wms_schedd"] = job.schedd
+        # The logs of a new job are read from the start
+        self.db_model.metadata_["log_offsets"] = {}
 
     async def check(self, event: EventData) -> LauncherCheckResponse:
-        """Calls the check method of the launch manager."""
+        """Checks the status of the node's job as polled from its schedd by the
+        daemon, or else calls the check method of the launch manager.
+        """
         if config.mock_status is not None:
             return LauncherCheckResponse(success=(config.mock_status is StatusEnum.accepted))
 
-        self.launch_manager = HTCondorManager()
+        # TODO reduce duplication & get this from "launcher.job_id" metadata
+        cluster_id = self.db_model.metadata_.get("wms_job", 0)
+        logger.debug("Checking HTCondor Job", id=str(self.db_model.id), cluster_id=cluster_id)
+        polled = HTCONDOR_POLLER.check(cluster_id, schedd=self.db_model.metadata_.get("wms_schedd"))
+        if polled is not None:
+            return polled
+
+        self.launch_manager = HTCONDOR_MANAGER
 
         # The wms_event_log_path must be set in the configuration chain
         # by the `launch_prepare` method.
@@ -495,10 +508,12 @@ class HTCondorLaunchMixin(LaunchMixIn):
             msg = "No HTCondor event log file known to node."
             raise RuntimeError(msg)
 
-        # TODO reduce duplication & get this from "launcher.job_id" metadata
-        cluster_id = self.db_model.metadata_.get("wms_job", 0)
-        logger.debug("Checking HTCondor Job", id=str(self.db_model.id), cluster_id=cluster_id)
-        return await self.launch_manager.check(cluster_id, wms_event_log_path)
+        # The event log is read from where the previous check stopped
+        log_offsets = self.db_model.metadata_.get("log_offsets", {})
+        position = LogPosition.from_metadata(wms_event_log_path, log_offsets.get("wms_event_log"))
+        response = await self.launch_manager.check(cluster_id, wms_event_log_path, position)
+        self.db_model.metadata_["log_offsets"] = log_offsets | {"wms_event_log": position.to_metadata()}
+        return response
 
     async def launch_reset(self, event: EventData) -> None:
         """Perform a reset operation on an launch mixin.
@@ -506,4 +521,5 @@ class HTCondorLaunchMixin(LaunchMixIn):
         This should be called when the associated Node executes a callback for
         a reset trigger.
         """
+        self.db_model.metadata_.pop("log_offsets", None)
         await self.launch_unprepare(event)
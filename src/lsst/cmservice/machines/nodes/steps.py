@@ -1,21 +1,21 @@
 from __future__ import annotations
 
 from collections.abc import Generator, Mapping, Sequence
+from copy import deepcopy
 from itertools import chain
 from typing import Any, cast
 from uuid import UUID, uuid5
 
-from sqlmodel import select
+from sqlmodel import col, select
 from transitions import EventData
 
 from lsst.cmservice.models.db.campaigns import Edge, Node
 from lsst.cmservice.models.enums import ManifestKind, StatusEnum
 from lsst.cmservice.models.lib.graph import (
-    append_node_to_graph,
     delete_node_from_graph,
+    fan_out_step_groups,
     find_endpoints_in_directed_graph,
-    graph_from_edge_list_v2,
-    insert_node_to_graph,
+    graph_from_namespace,
     subgraph_between_nodes,
     topographical_sorted_collections,
 )
@@ -29,12 +29,15 @@ from lsst.cmservice.models.manifest import (
     WmsManifest,
 )
 
-from ...common.errors import CMNoSuchManifestError
+from ...common.butler import CollectionOperation, batch_collection_operations
+from ...common.errors import CMButlerCallError, CMNoButlerError, CMNoSuchManifestError
 from ...common.flags import Features
+from ...common.graph_cache import GRAPH_CACHE
+from ...common.launchers import LauncherCheckResponse
 from ...common.logging import LOGGER
 from ...common.splitter import Splitter, SplitterEnum, SplitterMapping
 from ...config import config
-from ..lib import ordinal_group_nonce
+from ..lib import group_collection_removals, ordinal_group_nonce
 from .meta import NodeMachine
 from .mixin import FilesystemActionMixin, HTCondorLaunchMixin, NodeMixIn
 
@@ -59,6 +62,8 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
     - unprepare (rollback)
         - all dynamic nodes removed from the graph. Graph is reset to its state
           before prepare was triggered.
+        - the output collections of every group removed from Butler, except
+          run collections that hold datasets
 
     Failure modes may include
         - Butler errors (can't query for group membership)
@@ -123,8 +128,8 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
         match SplitterEnum(splitter_config["split_by"]):
             case SplitterEnum.VALUES:
                 splitter_type = SplitterMapping[SplitterEnum.VALUES.value]
-            case SplitterEnum.QUERY:
-                splitter_type = SplitterMapping[SplitterEnum.QUERY.value]
+            case SplitterEnum.QUERY | SplitterEnum.DIMENSION | SplitterEnum.WEIGHTED:
+                splitter_type = SplitterMapping[splitter_config["split_by"]]
                 splitter_config["butler_label"] = self.butler.spec.repo
                 splitter_config["predicates"] = self.butler.spec.predicates
                 if self.butler.spec.collections.step_input is not None:
@@ -134,8 +139,58 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
 
         return splitter_type(**splitter_config)
 
-    async def make_group(self, with_predicates: Sequence[str], with_nonce: Generator | None) -> None:
-        """Creates a Step-Group Node in the campaign graph adjacent to self.
+    def make_group_configuration(self) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Creates the flattened configuration and metadata shared by every
+        Step-Group Node of this step.
+
+        For each campaign manifest, the Step Node's own manifest, if any, is
+        applied to create a flattened manifest to apply to the group's spec.
+        The version of the campaign manifest used to create this flattened view
+        is added to the group's metadata dictionary. The butler configuration
+        is specific to each group and is not included.
+        """
+        # FIXME this mixing of model attribute access with dict key access is
+        # not great
+
+        # The group LSST config starts with the incoming manifest combined with
+        # any step-specific configuration, without mutating either source
+        group_lsst: dict[str, Any] = self.lsst.spec.model_dump(
+            exclude_none=True, exclude={"custom_group_payload"}
+        ) | self.db_model.configuration.get("lsst", {})
+        # The group's custom payload is based on the incoming manifest extended
+        # by the step-specific configuration, again without mutating either
+        group_lsst["custom_payload"] = self.lsst.spec.custom_group_payload + group_lsst.pop(
+            "custom_group_payload", []
+        )
+
+        group_configuration = {
+            "bps": self.bps.spec.model_dump(exclude_none=True) | self.db_model.configuration.get("bps", {}),
+            "lsst": group_lsst,
+            "site": self.site.spec.model_dump(exclude_none=True)
+            | self.db_model.configuration.get("site", {}),
+            "wms": self.wms.spec.model_dump(exclude_none=True) | self.db_model.configuration.get("wms", {}),
+        }
+        group_metadata = {
+            "step": str(self.db_model.id),
+            "artifact_path": str(self.artifact_path),
+            "manifests": {
+                "butler": self.butler.metadata_.version,
+                "bps": self.bps.metadata_.version,
+                "lsst": self.lsst.metadata_.version,
+                "site": self.site.metadata_.version,
+                "wms": self.wms.metadata_.version,
+            },
+        }
+        return group_configuration, group_metadata
+
+    def make_group(
+        self,
+        with_predicates: Sequence[str],
+        with_nonce: Generator | None,
+        group_configuration: dict[str, Any],
+        group_metadata: dict[str, Any],
+    ) -> Node:
+        """Creates a Step-Group Node for the campaign graph.
 
         Parameters
         ----------
@@ -143,6 +198,15 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
             An immutable sequence, e.g., a tuple, of string predicates to
             assign to this group's predicate attribute, all of which will be
             "AND"ed together to construct the group's data query.
+
+        group_configuration : dict
+            The flattened configuration shared by every group of the step. Each
+            group is given its own copy, to which the group's butler
+            configuration is added.
+
+        group_metadata : dict
+            The metadata shared by every group of the step. Each group is given
+            its own copy, to which the group's creation time is added.
         """
         logger.info("Creating step-group node", query=with_predicates)
 
@@ -196,83 +260,24 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
                 ),
             },
         )
-        # For each campaign manifest, the Step Node's own manifest, if any, is
-        # applied to create a flattened manifest to apply to the group's spec.
-        # The version of the campaign manifest used to create this flattened
-        # view is added to the group's metadata dictionary.
-        # TODO since every group gets the same configuration spec, this should
-        # be done once per step instead of once per group. This is not true
-        # for the butler collections (above)
-        # FIXME this mixing of model attribute access with dict key access is
-        # not great
 
-        # The group LSST config starts with the incoming manifest combined with
-        # any step-specific configuration, without mutating either source
-        group_lsst: dict[str, Any] = self.lsst.spec.model_dump(
-            exclude_none=True, exclude={"custom_group_payload"}
-        ) | self.db_model.configuration.get("lsst", {})
-        # The group's custom payload is based on the incoming manifest extended
-        # by the step-specific configuration, again without mutating either
-        group_lsst["custom_payload"] = self.lsst.spec.custom_group_payload + group_lsst.pop(
-            "custom_group_payload", []
-        )
-
-        group_configuration = {
-            "butler": group_butler.model_dump(exclude_none=True),
-            "bps": self.bps.spec.model_dump(exclude_none=True) | self.db_model.configuration.get("bps", {}),
-            "lsst": group_lsst,
-            "site": self.site.spec.model_dump(exclude_none=True)
-            | self.db_model.configuration.get("site", {}),
-            "wms": self.wms.spec.model_dump(exclude_none=True) | self.db_model.configuration.get("wms", {}),
-        }
-        group_metadata = {
-            "crtime": element_time(),
-            "step": str(self.db_model.id),
-            "artifact_path": str(self.artifact_path),
-            "manifests": {
-                "butler": self.butler.metadata_.version,
-                "bps": self.bps.metadata_.version,
-                "lsst": self.lsst.metadata_.version,
-                "site": self.site.metadata_.version,
-                "wms": self.wms.metadata_.version,
-            },
-        }
-        group = Node(
+        return Node(
             id=group_id,
             name=group_name,
             namespace=self.db_model.namespace,
             version=group_version,
             kind=ManifestKind.group,
             status=group_status,
-            metadata_=group_metadata,
-            configuration=group_configuration,
+            metadata_={"crtime": element_time(), **deepcopy(group_metadata)},
+            configuration={
+                "butler": group_butler.model_dump(exclude_none=True),
+                **deepcopy(group_configuration),
+            },
         )
 
-        # add new group to session
-        self.session.add(group)
-        # add new group to graph via append, in parallel with the anchor group
-        # or via insert as the anchor group
-        if self.anchor_group is not None:
-            await append_node_to_graph(
-                node_0=self.anchor_group,
-                node_1=group_id,
-                namespace=self.db_model.namespace,
-                session=self.session,
-                commit=False,
-            )
-        else:
-            self.anchor_group = group_id
-            await insert_node_to_graph(
-                node_0=self.db_model.id,
-                node_1=group_id,
-                namespace=self.db_model.namespace,
-                session=self.session,
-                commit=False,
-            )
-
-    async def make_collect_step(self) -> None:
-        """Creates a Collect-Groups Node in the campaign graph adjacent to
-        each Step-Group.
+    def make_collect_step(self) -> Node:
+        """Creates a Collect-Groups Node for the campaign graph, which will be
+        adjacent to each Step-Group.
         """
         collect_name = f"{self.db_model.name}_collect_groups"
 
@@ -315,17 +320,7 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
             metadata_=collect_metadata,
             configuration=collect_configuration,
         )
-        self.session.add(collect)
-
-        # add collect step to graph via insert
-        await insert_node_to_graph(
-            node_0=self.db_model.id,
-            node_1=collect.id,
-            namespace=self.db_model.namespace,
-            session=self.session,
-            commit=False,
-        )
-        self.collect_group = collect.id
+        return collect
 
     async def butler_prepare(self, event: EventData) -> None:
         """Prepares a Butler operation for the step to execute during its
@@ -343,9 +338,7 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
         # A subgraph view of the Campaign from the Start to the Current Step
         # provides the set of Step Output collections we need to include in our
         # Step Input collection.
-        s = select(Edge).where(Edge.namespace == self.db_model.namespace)
-        edges = (await self.session.exec(s)).all()
-        graph = await graph_from_edge_list_v2(edges, self.session)
+        graph = await graph_from_namespace(self.db_model.namespace, self.session)
         source, _ = find_endpoints_in_directed_graph(graph)
         step_subgraph = subgraph_between_nodes(graph, source, self.db_model.id)
 
@@ -406,10 +399,10 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
         ```
         predicates: list[str]
         groups:
-          split_by: Literal["values", "query"]
+          split_by: Literal["values", "query", "dimension", "weighted"]
           field: str
           values: List[] (only if split_by == values)
-          dataset: str (only if split_by == query)
+          dataset: str (only if split_by == query, dimension or weighted)
           min_groups: int
           max_size: int
         ```
@@ -458,12 +451,33 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
         await self.butler_prepare(event)
         await self.launch_prepare(event)
 
-        await self.make_collect_step()
+        collect = self.make_collect_step()
+        group_configuration, group_metadata = self.make_group_configuration()
+        groups = [
+            self.make_group(
+                with_predicates=(predicates + (predicate,)),
+                with_nonce=nonce,
+                group_configuration=group_configuration,
+                group_metadata=group_metadata,
+            )
+            async for predicate in splitter.split()
+        ]
 
-        async for predicate in splitter.split():
-            await self.make_group(with_predicates=(predicates + (predicate,)), with_nonce=nonce)
+        # add the collect step and every group to the graph at once, with the
+        # first group serving as the anchor for the step's groups
+        await fan_out_step_groups(
+            step=self.db_model.id,
+            collect=collect,
+            groups=groups,
+            namespace=self.db_model.namespace,
+            session=self.session,
+            commit=False,
+        )
+        self.collect_group = collect.id
+        self.anchor_group = groups[0].id if groups else None
 
         await self.session.commit()
+        GRAPH_CACHE.invalidate(self.db_model.namespace)
 
         # TODO separate before/after trigger events
         await self.render_action_templates(event)
@@ -484,6 +498,13 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
             )
             group_nodes = (await self.session.exec(group_nodes_s)).all()
 
+            # Remove the output collections of every group with one batch of
+            # butler collection operations before the groups are deleted
+            group_configurations_s = select(Node.configuration).where(
+                col(Node.id).in_([*group_nodes, anchor_node.id])
+            )
+            await self.butler_unprepare(event, (await self.session.exec(group_configurations_s)).all())
+
             # TODO: Nodes should not be deleted unless they have been edited.
             for group in group_nodes:
                 await delete_node_from_graph(
@@ -518,6 +539,7 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
             )
 
         await self.session.commit()
+        GRAPH_CACHE.invalidate(self.db_model.namespace)
         self.collect_group = None
         self.anchor_group = None
 
@@ -526,6 +548,30 @@ class StepMachine(NodeMachine, NodeMixIn, FilesystemActionMixin, HTCondorLaunchM
                 f"{self.db_model.name} was rolled back via '{event.event.name}'"
             )
 
+    async def butler_unprepare(self, event: EventData, group_configurations: Sequence[Mapping]) -> None:
+        """Removes the output collections of the step's groups from the Butler
+        in a single batch of collection operations, so that groups prepared
+        again by the step may reuse their collection names. A run collection
+        that holds datasets is left in place.
+
+        The removal is best-effort and a butler error does not fail the
+        unprepare.
+        """
+        operations: list[CollectionOperation] = []
+        butler_repo = None
+        for group_configuration in group_configurations:
+            group_butler = group_configuration.get("butler", {})
+            butler_repo = group_butler.get("repo", butler_repo)
+            operations.extend(group_collection_removals(group_butler.get("collections", {})))
+        if butler_repo is None or not operations:
+            return
+        try:
+            await batch_collection_operations(butler_repo, operations)
+        except CMNoButlerError:
+            logger.warning("No butler available to remove group collections", repo=butler_repo)
+        except CMButlerCallError:
+            logger.exception("Failed to remove group collections", repo=butler_repo)
+
     async def do_finish(self, event: EventData) -> None:
         """Finish should assert as a condition that the step's butler
         collections exist and that the campaign graph is valid.
@@ -557,6 +603,8 @@ class StepCollectMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin
         - create step output chained butler collection
         - (condition) ancestor output collections exist in butler?
         - add each ancestor output collection to step output chain
+        - these chains are applied in a single batch of butler collection
+          operations rather than by a WMS job
 
     - finish
         - (condition) all ancestor output collections in chain
@@ -615,9 +663,7 @@ class StepCollectMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin
         parent_step = self.db_model.metadata_.get("step")
         if parent_step is None:
             raise RuntimeError("Collect node has no ancestor step node")
-        s = select(Edge).where(Edge.namespace == self.db_model.namespace)
-        edges = (await self.session.exec(s)).all()
-        graph = await graph_from_edge_list_v2(edges, self.session)
+        graph = await graph_from_namespace(self.db_model.namespace, self.session)
         subgraph = subgraph_between_nodes(graph, UUID(parent_step), self.db_model.id)
 
         # For every node in the sorted subgraph of kind group, find its run
@@ -662,6 +708,47 @@ class StepCollectMachine(NodeMachine, FilesystemActionMixin, HTCondorLaunchMixin
 
         self.configuration_chain["butler"] = self.configuration_chain["butler"].new_child(butler_config)
 
+    def collection_operations(self) -> list[CollectionOperation]:
+        """Returns the batch of collection operations equivalent to the step's
+        butler commands, chaining the group outputs into the step output
+        collection and the step output and input into its public output.
+        """
+        collections = self.configuration_chain["butler"]["collections"]
+        return [
+            CollectionOperation("chain", collections["step_output"], tuple(self.collections)),
+            CollectionOperation(
+                "chain",
+                collections["step_public_output"],
+                (collections["step_output"], collections["step_input"]),
+            ),
+        ]
+
+    async def launch(self, event: EventData) -> None:
+        """Applies the step's collection chains with a single batch of butler
+        collection operations in place of a WMS job.
+
+        The batch redefines each chain, so a butler manifest with a different
+        chain mode falls back to launching the rendered butler commands.
+        """
+        if self.configuration_chain["butler"]["mode"] != "redefine":
+            return await super().launch(event)
+        if config.mock_status is not None:
+            return None
+        if Features.MOCK_BUTLER not in config.features.enabled:
+            await batch_collection_operations(
+                self.configuration_chain["butler"]["repo"], self.collection_operations()
+            )
+        self.db_model.metadata_["wms_job"] = None
+        return None
+
+    async def check(self, event: EventData) -> LauncherCheckResponse:
+        """Checks a launched WMS job, if any; a batch of collection operations
+        is complete as soon as it has been launched.
+        """
+        if self.db_model.metadata_.get("wms_job", 0) is not None:
+            return await super().check(event)
+        return LauncherCheckResponse(success=True)
+
     async def do_unprepare(self, event: EventData) -> None:
         """Callback rolls the node back to a "waiting" state so the config
         and artifacts may be re-rendered.
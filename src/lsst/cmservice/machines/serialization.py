@@ -0,0 +1,150 @@
+"""Module implementing a compact, versioned serialization of Node Machines.
+
+The state of a Node Machine that must survive between transitions, such as its
+configuration chain, artifact path and templates, is written to the Machines
+table as a JSON "state record" instead of a pickle of the entire Machine. On
+load, a new Machine is constructed for the Node, with its callbacks registered
+by the current code, and the attributes in the state record are restored onto
+it.
+
+Notes
+-----
+Values that do not have a JSON equivalent, like paths, sets and tuples, are
+encoded as a tagged object, e.g., ``{"__type__": "path", "value": "/a/b"}``, so
+they are restored with their original type. Pydantic models are encoded as the
+mapping of their fields.
+
+A state record carries a schema version. Records written with an older version
+are upgraded by the functions in ``RECORD_UPGRADES`` when they are loaded, and
+records written with a newer version than known to the application are
+rejected.
+"""
+
+from collections import ChainMap
+from collections.abc import Callable, Mapping
+from enum import Enum
+from pathlib import PurePath
+from typing import Any
+from uuid import UUID
+
+from anyio import Path
+from pydantic import BaseModel, Field
+from pydantic_core import to_jsonable_python
+
+from lsst.cmservice.models.enums import ManifestKind, StatusEnum
+
+from .abc import StatefulModel
+
+MACHINE_STATE_VERSION = 1
+"""The current schema version of a Machine state record."""
+
+TYPE_TAG = "__type__"
+"""The key identifying a tagged object in an encoded state record."""
+
+RECORD_UPGRADES: dict[int, Callable[[dict[str, Any]], dict[str, Any]]] = {}
+"""A mapping of state record schema versions to a function that upgrades a
+record from that version to the next.
+"""
+
+
+class MachineStateRecord(BaseModel):
+    """A versioned record of the state needed to rebuild a Node Machine."""
+
+    version: int = Field(default=MACHINE_STATE_VERSION, description="The schema version of the record")
+    kind: ManifestKind = Field(description="The kind of the Node for which the Machine was built")
+    state: StatusEnum = Field(description="The state of the Machine when the record was written")
+    attributes: dict[str, Any] = Field(
+        default_factory=dict, description="The encoded persistent attributes of the Stateful Model"
+    )
+
+
+def encode_value(value: Any) -> Any:
+    """Encodes a value as a JSON-compatible object, tagging values of types
+    that would not otherwise survive a round trip through JSON.
+    """
+    match value:
+        case None | bool() | int() | float() | str():
+            return value
+        case Enum():
+            return encode_value(value.value)
+        case Path() | PurePath():
+            return {TYPE_TAG: "path", "value": str(value)}
+        case UUID():
+            return {TYPE_TAG: "uuid", "value": str(value)}
+        case ChainMap():
+            return {TYPE_TAG: "chainmap", "value": [encode_value(m) for m in value.maps]}
+        case BaseModel():
+            return encode_value(value.model_dump(by_alias=True))
+        case Mapping():
+            return {str(k): encode_value(v) for k, v in value.items()}
+        case set() | frozenset():
+            return {TYPE_TAG: "set", "value": [encode_value(v) for v in value]}
+        case tuple():
+            return {TYPE_TAG: "tuple", "value": [encode_value(v) for v in value]}
+        case list():
+            return [encode_value(v) for v in value]
+        case _:
+            return to_jsonable_python(value)
+
+
+def decode_value(value: Any) -> Any:
+    """Decodes a value encoded by `encode_value`."""
+    match value:
+        case {"__type__": "path", "value": str() as path}:
+            return Path(path)
+        case {"__type__": "uuid", "value": str() as uuid}:
+            return UUID(uuid)
+        case {"__type__": "chainmap", "value": list() as maps}:
+            return ChainMap(*[decode_value(m) for m in maps])
+        case {"__type__": "set", "value": list() as members}:
+            return {decode_value(v) for v in members}
+        case {"__type__": "tuple", "value": list() as members}:
+            return tuple(decode_value(v) for v in members)
+        case dict():
+            return {k: decode_value(v) for k, v in value.items()}
+        case list():
+            return [decode_value(v) for v in value]
+        case _:
+            return value
+
+
+def dump_machine_state(model: StatefulModel) -> dict[str, Any]:
+    """Returns the state record of a Stateful Model as a JSON-compatible
+    mapping, including only those of the model's ``__persistent__`` attributes
+    that are set on the model.
+    """
+    record = MachineStateRecord(
+        kind=model.db_model.kind if hasattr(model.db_model, "kind") else ManifestKind.other,
+        state=model.state,
+        attributes={
+            name: encode_value(getattr(model, name)) for name in model.__persistent__ if hasattr(model, name)
+        },
+    )
+    return record.model_dump(mode="json")
+
+
+def load_machine_state(record: Mapping[str, Any]) -> MachineStateRecord:
+    """Validates a state record, upgrading it to the current schema version as
+    needed, and decodes its attributes.
+
+    Raises
+    ------
+    ValueError
+        Raised when the record was written with a schema version newer than
+        the current version or for which there is no upgrade.
+    """
+    data = dict(record)
+    version = data.get("version", MACHINE_STATE_VERSION)
+    if version > MACHINE_STATE_VERSION:
+        msg = f"Machine state record version {version} is newer than {MACHINE_STATE_VERSION}"
+        raise ValueError(msg)
+    while version < MACHINE_STATE_VERSION:
+        if (upgrade := RECORD_UPGRADES.get(version)) is None:
+            msg = f"No upgrade available for machine state record version {version}"
+            raise ValueError(msg)
+        data = upgrade(data)
+        version = data["version"]
+
+    state_record = MachineStateRecord.model_validate(data)
+    state_record.attributes = {k: decode_value(v) for k, v in state_record.attributes.items()}
+    return state_record
@@ -2,8 +2,6 @@
 API routes.
 """
 
-import pickle
-
 from transitions.core import MachineError
 
 from lsst.cmservice.models.db.campaigns import Campaign, Node
@@ -11,7 +9,7 @@ from lsst.cmservice.models.enums import StatusEnum
 
 from ..common.logging import LOGGER
 from .campaign import CampaignMachine
-from .node import NodeMachine, node_machine_factory
+from .node import NodeMachine, load_node_machine, node_machine_factory
 
 logger = LOGGER.bind(module=__name__)
 
@@ -84,14 +82,14 @@ async def change_node_state(
         force=force,
     )
 
+    node_machine: NodeMachine
     if node.fsm is not None:
-        node_machine: NodeMachine = (pickle.loads(node.fsm.state)).model
-        node_machine.db_model = node
+        node_machine = load_node_machine(node.fsm, node)
     elif node.status is StatusEnum.waiting:
         # create a new machine for the node
         node_machine = node_machine_factory(node.kind)(o=node, initial_state=node.status)
     else:
-        raise RuntimeError("Cannot change node state without a pickled machine except from waiting")
+        raise RuntimeError("Cannot change node state without a stored machine except from waiting")
 
     trigger: str
     match (node.status, desired_state):
@@ -1,9 +1,17 @@
 from asyncio import Task
+from dataclasses import asdict
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
 
 from .. import __version__
+from ..common.bps import BPS_REPORT_SERVICE
+from ..common.butler import BUTLER_FACTORY
+from ..common.compaction import COMPACTION_STATS
+from ..common.error_classifier import ERROR_CLASSIFIER
+from ..common.graph_cache import GRAPH_CACHE
+from ..common.htcondor import HTCONDOR_MANAGER, HTCONDOR_POLLER
+from ..common.manifest_cache import MANIFEST_CACHE
 from ..config import config
 
 health_router = APIRouter()
@@ -25,7 +33,18 @@ async def get_healthz(request: Request) -> dict:
     relevant exception information if the task has ended.
     """
     server_ok = True
-    healthz_response: dict[str, Any] = dict(name=config.asgi.title, version=__version__)
+    healthz_response: dict[str, Any] = dict(
+        name=config.asgi.title,
+        version=__version__,
+        graph_cache=GRAPH_CACHE.stats(),
+        manifest_cache=MANIFEST_CACHE.stats(),
+        compaction=asdict(COMPACTION_STATS),
+        butler_factory=BUTLER_FACTORY.stats(),
+        htcondor_manager=HTCONDOR_MANAGER.stats(),
+        bps_reports=BPS_REPORT_SERVICE.stats(),
+        error_classifier=ERROR_CLASSIFIER.stats(),
+        htcondor_poller=HTCONDOR_POLLER.stats(),
+    )
 
     task: Task
     for task in request.app.state.tasks:
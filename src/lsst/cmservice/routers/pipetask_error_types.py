@@ -1,8 +1,11 @@
 """http routers for managing PipetaskErrorType tables"""
 
-from fastapi import APIRouter
+from collections.abc import AsyncGenerator
+
+from fastapi import APIRouter, Depends, Request
 
 from .. import models_
+from ..common.error_classifier import ERROR_CLASSIFIER
 from ..db import legacy
 from . import wrappers
 
@@ -17,10 +20,20 @@ UpdateModelClass = models_.PipetaskErrorTypeUpdate
 DbClass = legacy.PipetaskErrorType
 
 
+async def invalidate_error_classifier(request: Request) -> AsyncGenerator[None]:
+    """Invalidate the pipetask error classifier after a request that may have
+    changed the error types.
+    """
+    yield
+    if request.method != "GET":
+        ERROR_CLASSIFIER.invalidate()
+
+
 # Build the router
 router = APIRouter(
     prefix=f"/{DbClass.class_string}",
     tags=["pipetask error types"],
+    dependencies=[Depends(invalidate_error_classifier)],
 )
 
 
@@ -5,7 +5,7 @@ representing campaign objects within CM-Service.
 """
 
 from collections.abc import Mapping, Sequence
-from typing import TYPE_CHECKING, Annotated, Literal, cast
+from typing import TYPE_CHECKING, Annotated, Literal
 from uuid import UUID, uuid5
 
 from asgi_correlation_id import correlation_id
@@ -22,11 +22,12 @@ from fastapi import (
     status,
 )
 from pydantic import UUID5
+from sqlalchemy import exists
 from sqlalchemy.dialects.postgresql import INTEGER
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.orm import aliased
 from sqlmodel import cast as sqlcast
-from sqlmodel import col, distinct, func, select
+from sqlmodel import col, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from lsst.cmservice.models.api.manifests import CampaignManifest, ManifestRequest
@@ -43,12 +44,12 @@ from lsst.cmservice.models.db.campaigns import (
 from lsst.cmservice.models.enums import DEFAULT_NAMESPACE, ManifestKind, StatusEnum
 from lsst.cmservice.models.lib.graph import (
     append_node_to_graph,
-    graph_from_edge_list_v2,
     graph_to_dict,
     insert_node_to_graph,
 )
 from lsst.cmservice.models.lib.timestamp import element_time
 
+from ...common.graph_cache import GRAPH_CACHE
 from ...common.logging import LOGGER
 from ...db.session import db_session_dependency
 from ...machines.tasks import change_campaign_state
@@ -109,6 +110,21 @@ async def read_campaign_collection(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"{str(msg)}") from msg
 
 
+@router.get(
+    "/summary",
+    summary="Get the summaries of many campaigns",
+)
+async def read_campaign_summary_collection(
+    session: Annotated[AsyncSession, Depends(db_session_dependency)],
+    campaign_id: Annotated[list[UUID5], Query(max_length=100)],
+) -> Sequence[CampaignSummary]:
+    """Read the summary resources of a set of campaigns given by one or more
+    ``campaign_id`` query parameters, in the order given. A campaign that does
+    not exist is omitted.
+    """
+    return await summarize_campaigns(session, campaign_id)
+
+
 @router.get(
     "/{campaign_name_or_id}",
     response_model=Campaign,
@@ -155,6 +171,58 @@ async def read_campaign_resource(
         return campaign
 
 
+async def summarize_campaigns(session: AsyncSession, campaign_ids: Sequence[UUID]) -> list[CampaignSummary]:
+    """Build the summaries of a set of campaigns, in the order of their ids,
+    omitting any campaign that does not exist.
+
+    The campaigns and the count of their nodes in each state are read by two
+    queries. The nodes are grouped by campaign and status on their own, and a
+    campaign's nodes are only counted if the campaign has any edges, which
+    avoids joining every edge of a campaign to every one of its nodes.
+    """
+    campaign_ids = list(dict.fromkeys(campaign_ids))
+    s = select(  # type: ignore[call-overload]
+        col(Campaign.id),
+        col(Campaign.name),
+        col(Campaign.owner),
+        col(Campaign.metadata_),
+        col(Campaign.status),
+    ).where(col(Campaign.id).in_(campaign_ids))
+    summaries: dict[UUID, CampaignSummary] = {
+        row._mapping["id"]: CampaignSummary(
+            **{f: row._mapping[f] for f in row._mapping.keys() if f in Campaign.model_fields}
+        )
+        for row in await session.execute(s)
+    }
+    if not summaries:
+        return []
+
+    # The summary will only report Node Status Summary for Campaign Nodes that
+    # are part of the Campaign Graph, so if there are no edges in the campaign,
+    # there will be none.
+    s = (
+        select(
+            col(Node.namespace),
+            col(Node.status).label("node_status"),
+            func.count(col(Node.id)).label("node_count"),
+            func.max(sqlcast(Node.metadata_["mtime"], INTEGER)).label("node_mtime"),
+        )
+        .where(col(Node.namespace).in_(list(summaries)))
+        .where(exists().where(col(Edge.namespace) == col(Node.namespace)))
+        .group_by(col(Node.namespace), col(Node.status))
+        .order_by(col(Node.namespace), col(Node.status))
+    )
+    for row in await session.execute(s):
+        summaries[row._mapping["namespace"]].node_summary.append(
+            NodeStatusSummary(
+                status=row._mapping["node_status"],
+                count=row._mapping["node_count"],
+                mtime=row._mapping["node_mtime"],
+            )
+        )
+    return [summaries[campaign_id] for campaign_id in campaign_ids if campaign_id in summaries]
+
+
 @router.get(
     "/{campaign_id}/summary",
     summary="Get campaign summary",
@@ -169,75 +237,10 @@ async def read_campaign_summary(
     information together with a count of active (i.e., in-graph) campaign nodes
     by status.
     """
-    # FIXME this might be more effective as separate queries, one for the
-    # campaign and a follow-up for the nodes / logs /etc. The single-query
-    # join approach would be better served by a data structure that supports
-    # a pivot operation, either with "crosstab" in the query or with a pandas
-    # dataframe with the result. The approach used here, where the raw result
-    # set is iterated in a way to "correctly" construct the response model,
-    # is a bit contrived.
-
-    # support a "summary" view that produces the count of nodes in each state
-    # select
-    #  cm.id, cm.name, cm.owner, cm.metadata, cm.status,
-    #  nd.status as node_status,
-    #  count(distinct nd.id) as node_count
-    # from campaigns_v2 cm
-    # join edges_v2 ed on cm.id=ed.namespace
-    # join nodes_v2 nd on ed.namespace=nd.namespace
-    # where cm.id = {campaign_id}
-    # group by cm.id, nd.status
-    s = (
-        select(  # type: ignore[call-overload]
-            col(Campaign.id),
-            col(Campaign.name),
-            col(Campaign.owner),
-            col(Campaign.metadata_),
-            col(Campaign.status),
-            col(Node.status).label("node_status"),
-            func.count(distinct(col(Edge.id))).label("edge_count"),
-            func.count(distinct(col(Node.id))).label("node_count"),
-            func.max(sqlcast(Node.metadata_["mtime"], INTEGER)).label("node_mtime"),
-        )
-        .outerjoin(Edge, col(Campaign.id) == Edge.namespace)
-        .outerjoin(Node, col(Edge.namespace) == Node.namespace)
-        .where(Campaign.id == campaign_id)
-        .group_by(col(Campaign.id), col(Node.status))
-    )
-    r = await session.execute(s)
-    try:
-        first = next(r)
-    except StopIteration:
+    summaries = await summarize_campaigns(session, [campaign_id])
+    if not summaries:
         raise HTTPException(status_code=404, detail="Campaign not found.")
-
-    campaign_summary = CampaignSummary(
-        **{
-            f: first._mapping[f]
-            for f in cast(str, filter(lambda x: x in Campaign.model_fields, first._mapping))
-        },
-    )
-
-    # The summary will only report Node Status Summary for Campaign Nodes that
-    # are part of the Campaign Graph, so if there are no edges in the campaign,
-    # there will be none.
-    if first._mapping["edge_count"] > 0:
-        campaign_summary.node_summary.append(
-            NodeStatusSummary(
-                status=first._mapping["node_status"],
-                count=first._mapping["node_count"],
-                mtime=first._mapping["node_mtime"],
-            )
-        )
-
-    for row in r:
-        campaign_summary.node_summary.append(
-            NodeStatusSummary(
-                status=row._mapping["node_status"],
-                count=row._mapping["node_count"],
-                mtime=row._mapping["node_mtime"],
-            )
-        )
-    return campaign_summary
+    return summaries[0]
 
 
 @router.patch(
@@ -623,13 +626,10 @@ async def read_campaign_graph(
     if campaign_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No such campaign found.")
 
-    # Fetch the Edges for the campaign
-    statement = select(Edge).filter_by(namespace=campaign_id)
-    edges = (await session.exec(statement)).all()
-
-    # Organize the edges into a graph. The graph nodes are annotated with their
-    # current database attributes according to the "simple" node view.
-    graph = await graph_from_edge_list_v2(edges=edges, node_type=Node, session=session, node_view="simple")
+    # Organize the campaign's edges into a graph. The graph nodes are annotated
+    # with their current database attributes according to the "simple" node
+    # view.
+    graph = await GRAPH_CACHE.get(campaign_id, session=session, node_view="simple")
 
     response.headers["Self"] = str(request.url_for("read_campaign_resource", campaign_name_or_id=campaign_id))
     return graph_to_dict(graph)
@@ -822,6 +822,7 @@ async def update_node_in_graph(
         case _:
             # not possible due to pydantic validation
             raise HTTPException(status.HTTP_422_UNPROCESSABLE_CONTENT)
+    GRAPH_CACHE.invalidate(campaign_id)
 
     response.headers["Edges"] = str(request.url_for("read_campaign_edge_collection", campaign_id=campaign.id))
     response.headers["Graph"] = str(request.url_for("read_campaign_graph", campaign_name=campaign.id))
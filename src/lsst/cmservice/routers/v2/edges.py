@@ -15,6 +15,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from lsst.cmservice.models.api.manifests import EdgeManifest
 from lsst.cmservice.models.db.campaigns import Campaign, Edge
 
+from ...common.graph_cache import GRAPH_CACHE
 from ...common.logging import LOGGER
 from ...db.session import db_session_dependency
 
@@ -176,6 +177,7 @@ async def create_edge_resource(
     # id already exist
     edge = await session.merge(edge, load=True)
     await session.commit()
+    GRAPH_CACHE.invalidate(edge_namespace_uuid)
 
     response.headers["Self"] = request.url_for("read_edge_resource", edge_name=edge.id).__str__()
     response.headers["Source"] = request.url_for("read_node_resource", node_name=edge.source).__str__()
@@ -207,6 +209,8 @@ async def delete_edge_resource(
     if edge_to_delete is None:
         raise HTTPException(status_code=404, detail="No such edge.")
 
+    edge_namespace = edge_to_delete.namespace
     await session.delete(edge_to_delete)
     await session.commit()
+    GRAPH_CACHE.invalidate(edge_namespace)
     return None
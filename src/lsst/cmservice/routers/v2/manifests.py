@@ -25,6 +25,7 @@ from lsst.cmservice.models.lib.jsonpatch import JSONPatch, JSONPatchError, apply
 from lsst.cmservice.models.lib.timestamp import element_time
 
 from ...common.logging import LOGGER
+from ...common.manifest_cache import MANIFEST_CACHE
 from ...db.session import db_session_dependency
 
 # TODO should probably bind a logger to the fastapi app or something
@@ -127,6 +128,7 @@ async def create_one_or_more_manifests(
     if not isinstance(manifests, list):
         manifests = [manifests]
 
+    namespaces: set[UUID] = set()
     for manifest in manifests:
         _name = manifest.metadata_.name
 
@@ -186,8 +188,11 @@ async def create_one_or_more_manifests(
 
         # Put the node in the database
         session.add(_manifest)
+        namespaces.add(_namespace_uuid)
 
     await session.commit()
+    for namespace in namespaces:
+        MANIFEST_CACHE.invalidate(namespace)
 
     response.headers["Self"] = str(request.url_for("read_single_manifest", manifest_name_or_id=_id))
     return None
@@ -291,6 +296,7 @@ async def update_manifest_resource(
     new_manifest_db = Manifest.model_validate(new_manifest)
     session.add(new_manifest_db)
     await session.commit()
+    MANIFEST_CACHE.invalidate(new_manifest_db.namespace)
 
     response.headers["Self"] = str(
         request.url_for("read_single_manifest", manifest_name_or_id=new_manifest_db.id)
@@ -327,6 +333,7 @@ async def copy_manifest_resource(
     try:
         session.add(manifest)
         await session.commit()
+        MANIFEST_CACHE.invalidate(namespace_copy_target)
     except IntegrityError:
         # A nonexistent target namespace will raise a FK violation error
         raise HTTPException(
@@ -359,6 +366,7 @@ async def delete_manifest_resource(
 
     await session.delete(manifest)
     await session.commit()
+    MANIFEST_CACHE.invalidate(manifest.namespace)
 
     audit = AuditLog(
         actor=actor,
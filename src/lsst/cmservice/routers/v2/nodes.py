@@ -295,7 +295,7 @@ async def update_node_resource(
             assert isinstance(patch_data, CampaignUpdate)
         if patch_data.status is None:
             raise HTTPException(status_code=422, detail="When using RFC7396, a status must be supplied")
-        # Lazy-load the Node's Machine pickle
+        # Lazy-load the Node's stored Machine
         if (await old_manifest.awaitable_attrs.fsm) is None:
             logger.warning("No state machine found for node", node_id=node_id)
 
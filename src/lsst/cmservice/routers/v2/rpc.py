@@ -15,6 +15,7 @@ from lsst.cmservice.models.lib.graph import processable_graph_nodes
 
 from ...common.daemon_v2 import assemble_campaign_graph, daemon_consider_campaign, daemon_process_node
 from ...common.logging import LOGGER
+from ...common.wakeup import notify_daemon
 from ...db.session import db_session_dependency
 
 logger = LOGGER.bind(module=__name__)
@@ -124,6 +125,7 @@ async def rpc_process_campaign_or_node(
         case _:
             raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Not yet implemented.")
 
+    await notify_daemon(session, reason="process")
     await session.commit()
 
     response.headers["StatusUpdate"] = (
@@ -0,0 +1,64 @@
+"""Tests for the shared BPS report service."""
+
+import os
+
+import pytest
+from anyio import Path
+
+from lsst.cmservice.common import bps
+from lsst.ctrl.bps import WmsStates
+
+
+class FakeWmsService:
+    """A WMS service counting its calls."""
+
+    instances = 0
+
+    def __init__(self, config: dict) -> None:
+        FakeWmsService.instances += 1
+        self.status_calls = 0
+        self.report_calls = 0
+
+    def get_status(self, wms_workflow_id: str) -> tuple[WmsStates, str]:
+        self.status_calls += 1
+        return WmsStates.RUNNING, ""
+
+    def report(self, wms_workflow_id: str) -> tuple[list, str]:
+        self.report_calls += 1
+        return [], f"report {self.report_calls}"
+
+
+@pytest.mark.asyncio()
+async def test_bps_report_service(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that the report service shares WMS services and reuses results
+    until the submit directory changes.
+    """
+    monkeypatch.setattr(bps, "doImport", lambda _: FakeWmsService)
+    service = bps.BpsReportService(maxsize=8)
+    submit_dir = str(tmp_path)
+    await (Path(tmp_path) / "u_test.dag.dagman.log").write_text("start\n")
+
+    status, _ = await service.get_status("fake.Service", {}, submit_dir)
+    assert status is WmsStates.RUNNING
+    _, message = await service.report("fake.Service", {}, submit_dir)
+    _, message = await service.report("fake.Service", {}, submit_dir)
+    assert message == "report 1"
+    assert FakeWmsService.instances == 1
+    assert service.stats()["hits"] == 1
+
+    # a change to the files of the submit directory invalidates the result
+    dagman_log = Path(tmp_path) / "u_test.dag.dagman.log"
+    await dagman_log.write_text("start\nmore\n")
+    mtime = (await dagman_log.stat()).st_mtime_ns + 1_000_000
+    os.utime(dagman_log, ns=(mtime, mtime))
+    _, message = await service.report("fake.Service", {}, submit_dir)
+    assert message == "report 2"
+
+    # a workflow id that is not a directory is never cached
+    await service.get_status("fake.Service", {}, "/no/such/submit/dir")
+    await service.get_status("fake.Service", {}, "/no/such/submit/dir")
+    assert service.get_service("fake.Service", {}).status_calls == 3
+
+    # another service config makes another service instance
+    service.get_service("fake.Service", {"site": "s3df"})
+    assert FakeWmsService.instances == 2
@@ -5,9 +5,12 @@ from typing import Any
 import pytest
 import yaml
 
-from lsst.cmservice.common.butler import ButlerFactory
-from lsst.daf.butler import Butler
-from lsst.daf.butler.tests import makeTestRepo
+from lsst.cmservice.common.butler import ButlerFactory, CollectionOperation, batch_collection_operations
+from lsst.cmservice.common.errors import CMButlerCallError, CMNoButlerError
+from lsst.cmservice.config import config
+from lsst.cmservice.machines.lib import group_collection_removals
+from lsst.daf.butler import Butler, CollectionType  # type: ignore[attr-defined]
+from lsst.daf.butler.tests import addDatasetType, makeTestRepo
 
 
 @pytest.fixture()
@@ -125,3 +128,120 @@ async def test_async_butler(mock_butler_repo: Any, mock_db_auth: Any) -> None:
 
     b = await bf.aget_butler("/repo/mock", collections=None)
     assert isinstance(b, Butler)
+
+
+@pytest.mark.asyncio()
+async def test_butler_pool(mock_butler_repo: Any, mock_db_auth: Any, monkeypatch: Any) -> None:
+    """Test that leased butler clones are pooled, health-checked and reused."""
+    monkeypatch.setattr(config.butler, "pool_size", 1)
+    bf = ButlerFactory()
+    construction_seconds = bf.stats()["construction_seconds"]
+
+    async with bf.lease("/repo/mock") as b1, bf.lease("/repo/mock", collections=["foo"]) as b2:
+        assert isinstance(b1, Butler)
+        assert b1 is not b2
+        assert tuple(b2.registry.defaults.collections) == ("foo",)
+    stats = bf.stats()
+    assert stats["clones"] == 2
+    assert stats["pooled"] == {"/repo/mock": 1}
+    assert stats["discards"] == 1  # the pool only has room for one clone
+    assert stats["construction_seconds"] >= construction_seconds
+
+    # the pooled clone is reused with new default collections
+    async with bf.lease("/repo/mock", collections=["bar"]) as b3:
+        assert b3 in (b1, b2)
+        assert tuple(b3.registry.defaults.collections) == ("bar",)
+    assert bf.stats()["reuses"] == 1
+    assert ButlerFactory.is_healthy(b3)
+
+    # a clone that fails its health check is discarded instead of reused
+    monkeypatch.setattr(ButlerFactory, "is_healthy", staticmethod(lambda butler: False))
+    async with bf.lease("/repo/mock") as b4:
+        assert b4 is not b3
+    assert bf.stats()["reuses"] == 1
+    assert bf.stats()["clones"] == 3
+
+    # an unknown repo cannot be leased
+    with pytest.raises(CMNoButlerError):
+        async with bf.lease("no/such/repo"):
+            pass
+
+
+@pytest.mark.asyncio()
+async def test_batch_collection_operations(
+    mock_butler_repo: Any, mock_db_auth: Any, monkeypatch: Any
+) -> None:
+    """Test that a batch of collection operations is applied in a single
+    transaction.
+    """
+    bf = ButlerFactory()
+    monkeypatch.setattr("lsst.cmservice.common.butler.BUTLER_FACTORY", bf)
+    factory = bf.get_butler_factory("/repo/mock", writeable=True)
+    assert factory is not None
+    butler = factory(collections=None)
+    for run in ("step/group_1/version_1", "step/group_2/version_1"):
+        butler.collections.register(run)
+    butler.collections.register("step/group_1", CollectionType.CHAINED)
+    butler.collections.redefine_chain("step/group_1", ["step/group_1/version_1"])
+
+    await batch_collection_operations(
+        "/repo/mock",
+        [
+            CollectionOperation("chain", "step_output", ("step/group_1/version_1", "step/group_2/version_1")),
+            CollectionOperation("chain", "step", ("step_output",)),
+        ],
+    )
+    assert list(butler.collections.get_info("step_output").children) == [
+        "step/group_1/version_1",
+        "step/group_2/version_1",
+    ]
+
+    # removing a group's collections is idempotent
+    removals = group_collection_removals(
+        {"run": "step/group_1/version_1", "group_output": "step/group_1", "step_output": "step_output"}
+    )
+    await batch_collection_operations("/repo/mock", removals)
+    await batch_collection_operations("/repo/mock", removals)
+    assert list(butler.collections.get_info("step_output").children) == ["step/group_2/version_1"]
+    assert not butler.collections.query("step/group_1*")
+
+    # a failed operation rolls back the whole batch
+    with pytest.raises(CMButlerCallError):
+        await batch_collection_operations(
+            "/repo/mock",
+            [
+                CollectionOperation("remove", "step"),
+                CollectionOperation("chain", "step_output", ("no/such/collection",)),
+            ],
+        )
+    assert butler.collections.query("step")
+    assert list(butler.collections.get_info("step_output").children) == ["step/group_2/version_1"]
+
+
+@pytest.mark.asyncio()
+async def test_batch_collection_operations_keep_datasets(
+    tmp_path: Path, mock_butler_repo: Any, mock_db_auth: Any, monkeypatch: Any
+) -> None:
+    """Test that a RUN collection holding datasets is not removed by a batch
+    of collection operations, while the group's other collections are.
+    """
+    bf = ButlerFactory()
+    monkeypatch.setattr("lsst.cmservice.common.butler.BUTLER_FACTORY", bf)
+    butler = Butler.from_config(str(tmp_path / "repo" / "mock"), writeable=True)
+    addDatasetType(butler, "group_metadata", set(), "StructuredDataDict")
+    butler.collections.register("step/group_1/version_1")
+    dataset_ref = butler.put({"quanta": 1}, "group_metadata", run="step/group_1/version_1")
+    butler.collections.register("step/group_1", CollectionType.CHAINED)
+    butler.collections.redefine_chain("step/group_1", ["step/group_1/version_1"])
+    butler.collections.register("step_output", CollectionType.CHAINED)
+    butler.collections.redefine_chain("step_output", ["step/group_1/version_1"])
+
+    removals = group_collection_removals(
+        {"run": "step/group_1/version_1", "group_output": "step/group_1", "step_output": "step_output"}
+    )
+    await batch_collection_operations("/repo/mock", removals)
+
+    # the run and its dataset remain, but are no longer chained
+    assert butler.collections.query("step/group_1*") == ["step/group_1/version_1"]
+    assert not butler.collections.get_info("step_output").children
+    assert butler.get(dataset_ref) == {"quanta": 1}
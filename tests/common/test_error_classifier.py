@@ -0,0 +1,49 @@
+"""Tests for the compiled pipetask error classifier."""
+
+import re
+
+from lsst.cmservice.common.error_classifier import ErrorClassifier
+
+ERROR_TYPES = [
+    (1, "isr", "Error A.*"),
+    (2, ".*", "Error.*"),
+    (3, "isr", "Err(or) B"),
+    (4, "calibrate", r"(x)\1"),
+    (5, "bad(", "x"),
+    (6, " isr ", "(?i)foo "),
+]
+
+
+def first_match(task_name: str, diagnostic_message: str) -> int | None:
+    """Match error types one at a time, as ``PipetaskErrorType.match`` does."""
+    for error_type_id, task_pattern, message_pattern in ERROR_TYPES:
+        try:
+            if re.match(task_pattern.strip(), task_name.strip()) and re.match(
+                message_pattern.strip(), diagnostic_message.strip()
+            ):
+                return error_type_id
+        except re.error:
+            continue
+    return None
+
+
+def test_error_classifier() -> None:
+    """Test that the classifier matches the same error type as matching the
+    error types one at a time in order.
+    """
+    classifier = ErrorClassifier()
+    classifier.build(ERROR_TYPES)
+    assert classifier.stats()["groups"] == 4
+
+    cases = [
+        ("isr", "Error A happened"),
+        ("isr", "Error B"),
+        ("deblend", "Error B"),
+        ("calibrate", "xx"),
+        ("calibrate", "Error"),
+        ("isr", " FOO"),
+        ("isr", "nothing known"),
+    ]
+    for task_name, message in cases:
+        assert classifier.classify(task_name, message) == first_match(task_name, message)
+    assert classifier.stats()["unmatched"] == 1
@@ -0,0 +1,53 @@
+"""Tests for the incremental reading of log files."""
+
+import pytest
+from anyio import Path
+
+from lsst.cmservice.common.bash import get_diagnostic_message
+from lsst.cmservice.common.logtail import LogPosition, last_line, tail_lines
+
+
+@pytest.mark.asyncio()
+async def test_tail_lines(tmp_path: Path) -> None:
+    """Test that only complete lines written since a position are read."""
+    log = Path(tmp_path) / "bps_stdout.log"
+    await log.write_text("Submit dir: /submit\nRun Id: 1")
+
+    position = LogPosition.from_metadata(log, None)
+    lines, position = await tail_lines(log, position)
+    assert lines == ["Submit dir: /submit"]
+    assert position.count == 1
+
+    # the incomplete line is read again once it is complete
+    await log.write_text("Submit dir: /submit\nRun Id: 1234\nRun Name: u_test\n")
+    position = LogPosition.from_metadata(log, position.to_metadata())
+    lines, position = await tail_lines(log, position)
+    assert lines == ["Run Id: 1234", "Run Name: u_test"]
+    assert position.count == 3
+    lines, position = await tail_lines(log, position)
+    assert lines == []
+
+    # a rewritten, shorter log is read from the start
+    await log.write_text("Submit dir: /other\n")
+    lines, position = await tail_lines(log, position)
+    assert lines == ["Submit dir: /other"]
+    assert position.count == 1
+
+    # the position of another log is not used
+    assert LogPosition.from_metadata(tmp_path, position.to_metadata()).offset == 0
+
+
+@pytest.mark.asyncio()
+async def test_last_line(tmp_path: Path) -> None:
+    """Test that the last line of a file is read from its end."""
+    log = Path(tmp_path) / "script.log"
+    await log.write_text("")
+    assert await last_line(log) is None
+    assert await get_diagnostic_message(log) == "ERROR Empty log file"
+
+    await log.write_text("first\n" + "x" * 10 + "\nlast line\n")
+    assert await last_line(log, block_size=4) == "last line"
+    await log.write_text("only line")
+    assert await last_line(log, block_size=4) == "only line"
+    await log.write_text("first\n\n")
+    assert await last_line(log, block_size=4) == ""
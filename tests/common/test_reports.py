@@ -0,0 +1,38 @@
+"""Tests for the parsing of pipetask reports."""
+
+import pytest
+from anyio import Path
+
+from lsst.cmservice.common.errors import CMYamlParseError
+from lsst.cmservice.common.reports import load_manifest_summary, parse_manifest_report
+from lsst.cmservice.config import config
+
+
+def test_parse_manifest_report() -> None:
+    """Test that a pipetask report is summarized by task."""
+    summaries = {s.name: s for s in parse_manifest_report("examples/manifest_report_fail_error.yaml")}
+    assert len(summaries) == 6
+
+    failed = summaries["diff_matched_analysis"]
+    assert failed.n_failed == 1
+    assert failed.failed_quanta[0].quanta == "097fdd32-950f-49e3-9406-10ee1e2f7ac2"
+    assert failed.failed_quanta[0].data_id["tract"] == 3828
+    assert failed.failed_quanta[0].diagnostic_message.startswith("Just feeling like gleefully failing")
+    assert "diff_matched_analysis_log" in {p.name for p in failed.products}
+    assert not summaries["analyzeObjectTableCore"].failed_quanta
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("processes", [0, 1])
+async def test_load_manifest_summary(processes: int, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test that a pipetask report is parsed in a worker process or thread,
+    and that a parsing error is raised as a yaml parse error.
+    """
+    monkeypatch.setattr(config.bps, "report_parse_processes", processes)
+    summaries = await load_manifest_summary("examples/manifest_report_2.yaml")
+    assert summaries == parse_manifest_report("examples/manifest_report_2.yaml")
+
+    bad_yaml = Path(tmp_path) / "bad.yaml"
+    await bad_yaml.write_text("task: [unclosed\n")
+    with pytest.raises(CMYamlParseError):
+        await load_manifest_summary(bad_yaml)
@@ -88,17 +88,25 @@ def pytest_addoption(parser: Any) -> None:
         default=False,
         help="run playwright tests",
     )
+    parser.addoption(
+        "--run-benchmark",
+        action="store_true",
+        default=False,
+        help="run benchmark tests",
+    )
 
 
 def pytest_configure(config: Any) -> None:
     config.addinivalue_line("markers", "playwright: mark test as a playwright test")
+    config.addinivalue_line("markers", "benchmark: mark test as a (slow) benchmark test")
 
 
 def pytest_collection_modifyitems(config: Any, items: Iterator) -> None:
-    if config.getoption("--run-playwright"):
-        # --run-playwright given in cli: do not skip playwright
-        return
+    # --run-playwright or --run-benchmark given in cli: do not skip those tests
     skip_playwright = pytest.mark.skip(reason="need --run-playwright option to run")
+    skip_benchmark = pytest.mark.skip(reason="need --run-benchmark option to run")
     for item in items:
-        if "playwright" in item.keywords:
+        if "playwright" in item.keywords and not config.getoption("--run-playwright"):
             item.add_marker(skip_playwright)
+        if "benchmark" in item.keywords and not config.getoption("--run-benchmark"):
+            item.add_marker(skip_benchmark)
@@ -1,5 +1,6 @@
+import json
 import sys
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from anyio import Path
@@ -27,6 +28,40 @@ async def test_job_event_log() -> None:
         result = await mgr.check(cluster_id=1323590, condor_log=bad_log)
 
 
+async def test_job_event_log_position(tmp_path: Path) -> None:
+    """Tests that a check only reads the events written to an htcondor job
+    event log since the previous check, and replays the outcome of earlier
+    events.
+    """
+    from lsst.cmservice.common.htcondor import HTCondorManager
+    from lsst.cmservice.common.logtail import LogPosition
+
+    good_log = await (Path(__file__).parent.parent / "fixtures/logs" / "job_good.condorlog").read_text()
+    condor_log = Path(tmp_path) / "job.condorlog"
+    await condor_log.write_text(good_log[: good_log.index("005 (")])
+    mgr = HTCondorManager()
+    position = LogPosition(path=str(condor_log))
+
+    result = await mgr.check(cluster_id=19634626, condor_log=condor_log, position=position)
+    assert not result.success
+    assert result.job_id == 19634626
+    assert result.metadata_["execute_host"].startswith("<172.24.50.48:44843")
+    assert position.count == 8
+
+    # the position is restored from metadata as the node would store it
+    position = LogPosition.from_metadata(condor_log, json.loads(json.dumps(position.to_metadata())))
+    await condor_log.write_text(good_log)
+    result = await mgr.check(cluster_id=19634626, condor_log=condor_log, position=position)
+    assert result.success
+    assert position.count == 9
+    assert position.offset == len(good_log.encode())
+
+    # a check with no new events replays the outcome of the earlier events
+    result = await mgr.check(cluster_id=19634626, condor_log=condor_log, position=position)
+    assert result.success
+    assert result.metadata_["execute_host"].startswith("<172.24.50.48:44843")
+
+
 async def test_sub_file_parsing() -> None:
     """Tests the generation of an htcondor submit description dictionary from
     a sub file.
@@ -53,3 +88,162 @@ async def test_htcondor_environment_generation(mock_token: Mock) -> None:
 
     submit_env_string = " ".join(submit_env_items)
     assert f" HOME={config.htcondor.remote_user_home} " in submit_env_string
+
+
+async def test_htcondor_poller(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the poller checks the jobs of many nodes with one query of
+    the schedd's queue and one of its history.
+    """
+    from lsst.cmservice.common import htcondor
+    from lsst.cmservice.config import config
+
+    queue = [{"ClusterId": 101, "ProcId": 0, "JobStatus": 2, "RemoteHost": "slot1@worker"}]
+    history = [
+        {"ClusterId": 102, "ProcId": 0, "JobStatus": 4, "ExitCode": 0, "ExitBySignal": False},
+        {"ClusterId": 103, "ProcId": 0, "JobStatus": 4, "ExitCode": 1, "ExitBySignal": False},
+    ]
+    schedd = Mock()
+    schedd.query.return_value = queue
+    schedd.history.return_value = history
+    collector = Mock()
+    collector.locateAll.return_value = [{"Name": "schedd@host"}]
+    fake_htcondor = Mock()
+    fake_htcondor.Collector.return_value = collector
+    fake_htcondor.Schedd.return_value = schedd
+    monkeypatch.setattr(htcondor, "import_htcondor", lambda: fake_htcondor)
+
+    poller = htcondor.HTCondorPoller(htcondor.HTCondorManager())
+    assert poller.check(101) is None
+
+    # only the schedd to which the jobs were submitted is queried
+    collector.locateAll.return_value = [{"Name": "schedd@host"}, {"Name": "other@host"}]
+    other_schedd = Mock()
+    fake_htcondor.Schedd.side_effect = lambda ad: schedd if ad["Name"] == "schedd@host" else other_schedd
+    await poller.poll({"schedd@host": {101, 102, 103}})
+    assert schedd.query.call_count == 1
+    assert not other_schedd.query.called
+    assert schedd.query.call_args.kwargs["constraint"] == htcondor.cluster_constraint({101, 102, 103})
+    assert schedd.history.call_args.kwargs["constraint"] == (
+        f'CMServiceId == "{config.service_id}" && ProcId == 0 && member(ClusterId, {{102, 103}})'
+    )
+
+    running = poller.check(101, schedd="schedd@host")
+    assert running is not None
+    assert not running.success
+    assert running.metadata_["execute_host"] == "slot1@worker"
+
+    done = poller.check(102)
+    assert done is not None and done.success
+    with pytest.raises(RuntimeError):
+        poller.check(103)
+
+    # a job not found by the poller, or on another schedd, is not checked
+    assert poller.check(104) is None
+    assert poller.check(101, schedd="other@host") is None
+    assert poller.stats()["misses"] == 2
+
+    # a stale poll is not used
+    monkeypatch.setattr(config.htcondor, "launcher_poll_max_age", -1)
+    assert poller.check(102) is None
+
+    # the history is not queried for jobs without a known schedd
+    schedd.reset_mock()
+    await poller.poll({None: {104}})
+    assert schedd.query.call_count == 1
+    assert other_schedd.query.call_count == 1
+    assert not schedd.history.called
+
+    # the schedd ads are located once and cached by the launch manager
+    assert collector.locateAll.call_count == 1
+    assert fake_htcondor.Collector.call_count == 1
+    assert fake_htcondor.Schedd.call_count == 2
+
+
+@patch("lsst.cmservice.common.htcondor.get_panda_token", return_value=None)
+async def test_htcondor_manager_submit_batch(
+    mock_token: Mock, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Tests that concurrent launches share cached schedd ads and are submitted
+    in a single schedd transaction.
+    """
+    from asyncio import gather
+
+    from lsst.cmservice.common import htcondor
+    from lsst.cmservice.config import config
+
+    executable = Path(tmp_path) / "job.sh"
+    await executable.write_text("#!/bin/bash\n")
+
+    schedd = MagicMock()
+    collector = Mock()
+    collector.locateAll.return_value = [{"Name": "schedd@host"}]
+    fake_htcondor = Mock()
+    fake_htcondor.Collector.return_value = collector
+    fake_htcondor.Schedd.return_value = schedd
+    fake_htcondor.Submit.side_effect = lambda d: Mock(queue=Mock(return_value=int(d["batch_name"])))
+    monkeypatch.setattr(htcondor, "import_htcondor", lambda: fake_htcondor)
+    monkeypatch.setattr(config.htcondor, "launcher_submit_batch_window", 0.01)
+
+    mgr = htcondor.HTCondorManager()
+    jobs = await gather(
+        *[mgr.launch({"executable": str(executable), "batch_name": str(i)}) for i in range(1, 6)]
+    )
+    assert [job.cluster_id for job in jobs] == [1, 2, 3, 4, 5]
+    assert {job.schedd for job in jobs} == {"schedd@host"}
+    assert schedd.transaction.call_count == 1
+    assert not schedd.submit.called
+    assert fake_htcondor.Submit.call_args.args[0]["MY.CMServiceId"] == f'"{config.service_id}"'
+
+    await mgr.launch({"executable": str(executable), "batch_name": "6"})
+    assert collector.locateAll.call_count == 1
+    assert fake_htcondor.Schedd.call_count == 1
+    assert mgr.stats()["batches"] == 2
+    assert mgr.stats()["largest_batch"] == 5
+
+
+@patch("lsst.cmservice.common.htcondor.get_panda_token", return_value=None)
+async def test_htcondor_manager_submit_cancelled(
+    mock_token: Mock, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Tests that a cancelled launch is withdrawn from its batch, and that the
+    launches in a batch that cannot be flushed are not left waiting.
+    """
+    from asyncio import create_task, gather, sleep
+
+    from lsst.cmservice.common import htcondor
+    from lsst.cmservice.common.errors import CMHTCondorSubmitError
+    from lsst.cmservice.config import config
+
+    executable = Path(tmp_path) / "job.sh"
+    await executable.write_text("#!/bin/bash\n")
+
+    schedd = MagicMock()
+    collector = Mock()
+    collector.locateAll.return_value = [{"Name": "schedd@host"}]
+    fake_htcondor = Mock()
+    fake_htcondor.Collector.return_value = collector
+    fake_htcondor.Schedd.return_value = schedd
+    fake_htcondor.Submit.side_effect = lambda d: Mock(queue=Mock(return_value=int(d["batch_name"])))
+    monkeypatch.setattr(htcondor, "import_htcondor", lambda: fake_htcondor)
+    monkeypatch.setattr(config.htcondor, "launcher_submit_batch_window", 0.05)
+
+    mgr = htcondor.HTCondorManager()
+    launches = [
+        create_task(mgr.launch({"executable": str(executable), "batch_name": str(i)})) for i in range(1, 4)
+    ]
+    await sleep(0.01)
+    launches[1].cancel()
+    await gather(*launches, return_exceptions=True)
+    assert launches[1].cancelled()
+    assert [launches[i].result().cluster_id for i in (0, 2)] == [1, 3]
+    assert sorted(call.args[0]["batch_name"] for call in fake_htcondor.Submit.call_args_list) == ["1", "3"]
+
+    async def fail(batch: list) -> None:
+        raise RuntimeError
+
+    monkeypatch.setattr(mgr, "_submit_pending", fail)
+    with pytest.raises(CMHTCondorSubmitError):
+        await mgr.launch({"executable": str(executable), "batch_name": "4"})
+    assert mgr._flush_task is not None
+    with pytest.raises(RuntimeError):
+        await mgr._flush_task
@@ -243,3 +243,48 @@ async def test_patch_campaign(aclient: AsyncClient, caplog: pytest.LogCaptureFix
     activity_log_entry = y.json()[0]
     assert activity_log_entry["detail"]["trigger"] == "resume"
     assert activity_log_entry["detail"]["exception"] == "InvalidCampaignGraphError"
+
+
+async def test_campaign_summary(aclient: AsyncClient, test_campaign: str) -> None:
+    """Tests the single and batch campaign summary APIs"""
+    # the test campaign's id is part of the URL of its edges
+    campaign_id = test_campaign.split("/")[-2]
+
+    # A new campaign without edges should not report any node status
+    x = await aclient.post(
+        "/v2/campaigns",
+        json={
+            "apiVersion": "io.lsst.cmservice/v1",
+            "kind": "campaign",
+            "metadata": {"name": uuid4().hex[-8:]},
+            "spec": {},
+        },
+    )
+    assert x.is_success
+    empty_campaign_id = x.json()["id"]
+
+    x = await aclient.get(f"/v2/campaigns/{empty_campaign_id}/summary")
+    assert x.is_success
+    assert x.json()["node_summary"] == []
+
+    # The test campaign has a START and END node as well as its three nodes
+    x = await aclient.get(f"/v2/campaigns/{campaign_id}/summary")
+    assert x.is_success
+    summary = x.json()
+    assert summary["id"] == campaign_id
+    assert sum(node_status["count"] for node_status in summary["node_summary"]) == 5
+
+    missing_campaign_id = str(uuid5(NAMESPACE_DNS, uuid4().hex))
+    x = await aclient.get(f"/v2/campaigns/{missing_campaign_id}/summary")
+    assert x.status_code == codes.NOT_FOUND
+
+    # The batch API returns the same summaries in the order requested, omitting
+    # any campaign that does not exist
+    x = await aclient.get(
+        "/v2/campaigns/summary",
+        params={"campaign_id": [campaign_id, missing_campaign_id, empty_campaign_id]},
+    )
+    assert x.is_success
+    summaries = x.json()
+    assert [s["id"] for s in summaries] == [campaign_id, empty_campaign_id]
+    assert summaries[0] == summary
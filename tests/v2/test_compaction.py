@@ -0,0 +1,137 @@
+"""Tests for the compaction of the tasks and activity log tables."""
+
+from datetime import timedelta
+from urllib.parse import urlparse
+from uuid import UUID
+
+import pytest
+from sqlmodel import col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lsst.cmservice.common.compaction import COMPACTION_STATS, compact
+from lsst.cmservice.common.daemon_v2 import desired_node_task
+from lsst.cmservice.config import config
+from lsst.cmservice.models.db.archive import ActivityLogArchive, TaskArchive
+from lsst.cmservice.models.db.campaigns import ActivityLog, Campaign, Node, Task
+from lsst.cmservice.models.lib import timestamp
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+"""All tests in this module will run in the same event loop."""
+
+
+async def test_compaction(monkeypatch: pytest.MonkeyPatch, test_campaign: str, session: AsyncSession) -> None:
+    """Tests that finished tasks and activity log entries are moved to their
+    archive tables after their retention, which a campaign may override.
+    """
+    campaign_id = UUID(urlparse(test_campaign).path.split("/")[-2:][0])
+    nodes = (await session.exec(select(Node).where(Node.namespace == campaign_id))).all()
+    now = timestamp.now_utc()
+
+    # tasks finished an hour ago, a day ago and not at all
+    tasks = [desired_node_task(node) for node in nodes[:3]]
+    tasks[0].finished_at = now - timedelta(hours=1)
+    tasks[1].finished_at = now - timedelta(days=1)
+    entries = [
+        ActivityLog(
+            namespace=campaign_id,
+            node=node.id,
+            operator="test",
+            from_status=node.status,
+            to_status=node.status,
+            finished_at=now - timedelta(days=days),
+        )
+        for node, days in zip(nodes[:3], (1, 10, 100), strict=True)
+    ]
+    session.add_all(tasks)
+    session.add_all(entries)
+    await session.commit()
+
+    monkeypatch.setattr(config.daemon, "compaction_batch_size", 1)
+    monkeypatch.setattr(config.daemon, "task_retention", 7200)
+    monkeypatch.setattr(config.daemon, "activity_log_retention", 30 * 86400)
+    runs = COMPACTION_STATS.runs
+
+    stats = await compact(session)
+    assert stats.tasks_archived >= 1
+    assert stats.activity_log_archived >= 1
+    assert COMPACTION_STATS.runs == runs + 1
+
+    archived_tasks = (
+        await session.exec(select(TaskArchive.id).where(TaskArchive.namespace == campaign_id))
+    ).all()
+    assert archived_tasks == [tasks[1].id]
+    archived_entries = (
+        await session.exec(select(ActivityLogArchive.id).where(ActivityLogArchive.namespace == campaign_id))
+    ).all()
+    assert archived_entries == [entries[2].id]
+
+    # a campaign's retention overrides the configured retention
+    campaign = await session.get_one(Campaign, campaign_id)
+    campaign.metadata_ = campaign.metadata_ | {"retention": {"tasks": 60, "activity_log": 86400 * 5}}
+    await session.commit()
+
+    await compact(session)
+    remaining_tasks = (await session.exec(select(Task.id).where(Task.namespace == campaign_id))).all()
+    assert remaining_tasks == [tasks[2].id]
+    remaining_entries = (
+        await session.exec(select(ActivityLog.id).where(col(ActivityLog.id).in_([e.id for e in entries])))
+    ).all()
+    assert remaining_entries == [entries[0].id]
+    archived = (
+        await session.exec(select(ActivityLogArchive).where(ActivityLogArchive.id == entries[1].id))
+    ).one()
+    assert archived.archived_at is not None
+    assert archived.detail == {}
+
+    await session.exec(delete(Task).where(col(Task.namespace) == campaign_id))
+    await session.commit()
+
+
+async def test_compaction_rearchive(
+    monkeypatch: pytest.MonkeyPatch, test_campaign: str, session: AsyncSession
+) -> None:
+    """Tests that a task is archived again when the same task, i.e., a task
+    with the same deterministic id, is tombstoned a second time.
+    """
+    campaign_id = UUID(urlparse(test_campaign).path.split("/")[-2:][0])
+    node = (await session.exec(select(Node).where(Node.namespace == campaign_id))).first()
+    assert node is not None
+    monkeypatch.setattr(config.daemon, "task_retention", 60)
+
+    for _ in range(2):
+        task = desired_node_task(node)
+        task.finished_at = timestamp.now_utc() - timedelta(hours=1)
+        session.add(task)
+        await session.commit()
+        # the task row is deleted outside the session by the compaction job
+        session.expunge(task)
+
+        stats = await compact(session)
+        assert stats.tasks_archived >= 1
+        assert not (await session.exec(select(Task.id).where(Task.id == task.id))).all()
+
+    archived_tasks = (await session.exec(select(TaskArchive.id).where(TaskArchive.id == task.id))).all()
+    assert archived_tasks == [task.id, task.id]
+
+
+async def test_compaction_malformed_retention(
+    monkeypatch: pytest.MonkeyPatch, test_campaign: str, session: AsyncSession
+) -> None:
+    """Tests that a campaign's retention that is not a number is ignored in
+    favor of the configured retention.
+    """
+    campaign_id = UUID(urlparse(test_campaign).path.split("/")[-2:][0])
+    node = (await session.exec(select(Node).where(Node.namespace == campaign_id))).first()
+    assert node is not None
+    campaign = await session.get_one(Campaign, campaign_id)
+    campaign.metadata_ = campaign.metadata_ | {"retention": {"tasks": "7d", "activity_log": "a week"}}
+    task = desired_node_task(node)
+    task.finished_at = timestamp.now_utc() - timedelta(hours=1)
+    session.add(task)
+    await session.commit()
+    session.expunge(task)
+    monkeypatch.setattr(config.daemon, "task_retention", 60)
+
+    stats = await compact(session)
+    assert stats.tasks_archived >= 1
+    assert not (await session.exec(select(Task.id).where(Task.id == task.id))).all()
@@ -1,16 +1,32 @@
 """tests for the v2 daemon"""
 
+import asyncio
+from typing import Any
 from unittest.mock import Mock, patch
 from urllib.parse import urlparse
-from uuid import uuid5
+from uuid import uuid4, uuid5
 
 import pytest
-from sqlmodel import select
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlmodel import col, delete, select
 
-from lsst.cmservice.common.daemon_v2 import DaemonContext, consider_campaigns, consider_nodes
+from lsst.cmservice.common.daemon_v2 import (
+    DaemonContext,
+    NodeWorkerPool,
+    claim_tasks,
+    consider_campaigns,
+    consider_nodes,
+    daemon_enqueue_tasks,
+    desired_node_task,
+)
+from lsst.cmservice.common.flags import Features
+from lsst.cmservice.common.htcondor import HTCondorManager, HTCondorPoller
 from lsst.cmservice.common.launchers import LauncherCheckResponse
+from lsst.cmservice.config import config
 from lsst.cmservice.models.db.campaigns import Campaign, Node, Task
-from lsst.cmservice.models.enums import StatusEnum
+from lsst.cmservice.models.enums import ManifestKind, StatusEnum
+from lsst.cmservice.models.lib import timestamp
 
 pytestmark = pytest.mark.asyncio(loop_scope="module")
 """All tests in this module will run in the same event loop."""
@@ -99,6 +115,185 @@ async def test_daemon_campaign(
     await session.commit()
 
 
+async def test_daemon_campaign_time_budget(
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    test_campaign: str,
+    daemon_context: DaemonContext,
+) -> None:
+    """Tests that a campaign whose consideration exceeds the daemon's time
+    budget is abandoned without failing the daemon iteration.
+    """
+    session = daemon_context.session
+    campaign_id = urlparse(test_campaign).path.split("/")[-2:][0]
+    campaign = await session.get_one(Campaign, campaign_id)
+    campaign.status = StatusEnum.running
+    await session.commit()
+
+    async def slow_consider_campaign(*args: Any, **kwargs: Any) -> None:
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(config.daemon, "campaign_time_budget", 1)
+    with patch("lsst.cmservice.common.daemon_v2.daemon_consider_campaign", slow_consider_campaign):
+        caplog.clear()
+        await consider_campaigns(daemon_context)
+
+    assert any("exceeded time budget" in r.message and campaign_id in r.message for r in caplog.records)
+    assert any("considered campaign" in r.message and campaign_id in r.message for r in caplog.records)
+
+    # the campaign is considered as usual in the next iteration
+    await consider_campaigns(daemon_context)
+    tasks = (await session.exec(select(Task).where(Task.namespace == campaign.id))).all()
+    assert len(tasks) == 1
+
+    campaign.status = StatusEnum.paused
+    await session.commit()
+
+
+async def test_daemon_campaign_error(
+    caplog: pytest.LogCaptureFixture,
+    aclient: AsyncClient,
+    test_campaign: str,
+    daemon_context: DaemonContext,
+) -> None:
+    """Tests that a campaign whose consideration fails is abandoned without
+    preventing the consideration of other campaigns.
+    """
+    session = daemon_context.session
+    failing_id = urlparse(test_campaign).path.split("/")[-2:][0]
+    x = await aclient.post(
+        "/v2/campaigns",
+        json={
+            "apiVersion": "io.lsst.cmservice/v1",
+            "kind": "campaign",
+            "metadata": {"name": uuid4().hex[-8:]},
+            "spec": {},
+        },
+    )
+    other_id = x.json()["id"]
+    campaigns = [await session.get_one(Campaign, campaign_id) for campaign_id in (failing_id, other_id)]
+    for campaign in campaigns:
+        campaign.status = StatusEnum.running
+    await session.commit()
+
+    considered = []
+
+    async def failing_consider_campaign(session: Any, campaign_id: Any, *args: Any) -> None:
+        if str(campaign_id) == failing_id:
+            raise RuntimeError("campaign failed")
+        considered.append(str(campaign_id))
+
+    with patch("lsst.cmservice.common.daemon_v2.daemon_consider_campaign", failing_consider_campaign):
+        caplog.clear()
+        await consider_campaigns(daemon_context)
+
+    assert other_id in considered
+    assert any("failed to consider campaign" in r.message and failing_id in r.message for r in caplog.records)
+
+    for campaign in campaigns:
+        campaign.status = StatusEnum.paused
+    await session.commit()
+
+
+async def test_daemon_enqueue_tasks(
+    monkeypatch: pytest.MonkeyPatch,
+    test_campaign: str,
+    daemon_context: DaemonContext,
+) -> None:
+    """Tests that tasks are written to the Tasks table in batches of multi-row
+    inserts, and that existing tasks are only updated when task upserts are
+    allowed.
+    """
+    session = daemon_context.session
+    campaign_id = urlparse(test_campaign).path.split("/")[-2:][0]
+    nodes = (await session.exec(select(Node).where(Node.namespace == campaign_id))).all()
+    assert len(nodes) == 5
+
+    statements: list[str] = []
+
+    def count_inserts(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.startswith("INSERT INTO"):
+            statements.append(statement)
+
+    assert session.bind is not None
+    event.listen(session.bind.sync_engine, "before_cursor_execute", count_inserts)
+    monkeypatch.setattr(config.daemon, "task_batch_size", 2)
+    tasks = [desired_node_task(node, request_id="test-request") for node in nodes]
+    # duplicate tasks are written once
+    await daemon_enqueue_tasks(session, tasks + tasks[:1])
+    await session.commit()
+    event.remove(session.bind.sync_engine, "before_cursor_execute", count_inserts)
+    assert len(statements) == 3
+
+    queued_tasks = (await session.exec(select(Task).where(Task.namespace == campaign_id))).all()
+    assert len(queued_tasks) == 5
+    assert all(task.metadata_["request_id"] == "test-request" for task in queued_tasks)
+
+    # an existing task is left alone unless upserts are allowed
+    for task in queued_tasks:
+        task.submitted_at = timestamp.now_utc()
+    await session.commit()
+
+    monkeypatch.setattr(config.features, "enabled", config.features.enabled & ~Features.ALLOW_TASK_UPSERT)
+    await daemon_enqueue_tasks(session, tasks)
+    await session.commit()
+    for task in queued_tasks:
+        await session.refresh(task)
+        assert task.submitted_at is not None
+
+    monkeypatch.setattr(config.features, "enabled", config.features.enabled | Features.ALLOW_TASK_UPSERT)
+    await daemon_enqueue_tasks(session, tasks)
+    await session.commit()
+    for task in queued_tasks:
+        await session.refresh(task)
+        assert task.submitted_at is None
+
+    await session.exec(delete(Task).where(col(Task.namespace) == campaign_id))
+    await session.commit()
+
+
+async def test_daemon_claim_tasks(
+    monkeypatch: pytest.MonkeyPatch,
+    test_campaign: str,
+    daemon_context: DaemonContext,
+) -> None:
+    """Tests that tasks are claimed in order of priority and age, and only
+    when they are within the daemon's priority and share its site affinity.
+    """
+    session = daemon_context.session
+    campaign_id = urlparse(test_campaign).path.split("/")[-2:][0]
+    nodes = (await session.exec(select(Node).where(Node.namespace == campaign_id))).all()
+    assert len(nodes) == 5
+
+    tasks = [desired_node_task(node) for node in nodes]
+    for task, priority, site_affinity in zip(
+        tasks,
+        [None, 2, 1, 2, 3],
+        [None, ["s3df"], None, ["in2p3"], ["s3df", "in2p3"]],
+        strict=True,
+    ):
+        task.priority = priority
+        task.site_affinity = site_affinity
+    await daemon_enqueue_tasks(session, tasks)
+    await session.commit()
+
+    # other tests may leave tasks for other campaigns in the queue
+    claimed = await claim_tasks(session, limit=100, exclude=set())
+    claimed = [task for task in claimed if str(task.namespace) == campaign_id]
+    assert [task.id for task in claimed] == [tasks[i].id for i in (2, 1, 3, 4, 0)]
+    await session.rollback()
+
+    monkeypatch.setattr(config.daemon, "site_affinity", ["s3df"])
+    monkeypatch.setattr(config.daemon, "priority", 2)
+    claimed = await claim_tasks(session, limit=100, exclude={tasks[2].id})
+    claimed = [task for task in claimed if str(task.namespace) == campaign_id]
+    assert [task.id for task in claimed] == [tasks[1].id, tasks[0].id]
+    await session.rollback()
+
+    await session.exec(delete(Task).where(col(Task.namespace) == campaign_id))
+    await session.commit()
+
+
 # TODO it is important to test the case that a modification is made to a JSONB
 # column (e.g., metadata) between detaching the node (from the daemon) and
 # merging into the new session (in the machine's "update_..." callback). Should
@@ -154,6 +349,24 @@ async def test_daemon_node(
     assert campaign.status == StatusEnum.accepted
 
 
+async def test_daemon_poll_running_nodes(test_campaign: str, daemon_context: DaemonContext) -> None:
+    """Tests that the HTCondor poller polls the job of every running node with
+    a cluster id at once.
+    """
+    session = daemon_context.session
+    campaign_id = urlparse(url=test_campaign).path.split("/")[-2:][0]
+    nodes = (await session.exec(select(Node).where(Node.namespace == campaign_id))).all()
+    for node, wms_job in zip(nodes[:3], (4242, None, 4343)):
+        node.status = StatusEnum.running
+        node.metadata_ = node.metadata_ | {"wms_job": wms_job}
+    await session.commit()
+
+    poller = HTCondorPoller(HTCondorManager())
+    with patch.object(poller, "poll") as mock_poll:
+        await poller.poll_running_nodes(session)
+    mock_poll.assert_called_once_with({None: {4242, 4343}})
+
+
 async def test_dynamic_node_machine() -> None:
     """Test the dynamic resolution of a ``NodeMachine`` class based on a Node's
     ``kind`` attribute.
@@ -168,3 +381,49 @@ async def test_dynamic_node_machine() -> None:
     k = ManifestKind.group
     x = node_machine_factory(k)
     assert x is GroupMachine
+
+
+async def test_node_worker_pool() -> None:
+    """Test that the node worker pool bounds the number of transitions in
+    flight overall and for a limited kind of node, that slots are only
+    reserved as they become available, and that nodes of a kind at its limit
+    do not hold slots needed by other kinds.
+    """
+    pool = NodeWorkerPool(4, {"group": 2})
+    in_flight: dict[str, int] = {"all": 0, "group": 0}
+    peak: dict[str, int] = {"all": 0, "group": 0}
+
+    async def transition(kind: str) -> bool:
+        in_flight["all"] += 1
+        in_flight[kind] = in_flight.get(kind, 0) + 1
+        peak["all"] = max(peak["all"], in_flight["all"])
+        peak[kind] = max(peak.get(kind, 0), in_flight[kind])
+        await asyncio.sleep(0.01)
+        in_flight["all"] -= 1
+        in_flight[kind] -= 1
+        return True
+
+    # group nodes are claimed first and saturate their kind at once
+    kinds = [ManifestKind.group] * 6 + [ManifestKind.step] * 6
+    async with asyncio.TaskGroup() as tg:
+        while kinds:
+            reserved = await pool.reserve(3)
+            assert 1 <= reserved <= 3
+            saturated = pool.saturated_kinds()
+            claimed = [kind for kind in kinds if kind not in saturated][:reserved]
+            for kind in claimed:
+                if not pool.admit(kind):
+                    assert kind is ManifestKind.group
+                    continue
+                kinds.remove(kind)
+                tg.create_task(pool.run(kind, transition(kind.name)))
+                reserved -= 1
+            pool.release(reserved)
+            # yield to the running transitions, as claiming a page would
+            await asyncio.sleep(0)
+
+    assert peak["all"] == 4
+    assert peak["group"] == 2
+    assert pool.saturated_kinds() == []
+    # every slot is available again
+    assert await pool.reserve(10) == 4
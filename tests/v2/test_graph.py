@@ -1,20 +1,24 @@
 """Tests graph operations using v2 objects"""
 
 import random
+from typing import Any
 from urllib.parse import urlparse
 from uuid import UUID, uuid4
 
 import networkx as nx
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from lsst.cmservice.models.db.campaigns import Edge
-from lsst.cmservice.models.enums import StatusEnum
+from lsst.cmservice.models.db.campaigns import Edge, Node
+from lsst.cmservice.models.enums import ManifestKind, StatusEnum
 from lsst.cmservice.models.lib.graph import (
     delete_node_from_graph,
+    fan_out_step_groups,
     find_endpoints_in_directed_graph,
     graph_from_edge_list_v2,
+    graph_from_namespace,
     processable_graph_nodes,
     validate_graph,
 )
@@ -94,6 +98,45 @@ async def test_build_and_walk_graph(
         await session.commit()
 
 
+async def test_graph_from_namespace(
+    aclient: AsyncClient, session: AnyAsyncSession, test_campaign: str
+) -> None:
+    """Test that a campaign graph is hydrated with a constant number of set-
+    based queries and that both node views are equivalent to the graph built
+    from a list of edges.
+    """
+    campaign_id = UUID(urlparse(url=test_campaign).path.split("/")[-2:][0])
+    assert session.bind is not None
+
+    statements: list[str] = []
+
+    def count_selects(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", count_selects)
+    try:
+        graph = await graph_from_namespace(campaign_id, session)
+    finally:
+        event.remove(session.bind.sync_engine, "before_cursor_execute", count_selects)
+
+    # One query for the edges and one for all the nodes
+    assert len(statements) == 2
+    assert graph.number_of_nodes() == 5
+    assert validate_graph(graph)
+
+    edge_list = [Edge.model_validate(edge) for edge in (await aclient.get(test_campaign)).json()]
+    edge_graph = await graph_from_edge_list_v2(edge_list, session)
+    assert set(graph.nodes) == set(edge_graph.nodes)
+    assert set(graph.edges) == set(edge_graph.edges)
+
+    simple_graph = await graph_from_namespace(campaign_id, session, node_view="simple")
+    assert {"START.1", "END.1"} <= set(simple_graph.nodes)
+    for _, data in simple_graph.nodes(data=True):
+        assert data["status"] == StatusEnum.waiting.name
+        assert UUID(data["uuid"]) in graph
+
+
 async def test_validate_graph() -> None:
     """Test basic graph validation operations using a simple DAG."""
 
@@ -155,6 +198,77 @@ async def test_validate_graph() -> None:
     assert validate_graph(g, "A", "F")
 
 
+async def test_processable_graph_nodes_frontier() -> None:
+    """Test that the frontier traversal of a graph finds the same processable
+    nodes as an exhaustive walk of every path from source to sink, using a
+    pair of fan-out steps in series with a failed group in the first step.
+
+    ```
+    START --> A0 --> A --> B0 --> B --> END
+                 --> A1 -->   --> B1 -->
+                 --> A2 -->   --> B2 -->
+    ```
+    """
+
+    namespace = uuid4()
+    g: nx.DiGraph = nx.DiGraph()
+    n: dict[str, UUID] = {}
+
+    def add_node(name: str, status: StatusEnum) -> None:
+        node = Node.model_validate(
+            dict(name=name, namespace=namespace, kind=ManifestKind.group, status=status)
+        )
+        n[name] = node.id
+        g.add_node(node.id, model=node)
+
+    for name in ["START", "A", "B", "END"]:
+        add_node(name, StatusEnum.waiting)
+    for predecessor, step in (("START", "A"), ("A", "B")):
+        for i in range(3):
+            add_node(f"{step}{i}", StatusEnum.waiting)
+            g.add_edge(n[predecessor], n[f"{step}{i}"])
+            g.add_edge(n[f"{step}{i}"], n[step])
+    g.add_edge(n["B"], n["END"])
+    assert validate_graph(g)
+
+    def walk_all_paths() -> set[str]:
+        names = set()
+        for path in nx.all_simple_paths(g, n["START"], n["END"]):
+            for v in path:
+                status = g.nodes[v]["model"].status
+                if status.is_processable_script():
+                    names.add(g.nodes[v]["model"].name)
+                    break
+                elif status is StatusEnum.failed:
+                    break
+        return names
+
+    def set_status(status: StatusEnum, *names: str) -> None:
+        for name in names:
+            g.nodes[n[name]]["model"].status = status
+
+    # START is the only processable node
+    assert {node.name for node in processable_graph_nodes(g)} == walk_all_paths() == {"START"}
+
+    # each of the parallel groups in the first step are processable
+    set_status(StatusEnum.accepted, "START")
+    assert {node.name for node in processable_graph_nodes(g)} == walk_all_paths() == {"A0", "A1", "A2"}
+
+    # a failed group blocks only the paths through it, so the fan-in node is
+    # still reachable through its successful neighbors
+    set_status(StatusEnum.accepted, "A0", "A2")
+    set_status(StatusEnum.failed, "A1")
+    assert {node.name for node in processable_graph_nodes(g)} == walk_all_paths() == {"A"}
+
+    set_status(StatusEnum.running, "A1")
+    assert {node.name for node in processable_graph_nodes(g)} == walk_all_paths() == {"A", "A1"}
+
+    # the traversal may be resumed from the nodes found by a prior traversal
+    set_status(StatusEnum.accepted, "A1", "A")
+    assert {node.name for node in processable_graph_nodes(g, frontier=[n["A"]])} == {"B0", "B1", "B2"}
+    assert {node.name for node in processable_graph_nodes(g)} == walk_all_paths() == {"B0", "B1", "B2"}
+
+
 @pytest.mark.skip("fixed in DM-52178")
 async def test_campaign_graph_route(aclient: AsyncClient, test_campaign: str) -> None:
     """Tests the acquisition of a serialized graph from a REST endpoint and
@@ -304,6 +418,48 @@ async def test_append_node_in_graph(
     assert r.is_client_error
 
 
+async def test_fan_out_step_groups(aclient: AsyncClient, session: AsyncSession, test_campaign: str) -> None:
+    """Tests the manipulation of a campaign graph by fanning out a step into
+    a collect node and many parallel groups with a constant number of
+    statements.
+    """
+    campaign_id = UUID(urlparse(url=test_campaign).path.split("/")[-2:][0])
+    assert session.bind is not None
+    graph = await graph_from_namespace(campaign_id, session)
+    _, end = find_endpoints_in_directed_graph(graph)
+    step = next(n for n in graph.predecessors(end))
+
+    collect = Node.model_validate(
+        {"name": f"{uuid4().hex[-8:]}_collect", "namespace": campaign_id, "kind": ManifestKind.collect_groups}
+    )
+    groups = [
+        Node.model_validate({"name": f"{uuid4().hex[-8:]}_group", "namespace": campaign_id, "kind": "group"})
+        for _ in range(50)
+    ]
+
+    statements: list[str] = []
+
+    def count_statements(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", count_statements)
+    try:
+        await fan_out_step_groups(step, collect, groups, namespace=campaign_id, session=session)
+    finally:
+        event.remove(session.bind.sync_engine, "before_cursor_execute", count_statements)
+
+    # The nodes, the step's downstream edges and the new edges are each
+    # written with a single statement no matter how many groups there are
+    assert len(statements) <= 5
+
+    graph = await graph_from_namespace(campaign_id, session)
+    assert validate_graph(graph)
+    group_ids = {group.id for group in groups}
+    assert set(graph.successors(step)) == group_ids
+    assert set(graph.predecessors(collect.id)) == group_ids
+    assert list(graph.successors(collect.id)) == [end]
+
+
 async def test_delete_node_from_graph(
     aclient: AsyncClient, session: AsyncSession, test_campaign: str
 ) -> None:
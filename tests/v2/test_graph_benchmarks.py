@@ -0,0 +1,171 @@
+"""Benchmarks for campaign graph operations using v2 objects.
+
+These tests are skipped unless pytest is invoked with ``--run-benchmark``.
+Timings are reported as test properties (e.g., with ``--junit-xml``) and in
+the log output.
+"""
+
+import time
+from collections.abc import Callable
+from uuid import UUID, uuid4, uuid5
+
+import networkx as nx
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lsst.cmservice.common.logging import LOGGER
+from lsst.cmservice.models.db.campaigns import Edge, Node
+from lsst.cmservice.models.enums import ManifestKind, StatusEnum
+from lsst.cmservice.models.lib.graph import (
+    graph_from_edge_list_v2,
+    graph_from_namespace,
+    processable_graph_nodes,
+)
+
+pytestmark = [pytest.mark.asyncio(loop_scope="module"), pytest.mark.benchmark]
+"""All tests in this module will run in the same event loop."""
+
+logger = LOGGER.bind(module=__name__)
+
+
+async def make_fan_out_campaign(aclient: AsyncClient, session: AsyncSession, n_groups: int) -> UUID:
+    """Creates a campaign whose graph is a single fan-out/fan-in of `n_groups`
+    group nodes between the START and END nodes.
+    """
+    x = await aclient.post(
+        "/v2/campaigns",
+        json={
+            "apiVersion": "io.lsst.cmservice/v1",
+            "kind": "campaign",
+            "metadata": {"name": uuid4().hex[-8:]},
+            "spec": {},
+        },
+    )
+    campaign_id = UUID(x.json()["id"])
+    start_id = uuid5(campaign_id, "START.1")
+    end_id = uuid5(campaign_id, "END.1")
+
+    groups = [
+        Node.model_validate(dict(name=f"group_{i:05d}", namespace=campaign_id, kind=ManifestKind.group))
+        for i in range(n_groups)
+    ]
+    session.add_all(groups)
+    await session.flush()
+
+    for group in groups:
+        for source, target in ((start_id, group.id), (group.id, end_id)):
+            session.add(
+                Edge(
+                    id=uuid5(campaign_id, f"{source}->{target}"),
+                    name=f"{source}->{target}",
+                    namespace=campaign_id,
+                    source=source,
+                    target=target,
+                )
+            )
+    await session.commit()
+    return campaign_id
+
+
+@pytest.mark.parametrize("n_groups", [10, 100, 1_000, 3_000])
+async def test_benchmark_graph_hydration(
+    aclient: AsyncClient,
+    session: AsyncSession,
+    record_property: Callable[[str, object], None],
+    n_groups: int,
+) -> None:
+    """Measures campaign graph build time against node count for the batched
+    namespace and edge-list hydration paths in both node views.
+    """
+    campaign_id = await make_fan_out_campaign(aclient, session, n_groups)
+
+    for node_view in ("model", "simple"):
+        t0 = time.perf_counter()
+        graph = await graph_from_namespace(campaign_id, session, node_view=node_view)
+        namespace_elapsed = time.perf_counter() - t0
+        assert graph.number_of_nodes() == n_groups + 2
+
+        t0 = time.perf_counter()
+        edges = (await session.exec(select(Edge).where(Edge.namespace == campaign_id))).all()
+        graph = await graph_from_edge_list_v2(edges, session, node_view=node_view)
+        edge_list_elapsed = time.perf_counter() - t0
+        assert graph.number_of_nodes() == n_groups + 2
+
+        record_property(f"graph_from_namespace[{node_view}]", namespace_elapsed)
+        record_property(f"graph_from_edge_list_v2[{node_view}]", edge_list_elapsed)
+        logger.info(
+            "Graph hydration benchmark",
+            nodes=n_groups + 2,
+            node_view=node_view,
+            graph_from_namespace=f"{namespace_elapsed:.4f}s",
+            graph_from_edge_list_v2=f"{edge_list_elapsed:.4f}s",
+        )
+
+
+def make_serial_fan_out_graph(n_groups: int, n_steps: int = 2) -> nx.DiGraph:
+    """Creates an in-memory campaign graph of `n_steps` fan-out/fan-in steps in
+    series, with `n_groups` groups divided among them. START and every group
+    in all but the last step are accepted, so every group of the last step is
+    processable.
+    """
+    namespace = uuid4()
+    g: nx.DiGraph = nx.DiGraph()
+
+    def add_node(name: str, kind: ManifestKind, status: StatusEnum) -> UUID:
+        node = Node.model_validate(dict(name=name, namespace=namespace, kind=kind, status=status))
+        g.add_node(node.id, model=node)
+        return node.id
+
+    predecessor = add_node("START", ManifestKind.start, StatusEnum.accepted)
+    for step in range(n_steps):
+        last_step = step == n_steps - 1
+        step_id = add_node(f"step_{step}", ManifestKind.step, StatusEnum.waiting)
+        for i in range(n_groups // n_steps):
+            group_status = StatusEnum.waiting if last_step else StatusEnum.accepted
+            group_id = add_node(f"group_{step}_{i:05d}", ManifestKind.group, group_status)
+            g.add_edge(predecessor, group_id)
+            g.add_edge(group_id, step_id)
+        if not last_step:
+            g.nodes[step_id]["model"].status = StatusEnum.accepted
+        predecessor = step_id
+    g.add_edge(predecessor, add_node("END", ManifestKind.end, StatusEnum.waiting))
+    return g
+
+
+@pytest.mark.parametrize("n_groups", [10, 100, 1_000, 10_000])
+async def test_benchmark_processable_graph_nodes(
+    record_property: Callable[[str, object], None],
+    n_groups: int,
+) -> None:
+    """Measures processable node discovery time against group count for a
+    campaign of two fan-out steps in series. The exhaustive path walk that the
+    frontier traversal replaced is timed for comparison where it is tractable.
+    """
+    g = make_serial_fan_out_graph(n_groups)
+
+    t0 = time.perf_counter()
+    processable_nodes = list(processable_graph_nodes(g))
+    frontier_elapsed = time.perf_counter() - t0
+    assert len(processable_nodes) == n_groups // 2
+
+    record_property("processable_graph_nodes", frontier_elapsed)
+    log_kwargs = {"processable_graph_nodes": f"{frontier_elapsed:.4f}s"}
+
+    if n_groups <= 100:
+        source = next(v for v, d in g.in_degree() if d == 0)
+        sink = next(v for v, d in g.out_degree() if d == 0)
+        t0 = time.perf_counter()
+        path_nodes = set()
+        for path in nx.all_simple_paths(g, source, sink):
+            for n in path:
+                if g.nodes[n]["model"].status.is_processable_script():
+                    path_nodes.add(g.nodes[n]["model"])
+                    break
+        path_elapsed = time.perf_counter() - t0
+        assert path_nodes == set(processable_nodes)
+        record_property("all_simple_paths", path_elapsed)
+        log_kwargs["all_simple_paths"] = f"{path_elapsed:.4f}s"
+
+    logger.info("Processable node benchmark", groups=n_groups, **log_kwargs)
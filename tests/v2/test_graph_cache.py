@@ -0,0 +1,87 @@
+"""Tests for the process-wide campaign graph cache."""
+
+from urllib.parse import urlparse
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lsst.cmservice.common.graph_cache import CampaignGraphCache
+from lsst.cmservice.models.db.campaigns import Edge, Node
+from lsst.cmservice.models.enums import StatusEnum
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+"""All tests in this module will run in the same event loop."""
+
+
+async def test_graph_cache_versions(aclient: AsyncClient, session: AsyncSession, test_campaign: str) -> None:
+    """Test that the graph cache serves a campaign graph until a node or edge
+    in the campaign namespace changes.
+    """
+    campaign_id = UUID(urlparse(url=test_campaign).path.split("/")[-2:][0])
+    cache = CampaignGraphCache(maxsize=4)
+
+    g = await cache.get(campaign_id, session)
+    assert g.number_of_nodes() == 5
+    assert cache.stats()["misses"] == 1
+
+    # a second lookup is served from the cache as a copy of the cached graph
+    g.remove_nodes_from(list(g.nodes))
+    g = await cache.get(campaign_id, session)
+    assert g.number_of_nodes() == 5
+    assert cache.stats()["hits"] == 1
+
+    # each node view is cached separately
+    _ = await cache.get(campaign_id, session, node_view="simple")
+    assert cache.stats()["misses"] == 2
+    assert len(cache) == 2
+
+    # a node status change in the namespace invalidates the cached graph
+    start_node = (
+        await session.exec(select(Node).where(Node.namespace == campaign_id).where(Node.name == "START"))
+    ).one()
+    start_node.status = StatusEnum.accepted
+    await session.commit()
+
+    g = await cache.get(campaign_id, session)
+    assert cache.stats()["misses"] == 3
+    assert g.nodes[start_node.id]["model"].status is StatusEnum.accepted
+
+    # so does removing an edge from the namespace
+    edge = (await session.exec(select(Edge).where(Edge.namespace == campaign_id))).first()
+    assert edge is not None
+    await session.delete(edge)
+    await session.commit()
+
+    g = await cache.get(campaign_id, session)
+    assert cache.stats()["misses"] == 4
+    assert g.number_of_edges() == 4
+
+    # explicit invalidation removes every view of the campaign graph
+    cache.invalidate(campaign_id)
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 2
+
+
+async def test_graph_cache_eviction(aclient: AsyncClient, session: AsyncSession, test_campaign: str) -> None:
+    """Test that the graph cache evicts the least recently used graph when it
+    is full, and that a cache with no size does not hold any graph.
+    """
+    campaign_id = UUID(urlparse(url=test_campaign).path.split("/")[-2:][0])
+    cache = CampaignGraphCache(maxsize=1)
+
+    _ = await cache.get(campaign_id, session)
+    _ = await cache.get(campaign_id, session, node_view="simple")
+    assert len(cache) == 1
+    assert cache.stats()["evictions"] == 1
+
+    _ = await cache.get(campaign_id, session, node_view="simple")
+    assert cache.stats()["hits"] == 1
+
+    cache = CampaignGraphCache(maxsize=0)
+    _ = await cache.get(campaign_id, session)
+    _ = await cache.get(campaign_id, session)
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 2
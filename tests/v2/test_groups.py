@@ -1,7 +1,9 @@
 from collections import ChainMap
-from itertools import pairwise
+from collections.abc import Iterator
+from itertools import islice, pairwise
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from urllib.parse import urlparse
 from uuid import UUID, uuid4, uuid5
 
@@ -11,10 +13,15 @@ import pytest
 from httpx import AsyncClient
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from lsst.cmservice.common.errors import CMInvalidGroupingError
+from lsst.cmservice.common.splitter import DimensionSplitter, QuerySplitter, WeightedSplitter
+from lsst.cmservice.common.splitters.weighted import weighted_partition_indices
+from lsst.cmservice.config import config
 from lsst.cmservice.machines.node import GroupMachine, StepMachine
 from lsst.cmservice.models.db.campaigns import Node
 from lsst.cmservice.models.enums import DEFAULT_NAMESPACE, ManifestKind
 from lsst.cmservice.models.lib.graph import validate_graph
+from lsst.daf.butler import Butler, DatasetType
 
 pytestmark = pytest.mark.asyncio(loop_scope="module")
 """All tests in this module will run in the same event loop."""
@@ -139,6 +146,156 @@ async def test_array_splitting() -> None:
     assert predicates[-1] == f"{dimension} >= 839405"
 
 
+class MockQueryResults:
+    """A stand-in for Butler query results that yields its rows lazily."""
+
+    def __init__(self, rows: Iterator[SimpleNamespace]) -> None:
+        self.rows = rows
+
+    def where(self, *args: str) -> "MockQueryResults":
+        return self
+
+    def limit(self, limit: int) -> "MockQueryResults":
+        return MockQueryResults(islice(self.rows, limit))
+
+    def __iter__(self) -> Iterator[SimpleNamespace]:
+        return self.rows
+
+
+def mock_butler(n_visits: int, n_detectors: int) -> MagicMock:
+    """Returns a mock Butler whose dataset query yields a ref for each of
+    `n_detectors` detectors of each of `n_visits` visits, in no particular
+    order.
+    """
+    visits = np.random.default_rng(seed=42).permutation(n_visits)
+    rows = (SimpleNamespace(dataId={"visit": int(v)}) for v in visits for _ in range(n_detectors))
+    butler = MagicMock()
+    butler.get_dataset_type.return_value.dimensions = ["visit"]
+    butler.dimensions.dimensions["visit"].primaryKey.getPythonType.return_value = int
+    butler.query.return_value.__enter__.return_value.datasets.return_value = MockQueryResults(rows)
+    return butler
+
+
+async def test_query_splitter_streaming(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the query splitter consumes dataset query results a page at
+    a time into sorted, distinct dimension values, and that truncated results
+    are reported.
+    """
+    monkeypatch.setattr(config.butler, "query_page_size", 1_000)
+    monkeypatch.setattr(config.butler, "max_query_limit", 0)
+    factory = MagicMock(aget_butler=AsyncMock(side_effect=lambda _: mock_butler(1_000, 10)))
+    monkeypatch.setattr("lsst.cmservice.common.splitters.query.BUTLER_FACTORY", factory)
+
+    splitter = QuerySplitter(dataset="calexp", dimension="visit", butler_label="mock", min_groups=4)
+    values = await splitter.butler_query()
+    assert np.array_equal(values, np.arange(1_000))
+    assert not splitter.truncated
+
+    predicates = [predicate async for predicate in splitter.split()]
+    assert predicates == [
+        "visit >= 0 AND visit < 250",
+        "visit >= 250 AND visit < 500",
+        "visit >= 500 AND visit < 750",
+        "visit >= 750",
+    ]
+
+    # A negative limit logs and reports the truncation of the results
+    monkeypatch.setattr(config.butler, "max_query_limit", -5_000)
+    splitter = QuerySplitter(dataset="calexp", dimension="visit", butler_label="mock")
+    values = await splitter.butler_query()
+    assert splitter.truncated
+    assert values.size == 501
+
+    # while a positive limit is an error
+    monkeypatch.setattr(config.butler, "max_query_limit", 5_000)
+    with pytest.raises(CMInvalidGroupingError):
+        _ = await splitter.butler_query()
+
+
+async def test_dimension_splitter(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the dimension splitter finds the same distinct dimension
+    values as the query splitter from a Butler registry.
+    """
+    Butler.makeRepo(str(tmp_path))
+    butler = Butler.from_config(str(tmp_path), writeable=True)
+    butler.registry.insertDimensionData(
+        "instrument", {"name": "MockCam", "detector_max": 100, "visit_max": 1000, "exposure_max": 1000}
+    )
+    butler.registry.insertDimensionData(
+        "detector", *[{"instrument": "MockCam", "id": i, "full_name": f"D{i:02d}"} for i in range(40)]
+    )
+    dataset_type = DatasetType(
+        "mock_dataset", ("instrument", "detector"), "StructuredDataDict", universe=butler.dimensions
+    )
+    butler.registry.registerDatasetType(dataset_type)
+    for run in ("mock/run1", "mock/run2"):
+        butler.registry.registerRun(run)
+        butler.registry.insertDatasets(
+            dataset_type, [{"instrument": "MockCam", "detector": i} for i in range(0, 40, 2)], run=run
+        )
+
+    monkeypatch.setattr(config.butler, "query_page_size", 8)
+    factory = MagicMock(aget_butler=AsyncMock(return_value=butler))
+    monkeypatch.setattr("lsst.cmservice.common.splitters.query.BUTLER_FACTORY", factory)
+
+    splitter_config = dict(
+        dataset="mock_dataset",
+        dimension="detector",
+        butler_label="mock",
+        min_groups=4,
+        collections=["mock/run1", "mock/run2"],
+        predicates=["instrument='MockCam'", "detector < 32"],
+    )
+    query_splitter = QuerySplitter(**splitter_config)  # type: ignore[arg-type]
+    dimension_splitter = DimensionSplitter(**splitter_config)  # type: ignore[arg-type]
+
+    values = await dimension_splitter.butler_query()
+    assert np.array_equal(values, np.arange(0, 32, 2))
+    assert np.array_equal(values, await query_splitter.butler_query())
+
+    predicates = [predicate async for predicate in dimension_splitter.split()]
+    assert predicates == [predicate async for predicate in query_splitter.split()]
+    assert len(predicates) == 4
+
+    # the dimension query shares the query splitter's limit handling
+    monkeypatch.setattr(config.butler, "max_query_limit", -10)
+    assert (await dimension_splitter.butler_query()).size == 11
+    assert dimension_splitter.truncated
+    monkeypatch.setattr(config.butler, "max_query_limit", 10)
+    with pytest.raises(CMInvalidGroupingError):
+        _ = await dimension_splitter.butler_query()
+
+
+async def test_weighted_splitter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the weighted splitter cuts dimension values into ranges of
+    roughly equal numbers of datasets while honoring the minimum group count
+    and the maximum group size.
+    """
+    weights = np.array([1, 1, 1, 1, 1, 1, 10, 1, 1, 1, 1, 1, 1, 10])
+    starts = weighted_partition_indices(weights, group_count=2, max_size=100)
+    assert starts.tolist() == [0, 7]
+
+    # every range has at least one value, even when a single value carries
+    # more than its share of the total weight
+    starts = weighted_partition_indices(np.array([100, 1, 1, 1]), group_count=3, max_size=100)
+    assert starts.tolist() == [0, 1, 2]
+
+    # and no range has more than the maximum number of values
+    starts = weighted_partition_indices(np.ones(10, dtype=int), group_count=2, max_size=3)
+    assert np.diff(np.append(starts, 10)).max() <= 3
+
+    butler = mock_butler(100, 1)
+    rows = [SimpleNamespace(dataId={"visit": v}) for v in range(100) for _ in range(1 + 99 * (v >= 90))]
+    butler.query.return_value.__enter__.return_value.datasets.return_value = MockQueryResults(iter(rows))
+    factory = MagicMock(aget_butler=AsyncMock(return_value=butler))
+    monkeypatch.setattr("lsst.cmservice.common.splitters.query.BUTLER_FACTORY", factory)
+    monkeypatch.setattr(config.butler, "max_query_limit", 0)
+
+    splitter = WeightedSplitter(dataset="calexp", dimension="visit", butler_label="mock", min_groups=2)
+    predicates = [predicate async for predicate in splitter.split()]
+    assert predicates == ["visit >= 0 AND visit < 95", "visit >= 95"]
+
+
 async def test_bps_stdout_parsing(session: AsyncSession) -> None:
     """Tests the bps stdout parsing behavior of a GroupMachine"""
     node = Node(
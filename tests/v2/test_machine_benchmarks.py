@@ -0,0 +1,91 @@
+"""Benchmarks for the serialization of state machines.
+
+These tests are skipped unless pytest is invoked with ``--run-benchmark``.
+Timings and sizes are reported as test properties (e.g., with ``--junit-xml``)
+and in the log output.
+"""
+
+import json
+import pickle
+import time
+from collections.abc import Callable
+from urllib.parse import urlparse
+from uuid import UUID, uuid4, uuid5
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lsst.cmservice.common.logging import LOGGER
+from lsst.cmservice.machines.node import GroupMachine, StepMachine, load_node_machine
+from lsst.cmservice.machines.serialization import dump_machine_state
+from lsst.cmservice.models.db.campaigns import Machine, Node
+
+pytestmark = [pytest.mark.asyncio(loop_scope="module"), pytest.mark.benchmark]
+"""All tests in this module will run in the same event loop."""
+
+logger = LOGGER.bind(module=__name__)
+
+
+async def test_benchmark_machine_serialization(
+    test_campaign_groups: str,
+    session: AsyncSession,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Measures the serialized size and the dump and load times of a prepared
+    group machine as a pickle and as a state record.
+    """
+    n = 200
+    campaign_id = urlparse(url=test_campaign_groups).path.split("/")[-2:][0]
+
+    node = await session.get_one(Node, uuid5(UUID(campaign_id), "lambert.1"))
+    step_machine = StepMachine(o=node)
+    await session.commit()
+    await step_machine.trigger("prepare")
+
+    s = select(Node).where(Node.name == "lambert_group_001").where(Node.namespace == campaign_id)
+    group = (await session.exec(s)).one()
+    group_machine = GroupMachine(o=group)
+    await session.commit()
+    await group_machine.trigger("prepare")
+    await session.refresh(group)
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        machine_pickle = pickle.dumps(group_machine.machine)
+    pickle_dump_elapsed = (time.perf_counter() - t0) / n
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        load_node_machine(Machine(id=uuid4(), state=machine_pickle), group)
+    pickle_load_elapsed = (time.perf_counter() - t0) / n
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        record = dump_machine_state(group_machine)
+    record_dump_elapsed = (time.perf_counter() - t0) / n
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        load_node_machine(Machine(id=uuid4(), record=record), group)
+    record_load_elapsed = (time.perf_counter() - t0) / n
+
+    pickle_size = len(machine_pickle)
+    record_size = len(json.dumps(record))
+    assert record_size < pickle_size
+
+    record_property("pickle_size", pickle_size)
+    record_property("record_size", record_size)
+    record_property("pickle_dump", pickle_dump_elapsed)
+    record_property("pickle_load", pickle_load_elapsed)
+    record_property("record_dump", record_dump_elapsed)
+    record_property("record_load", record_load_elapsed)
+    logger.info(
+        "Machine serialization benchmark",
+        pickle_size=pickle_size,
+        record_size=record_size,
+        pickle_dump=f"{pickle_dump_elapsed:.6f}s",
+        pickle_load=f"{pickle_load_elapsed:.6f}s",
+        record_dump=f"{record_dump_elapsed:.6f}s",
+        record_load=f"{record_load_elapsed:.6f}s",
+    )
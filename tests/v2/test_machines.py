@@ -25,7 +25,9 @@ from lsst.cmservice.machines.node import (
     StartMachine,
     StepCollectMachine,
     StepMachine,
+    load_node_machine,
 )
+from lsst.cmservice.machines.serialization import MACHINE_STATE_VERSION, load_machine_state
 from lsst.cmservice.machines.tasks import change_campaign_state
 from lsst.cmservice.models.db.campaigns import Campaign, Machine, Node
 from lsst.cmservice.models.enums import ManifestKind, StatusEnum
@@ -328,6 +330,60 @@ async def test_action_node_htcondor(test_campaign_groups: str, session: AsyncSes
     assert len(await get_activity_log_errors(session, campaign_id)) == 0
 
 
+async def test_machine_state_record(test_campaign_groups: str, session: AsyncSession) -> None:
+    """Tests that a prepared machine is stored as a versioned state record from
+    which an equivalent machine is rebuilt, and that a legacy pickled machine
+    can still be loaded.
+    """
+    campaign_id = urlparse(url=test_campaign_groups).path.split("/")[-2:][0]
+
+    node_id = uuid5(UUID(campaign_id), "lambert.1")
+    node = await session.get_one(Node, node_id)
+    node_machine = StepMachine(o=node)
+    await session.commit()
+    await node_machine.trigger("prepare")
+
+    s = select(Node).where(Node.name == "lambert_group_001").where(Node.namespace == campaign_id)
+    group = (await session.exec(s)).one()
+    group_machine = GroupMachine(o=group)
+    await session.commit()
+    await group_machine.trigger("prepare")
+
+    await session.refresh(group, ["status", "machine"])
+    assert group.machine is not None
+    stored_machine = await session.get_one(Machine, group.machine)
+    assert stored_machine.state is None
+    assert stored_machine.record is not None
+    state_record = load_machine_state(stored_machine.record)
+    assert state_record.version == MACHINE_STATE_VERSION
+    assert state_record.kind is ManifestKind.group
+    assert state_record.state is StatusEnum.ready
+
+    # the rebuilt machine has the same persistent attributes with their types
+    loaded_machine = load_node_machine(stored_machine, group)
+    assert isinstance(loaded_machine, GroupMachine)
+    assert loaded_machine.state is StatusEnum.ready
+    assert loaded_machine.artifact_path == group_machine.artifact_path
+    assert isinstance(loaded_machine.artifact_path, Path)
+    assert loaded_machine.templates == group_machine.templates
+    for kind, chain in group_machine.configuration_chain.items():
+        assert len(loaded_machine.configuration_chain[kind].maps) == len(chain.maps)
+    wms_submission_path = loaded_machine.configuration_chain["wms"]["wms_submission_path"]
+    assert isinstance(wms_submission_path, Path)
+    assert wms_submission_path == group_machine.configuration_chain["wms"]["wms_submission_path"]
+    assert await loaded_machine.may_trigger("start")
+
+    # a legacy pickled machine is loaded from its pickle
+    legacy_machine = Machine(id=uuid4(), state=pickle.dumps(group_machine.machine))
+    loaded_machine = load_node_machine(legacy_machine, group)
+    assert isinstance(loaded_machine, GroupMachine)
+    assert loaded_machine.artifact_path == group_machine.artifact_path
+
+    # a record from a newer version of the application is rejected
+    with pytest.raises(ValueError, match="newer"):
+        load_machine_state(stored_machine.record | {"version": MACHINE_STATE_VERSION + 1})
+
+
 async def test_group_config_chain(test_campaign_groups: str, session: AsyncSession) -> None:
     """Tests that a prepared group has the correct config chain lookup"""
     campaign_id = urlparse(url=test_campaign_groups).path.split("/")[-2:][0]
@@ -486,9 +542,8 @@ async def test_group_fail_retry(
     assert group_status is StatusEnum.ready
     assert group.metadata_["retries"] == 1
 
-    group_machine_pickle = await session.get_one(Machine, group.machine)
-    group_machine = (pickle.loads(group_machine_pickle.state)).model
-    group_machine.db_model = group
+    stored_group_machine = await session.get_one(Machine, group.machine)
+    group_machine = cast(GroupMachine, load_node_machine(stored_group_machine, group))
 
     with patch(
         "lsst.cmservice.machines.node.GroupMachine.do_start",
@@ -0,0 +1,110 @@
+"""Tests for the process-wide manifest cache."""
+
+from urllib.parse import urlparse
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lsst.cmservice.common.manifest_cache import MANIFEST_CACHE, ManifestCache
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+"""All tests in this module will run in the same event loop."""
+
+
+async def test_manifest_cache(aclient: AsyncClient, session: AsyncSession, test_campaign: str) -> None:
+    """Test that the manifest cache finds the latest campaign and library
+    specs with a single query and serves cached specs until a newer manifest
+    version is created.
+    """
+    campaign_id = UUID(urlparse(url=test_campaign).path.split("/")[-2:][0])
+    cache = ManifestCache(maxsize=16)
+
+    x = await aclient.post(
+        "/v2/manifests",
+        json={
+            "apiVersion": "io.lsst.cmservice/v1",
+            "kind": "butler",
+            "metadata": {"name": "ash", "namespace": str(campaign_id)},
+            "spec": {"repo": "/repo/campaign"},
+        },
+    )
+    assert x.is_success
+    manifest_id = x.headers["Self"].split("/")[-1]
+
+    statements: list[str] = []
+
+    def count_statements(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", count_statements)
+    try:
+        campaign_specs, library_specs = await cache.get_latest_specs(campaign_id, session)
+        assert len(statements) == 2
+        misses = cache.stats()["misses"]
+        assert misses == len(campaign_specs) + len(library_specs)
+        assert campaign_specs["butler"]["repo"] == "/repo/campaign"
+        assert library_specs["butler"]["repo"] == "/repo/mock"
+
+        # a second lookup is served from the cache with a single query, as a
+        # copy of the cached specs
+        campaign_specs["butler"]["repo"] = "/repo/mutated"
+        statements.clear()
+        campaign_specs, _ = await cache.get_latest_specs(campaign_id, session)
+        assert len(statements) == 1
+        assert cache.stats()["hits"] == misses
+        assert campaign_specs["butler"]["repo"] == "/repo/campaign"
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statements)
+
+    # a new version of the campaign manifest is found and fetched
+    x = await aclient.patch(
+        f"/v2/manifests/{manifest_id}",
+        headers={"Content-Type": "application/json-patch+json"},
+        json=[{"op": "replace", "path": "/spec/repo", "value": "/repo/patched"}],
+    )
+    assert x.is_success
+    await session.commit()
+    campaign_specs, _ = await cache.get_latest_specs(campaign_id, session)
+    assert campaign_specs["butler"]["repo"] == "/repo/patched"
+    assert cache.stats()["misses"] == misses + 1
+
+    # explicit invalidation removes only the specs of the namespace
+    cache.invalidate(campaign_id)
+    assert len(cache) == len(library_specs)
+
+
+async def test_manifest_cache_invalidated_by_routes(
+    aclient: AsyncClient, session: AsyncSession, test_campaign: str
+) -> None:
+    """Test that the manifest routes invalidate the specs of the namespace in
+    the process-wide manifest cache.
+    """
+    campaign_id = UUID(urlparse(url=test_campaign).path.split("/")[-2:][0])
+    manifest = {
+        "apiVersion": "io.lsst.cmservice/v1",
+        "kind": "wms",
+        "metadata": {"name": "bishop", "namespace": str(campaign_id)},
+        "spec": {"service_class": "htcondor"},
+    }
+    x = await aclient.post("/v2/manifests", json=manifest)
+    assert x.is_success
+
+    await session.commit()
+    campaign_specs, _ = await MANIFEST_CACHE.get_latest_specs(campaign_id, session)
+    assert campaign_specs["wms"]["service_class"] == "htcondor"
+    size = len(MANIFEST_CACHE)
+    invalidations = MANIFEST_CACHE.stats()["invalidations"]
+
+    manifest["spec"] = {"service_class": "panda"}
+    x = await aclient.post("/v2/manifests", json=manifest)
+    assert x.is_success
+    assert MANIFEST_CACHE.stats()["invalidations"] == invalidations + 1
+    assert len(MANIFEST_CACHE) == size - 1
+
+    await session.commit()
+    campaign_specs, _ = await MANIFEST_CACHE.get_latest_specs(campaign_id, session)
+    assert campaign_specs["wms"]["service_class"] == "panda"
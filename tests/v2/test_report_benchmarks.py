@@ -0,0 +1,125 @@
+"""Benchmarks for pipetask report parsing.
+
+These tests are skipped unless pytest is invoked with ``--run-benchmark``.
+Timings are reported as test properties (e.g., with ``--junit-xml``) and in
+the log output.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from pathlib import Path as SyncPath
+
+import pytest
+import yaml
+from anyio import Path
+
+from lsst.cmservice.common import reports
+from lsst.cmservice.common.logging import LOGGER
+
+pytestmark = pytest.mark.benchmark
+
+logger = LOGGER.bind(module=__name__)
+
+N_TASKS = 20
+"""The number of tasks in a synthetic pipetask report."""
+
+FAILURE_RATE = 0.02
+"""The fraction of the quanta of each task that failed."""
+
+
+def synthetic_manifest_report(n: int) -> dict:
+    """Returns a synthetic pipetask report of `n` quanta across ``N_TASKS``
+    tasks, of which a fraction ``FAILURE_RATE`` failed.
+    """
+    n_task = n // N_TASKS
+    n_failed = int(n_task * FAILURE_RATE)
+    report = {}
+    for t in range(N_TASKS):
+        report[f"task{t}"] = {
+            "n_expected": n_task,
+            "n_succeeded": n_task - n_failed,
+            "n_quanta_blocked": 0,
+            "outputs": {
+                f"task{t}_{product}": {"expected": n_task, "produced": n_task - n_failed, "failed": n_failed}
+                for product in ("log", "metadata", "catalog")
+            },
+            "failed_quanta": {
+                f"{t:08x}-0000-0000-0000-{q:012x}": {
+                    "data_id": {"instrument": "LSSTCam", "visit": q, "detector": q % 189},
+                    "error": ["Traceback (most recent call last):", f"RuntimeError: quantum {q} failed"],
+                }
+                for q in range(n_failed)
+            },
+        }
+    return report
+
+
+async def max_loop_stall(work: Callable[[], object]) -> tuple[float, float]:
+    """Returns the elapsed time of awaiting some work, and the longest time
+    the event loop went without running a ticker while it did.
+    """
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal stall
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    # let the ticker start before the work does
+    await asyncio.sleep(0.01)
+    t0 = time.perf_counter()
+    result = work()
+    if asyncio.iscoroutine(result):
+        await result
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await task
+    return elapsed, stall
+
+
+@pytest.mark.parametrize("n", [1_000_000])
+async def test_benchmark_manifest_report(
+    n: int, tmp_path: Path, record_property: Callable[[str, object], None]
+) -> None:
+    """Measures the time of parsing a synthetic pipetask report of `n` quanta
+    on the event loop with the pure-Python loader, as before, and in a worker
+    process with the C loader, along with the longest event loop stall of
+    each.
+    """
+    report_file = Path(tmp_path) / "manifest_report.yaml"
+    await report_file.write_text(yaml.safe_dump(synthetic_manifest_report(n)))
+    size = (await report_file.stat()).st_size
+
+    def on_loop() -> None:
+        with SyncPath(report_file).open("rb") as f:
+            reports.summarize_manifest_data(yaml.load(f, Loader=yaml.SafeLoader))
+
+    on_loop_elapsed, on_loop_stall = await max_loop_stall(on_loop)
+    offloaded_elapsed, offloaded_stall = await max_loop_stall(
+        lambda: reports.load_manifest_summary(report_file)
+    )
+
+    assert offloaded_stall < on_loop_stall
+
+    record_property("size", size)
+    record_property("on_loop", on_loop_elapsed)
+    record_property("on_loop_stall", on_loop_stall)
+    record_property("offloaded", offloaded_elapsed)
+    record_property("offloaded_stall", offloaded_stall)
+    logger.info(
+        "Manifest report benchmark",
+        n=n,
+        size=size,
+        c_loader=yaml.__with_libyaml__,
+        on_loop=f"{on_loop_elapsed:.3f}s",
+        on_loop_stall=f"{on_loop_stall:.3f}s",
+        offloaded=f"{offloaded_elapsed:.3f}s",
+        offloaded_stall=f"{offloaded_stall:.3f}s",
+    )
@@ -0,0 +1,118 @@
+"""Benchmarks for group splitting.
+
+These tests are skipped unless pytest is invoked with ``--run-benchmark``.
+Timings and sizes are reported as test properties (e.g., with ``--junit-xml``)
+and in the log output.
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from itertools import batched
+
+import numpy as np
+import pytest
+
+from lsst.cmservice.common.logging import LOGGER
+from lsst.cmservice.common.splitters.accumulator import DimensionValueAccumulator
+from lsst.cmservice.common.splitters.weighted import weighted_partition_indices
+
+pytestmark = pytest.mark.benchmark
+
+logger = LOGGER.bind(module=__name__)
+
+N_DETECTORS = 189
+"""The number of data IDs sharing each synthetic visit value."""
+
+
+def synthetic_refs(n: int) -> Iterator[dict[str, int]]:
+    """Yields `n` synthetic data IDs, in no particular order, for roughly
+    ``n / N_DETECTORS`` distinct visits.
+    """
+    rng = np.random.default_rng(seed=42)
+    for page in np.array_split(rng.integers(0, max(n // N_DETECTORS, 1), size=n), max(n // 1_000_000, 1)):
+        for visit in page.tolist():
+            yield {"visit": visit}
+
+
+@pytest.mark.parametrize("n", [1_000_000, 10_000_000])
+def test_benchmark_streaming_split_values(n: int, record_property: Callable[[str, object], None]) -> None:
+    """Measures the time and peak memory of collecting the distinct visit
+    values of `n` synthetic data IDs by materializing every data ID, as with
+    ``query_datasets``, and by accumulating pages of data IDs.
+    """
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    data_ids = list(synthetic_refs(n))
+    materialized = np.fromiter({data_id["visit"] for data_id in data_ids}, dtype=int)
+    materialized.sort()
+    materialized_elapsed = time.perf_counter() - t0
+    _, materialized_peak = tracemalloc.get_traced_memory()
+    del data_ids
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    accumulator = DimensionValueAccumulator(dtype=int)
+    for page in batched(synthetic_refs(n), 50_000):
+        accumulator.add((data_id["visit"] for data_id in page), count=len(page))
+    streamed = accumulator.values
+    streaming_elapsed = time.perf_counter() - t0
+    _, streaming_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert np.array_equal(materialized, streamed)
+    assert accumulator.rows == n
+    assert streaming_peak < materialized_peak
+
+    record_property("materialized", materialized_elapsed)
+    record_property("materialized_peak", materialized_peak)
+    record_property("streaming", streaming_elapsed)
+    record_property("streaming_peak", streaming_peak)
+    logger.info(
+        "Split value benchmark",
+        n=n,
+        distinct=streamed.size,
+        materialized=f"{materialized_elapsed:.3f}s",
+        materialized_peak=materialized_peak,
+        streaming=f"{streaming_elapsed:.3f}s",
+        streaming_peak=streaming_peak,
+    )
+
+
+@pytest.mark.parametrize("n", [10_000, 1_000_000])
+def test_benchmark_weighted_split_makespan(n: int, record_property: Callable[[str, object], None]) -> None:
+    """Simulates the makespan, i.e., the total weight of the heaviest group, of
+    splitting `n` dimension values with heavy-tailed weights into 100 groups of
+    an equal number of values and into 100 groups of roughly equal weight.
+    """
+    group_count = 100
+    rng = np.random.default_rng(seed=42)
+    # most values have a typical number of datasets, but a few runs of values
+    # (e.g., deep fields) have many more
+    weights = rng.lognormal(mean=np.log(N_DETECTORS), sigma=0.5, size=n).astype(int) + 1
+    for start in rng.integers(0, n, size=5):
+        weights[start : start + n // 50] *= 10
+
+    equal_starts = np.linspace(0, n, num=group_count, dtype=int, endpoint=False)
+    equal_makespan = np.add.reduceat(weights, equal_starts).max()
+
+    t0 = time.perf_counter()
+    weighted_starts = weighted_partition_indices(weights, group_count, max_size=n)
+    weighted_elapsed = time.perf_counter() - t0
+    weighted_makespan = np.add.reduceat(weights, weighted_starts).max()
+
+    ideal_makespan = weights.sum() / group_count
+    assert weighted_starts.size == group_count
+    assert weighted_makespan < equal_makespan
+
+    record_property("equal_makespan", equal_makespan / ideal_makespan)
+    record_property("weighted_makespan", weighted_makespan / ideal_makespan)
+    record_property("weighted_partition", weighted_elapsed)
+    logger.info(
+        "Weighted split benchmark",
+        n=n,
+        equal_makespan=f"{equal_makespan / ideal_makespan:.3f}",
+        weighted_makespan=f"{weighted_makespan / ideal_makespan:.3f}",
+        weighted_partition=f"{weighted_elapsed:.6f}s",
+    )
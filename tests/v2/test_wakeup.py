@@ -0,0 +1,102 @@
+"""Tests for event-driven daemon wakeups."""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from lsst.cmservice.common.flags import Features
+from lsst.cmservice.common.wakeup import DaemonWakeup, notify_daemon
+from lsst.cmservice.config import config
+from lsst.cmservice.db.session import DatabaseManager
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+"""All tests in this module will run in the same event loop."""
+
+
+async def test_wakeup_debounce() -> None:
+    """Test that a wakeup ends the daemon's idle wait early, after coalescing
+    a burst of events during the debounce window.
+    """
+    wakeup = DaemonWakeup()
+    sentinel = asyncio.Event()
+
+    # Without any event, the wait lasts for the max idle time
+    t0 = time.perf_counter()
+    await wakeup.wait(sentinel, max_idle=0.2, debounce=0.1)
+    assert 0.2 <= time.perf_counter() - t0 < 0.3
+
+    async def burst() -> None:
+        for _ in range(3):
+            await asyncio.sleep(0.05)
+            wakeup.wake("test")
+
+    t0 = time.perf_counter()
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(burst())
+        await wakeup.wait(sentinel, max_idle=10, debounce=0.5)
+    assert time.perf_counter() - t0 < 1
+    assert wakeup.clear() == {"test": 3}
+    assert not wakeup.event.is_set()
+
+    # A set sentinel ends the wait without debounce
+    sentinel.set()
+    wakeup.wake("test")
+    t0 = time.perf_counter()
+    await wakeup.wait(sentinel, max_idle=10, debounce=10)
+    assert time.perf_counter() - t0 < 1
+
+
+async def test_wakeup_notification(
+    monkeypatch: pytest.MonkeyPatch, testdb: DatabaseManager, session: AsyncSession
+) -> None:
+    """Test that a daemon listening on the wakeup channel is woken by a
+    notification when the notifying transaction commits.
+    """
+    monkeypatch.setattr(config.features, "enabled", config.features.enabled | Features.DAEMON_EVENTS)
+    assert testdb.engine is not None
+    wakeup = DaemonWakeup()
+    sentinel = asyncio.Event()
+
+    async with wakeup.listen(testdb.engine):
+        await notify_daemon(session, reason="process")
+        await session.rollback()
+        await wakeup.wait(sentinel, max_idle=0.5, debounce=0)
+        assert not wakeup.event.is_set()
+
+        await notify_daemon(session, reason="process")
+        await session.commit()
+        await wakeup.wait(sentinel, max_idle=10, debounce=0)
+        assert wakeup.clear() == {"process": 1}
+
+
+async def test_wakeup_reconnect(
+    monkeypatch: pytest.MonkeyPatch, testdb: DatabaseManager, session: AsyncSession
+) -> None:
+    """Test that a daemon whose listening connection is lost listens again on
+    a new connection, and is woken in case it missed any notification.
+    """
+    monkeypatch.setattr(config.features, "enabled", config.features.enabled | Features.DAEMON_EVENTS)
+    monkeypatch.setattr(config.daemon, "wakeup_check_interval", 0.1)
+    assert testdb.engine is not None
+    wakeup = DaemonWakeup()
+    sentinel = asyncio.Event()
+
+    async with wakeup.listen(testdb.engine):
+        terminated = await session.execute(
+            text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE query LIKE 'LISTEN %' AND pid <> pg_backend_pid()"
+            )
+        )
+        assert terminated.scalars().all() == [True]
+        await session.commit()
+        await wakeup.wait(sentinel, max_idle=10, debounce=0)
+        assert wakeup.clear() == {"reconnect": 1}
+
+        await notify_daemon(session, reason="process")
+        await session.commit()
+        await wakeup.wait(sentinel, max_idle=10, debounce=0)
+        assert wakeup.clear() == {"process": 1}